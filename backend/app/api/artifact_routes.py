@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from app.services.artifact_service import get_artifact, get_artifact_stats, list_artifacts
+from app.api.responses import FastJSONRoute
+
+router = APIRouter(prefix="/artifacts", tags=["Artifacts"], route_class=FastJSONRoute)
+
+
+@router.get(
+    "/",
+    response_model=dict,
+    description="""
+Generated learning paths, flashcards and exercises, newest first, without their content.
+Filter by `owner` (the X-Owner-Id header sent when generating), `kind` (learning_path,
+flashcards, exercises) or `document_id` (an ID returned by /api/documents, which is the SHA-256
+of the uploaded file: artifacts generated from uploads are found under it too). For the next
+page pass `before` = the `created_at` of the last artifact returned.
+""",
+)
+async def artifacts(
+    owner: Optional[str] = Query(None),
+    kind: Optional[str] = Query(None),
+    document_id: Optional[str] = Query(None),
+    before: Optional[float] = Query(None, description="Only artifacts created before this timestamp"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    return {"artifacts": await list_artifacts(owner, kind, document_id, before, limit)}
+
+
+@router.get("/stats", response_model=dict)
+async def artifact_stats():
+    return await get_artifact_stats()
+
+
+@router.get("/{artifact_id}", response_model=dict)
+async def artifact_by_id(artifact_id: str):
+    artifact = await get_artifact(artifact_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return artifact
@@ -0,0 +1,27 @@
+from typing import Sequence
+
+from fastapi import HTTPException
+
+from app.api.streaming import ndjson_response
+from app.core.settings import get_settings
+from app.services.batch_service import Handler, run_batch, stream_batch
+
+settings = get_settings()
+
+
+async def batch_response(items: Sequence, handler: Handler, stream: bool = False):
+    """
+    Shared body of the /batch endpoints: NDJSON lines in completion order when `stream`
+    is set, otherwise every result in request order with success/failure counts.
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="Provide at least one item")
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_ITEMS} items per batch")
+
+    if stream:
+        return ndjson_response(stream_batch(items, handler))
+
+    results = await run_batch(items, handler)
+    failed = sum(1 for result in results if result["error"] is not None)
+    return {"results": results, "succeeded": len(results) - failed, "failed": failed}
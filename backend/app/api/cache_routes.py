@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from app.integrations.ai_client import response_cache, inflight_requests, model_pool, upstream_scheduler
+from app.integrations.document_index import document_indexes
+from app.api.responses import FastJSONRoute
+
+router = APIRouter(prefix="/cache", tags=["Cache"], route_class=FastJSONRoute)
+
+
+@router.get("/stats")
+async def cache_stats():
+    """Hit/miss counters of the shared AI response cache, request coalescing and upstream admission"""
+    return {
+        **response_cache.stats(),
+        "single_flight": inflight_requests.stats(),
+        "model_pool": model_pool.stats(),
+        "upstream": upstream_scheduler.stats(),
+        "document_indexes": document_indexes.stats(),
+    }
@@ -0,0 +1,8 @@
+from fastapi import Header
+from typing import Optional
+
+
+def owner_header(
+    x_owner_id: Optional[str] = Header(None, description="Owner recorded with generated artifacts, for listing them later"),
+) -> Optional[str]:
+    return x_owner_id
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from typing import List, Tuple
+import anyio
+import time
+from app.core.metrics import PREPROCESS_CHARS, stage
+from app.core.settings import get_settings
+from app.infrastructure.files.file_manager import extract_documents, is_extraction_error, load_documents
+from app.infrastructure.files.extraction_cache import extraction_store
+from app.infrastructure.files.preprocessing import preprocess_documents
+from app.api.responses import FastJSONRoute
+
+settings = get_settings()
+
+router = APIRouter(prefix="/documents", tags=["Documents"], route_class=FastJSONRoute)
+
+
+async def gather_contents(files: List[UploadFile], document_ids: List[str]) -> List[List[str]]:
+    """Page lists for a generation request: uploaded files first, then previously uploaded documents"""
+    documents, _ = await gather_documents(files, document_ids)
+    return documents
+
+
+async def gather_documents(files: List[UploadFile], document_ids: List[str]) -> Tuple[List[List[str]], List[str]]:
+    """
+    `gather_contents`, plus the document IDs the pages come from (the hash of each upload that was
+    extracted, then `document_ids`), under which generated artifacts are recorded
+    """
+    if not files and not document_ids:
+        raise HTTPException(status_code=400, detail="Provide files or document_ids")
+    try:
+        stored = await load_documents(document_ids)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown document_id: {e.args[0]}")
+
+    extracted = await extract_documents(files)
+    documents = [pages for _, pages in extracted] + stored
+    sources = [digest for digest, pages in extracted if digest and not is_extraction_error(pages)] + list(document_ids)
+    if not settings.PREPROCESS_DOCUMENTS:
+        return documents, sources
+
+    with stage("preprocess"):
+        documents, report = await anyio.to_thread.run_sync(preprocess_documents, documents)
+    PREPROCESS_CHARS.labels("input").inc(report["chars_before"])
+    PREPROCESS_CHARS.labels("output").inc(report["chars_after"])
+    if report["chars_saved"]:
+        print(
+            f"[INFO] Preprocessing saved {report['chars_saved']} chars (~{report['tokens_saved']} tokens, "
+            f"{report['saved_ratio']:.1%}): {report['running_lines']} header/footer lines, "
+            f"{report['hyphenations']} hyphenations, {report['duplicate_pages']} duplicate pages, "
+            f"{report['duplicate_paragraphs']} duplicate paragraphs"
+        )
+    return documents, sources
+
+
+@router.post(
+    "/",
+    response_model=dict,
+    description="""
+Upload files once and get a document_id per file.
+Pass the IDs as `document_ids` to the generation endpoints instead of uploading the files again.
+
+IDs are valid for `ttl_seconds` (EXTRACTION_CACHE_TTL_SECONDS) after the last upload of the same file;
+each document carries its `expires_at` (Unix time). Uploading the file again renews it. When the
+cache outgrows its size limits (EXTRACTION_CACHE_MEMORY_BYTES, or EXTRACTION_CACHE_MAX_BYTES with
+EXTRACTION_CACHE_PATH set) the least recently used documents are dropped earlier, and without
+EXTRACTION_CACHE_PATH they do not survive a restart: an unknown ID is answered with 404, after which
+the file has to be uploaded again.
+""",
+)
+async def upload_documents(
+    files: List[UploadFile] = File(..., description="PDF or DOCX files"),
+):
+    extracted = await extract_documents(files)
+    ttl_seconds = settings.EXTRACTION_CACHE_TTL_SECONDS if settings.EXTRACTION_CACHE_ENABLED else 0
+    expires_at = time.time() + ttl_seconds
+    documents = []
+    for file, (document_id, pages) in zip(files, extracted):
+        failed = document_id is None or is_extraction_error(pages)
+        documents.append({
+            "document_id": None if failed else document_id,
+            "filename": file.filename,
+            "pages": len(pages),
+            "expires_at": None if failed else expires_at,
+            "error": pages[-1] if failed and pages else None,
+        })
+    return {"documents": documents, "ttl_seconds": ttl_seconds}
+
+
+@router.get("/stats", response_model=dict)
+async def document_cache_stats():
+    return extraction_store.stats()
+
+
+@router.get("/{document_id}", response_model=dict)
+async def get_document(document_id: str):
+    stored = await anyio.to_thread.run_sync(extraction_store.get, document_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return {
+        "document_id": document_id,
+        "filename": stored["filename"],
+        "pages": len(stored["pages"]),
+        "characters": sum(len(page) for page in stored["pages"]),
+    }
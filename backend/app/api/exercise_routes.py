@@ -1,31 +1,48 @@
-from fastapi import APIRouter, File, UploadFile, Form
-from typing import List
-from app.services.exercise_generation_service import generate_exercises
-from app.infrastructure.files.file_manager import extract_file_contents
-from app.domain.exercises_models import ExercisesByTopicRequest, ExerciseType
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, Form
+from functools import partial
+from typing import List, Optional
+from app.services.artifact_service import save_artifact
+from app.services.exercise_generation_service import generate_exercises, generate_mixed_exercises
+from app.api.dependencies import owner_header
+from app.api.document_routes import gather_documents
+from app.api.batch import batch_response
+from app.domain.exercises_models import (
+    ExercisesBatchRequest,
+    ExercisesByTopicRequest,
+    ExerciseType,
+    MixedExercisesByTopicRequest,
+    MixedExerciseStrategy,
+)
+from app.api.responses import FastJSONRoute
 
-router = APIRouter(prefix="/generate-exercises", tags=["Generate Exercises"])
+router = APIRouter(prefix="/generate-exercises", tags=["Generate Exercises"], route_class=FastJSONRoute)
 
 
 @router.post("/", response_model=dict)
 async def exercises(
     files: List[UploadFile] = File(default=[], description="Files to be summarized"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
     exercises_count: int = Form(5, description="Number of exercises to generate"),
     exercises_difficulty: str = Form("medium", description="Difficulty level of the exercises"),
     exercises_types: ExerciseType = Form(ExerciseType.multiple_choice, description="Types of exercises to generate"),
+    topic: Optional[str] = Form(None, description="Focus on this topic: large documents are reduced to the passages about it"),
+    owner: Optional[str] = Depends(owner_header),
 ):
     # Content extraction
-    data = await extract_file_contents(files)
+    data, sources = await gather_documents(files, document_ids)
     joined_content = "\n\n".join(
         "\n\n".join(page for page in file_content) for file_content in data
     )
 
     # Exercises Generation
     exercises = await generate_exercises(
-        joined_content, exercises_count, exercises_difficulty, exercises_types
+        joined_content, exercises_count, exercises_difficulty, exercises_types, topic
     )
 
-    return {"exercises": exercises}
+    response = {"exercises": exercises}
+    if exercises:
+        response["artifact_id"] = await save_artifact("exercises", response, sources, owner)
+    return response
 
 
 @router.post(
@@ -46,7 +63,86 @@ Parameters:
     - matching
 """,
 )
-async def exercises_by_topic(request: ExercisesByTopicRequest):
+async def exercises_by_topic(request: ExercisesByTopicRequest, owner: Optional[str] = Depends(owner_header)):
+    return await exercises_for_topic(request, owner)
+
+
+@router.post(
+    "/by_topic/batch",
+    description="""
+Generate exercises for many topics in one request. Items take the same fields as /by_topic
+and run concurrently; each result carries its `index` and either `result` or `error`.
+With `stream` set, results are sent as NDJSON lines in completion order.
+""",
+)
+async def exercises_by_topic_batch(request: ExercisesBatchRequest, owner: Optional[str] = Depends(owner_header)):
+    return await batch_response(request.items, partial(exercises_for_topic, owner=owner), request.stream)
+
+
+@router.post(
+    "/mixed",
+    response_model=dict,
+    description="""
+Generate several exercise types from the same files in one request.
+
+Parameters:
+- exercises_types: Exercise types, one form field per type (e.g. multiple_choice, true_false).
+- exercises_counts: Number of exercises for each type, in the same order (default: 5 each).
+- strategy: single_call (one call for every type), concurrent (one call per type, in parallel)
+  or auto (default). The response reports the strategy used.
+""",
+)
+async def mixed_exercises(
+    files: List[UploadFile] = File(default=[], description="Files to be summarized"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    exercises_types: List[ExerciseType] = Form(..., description="Exercise types to generate"),
+    exercises_counts: List[int] = Form(default=[], description="Number of exercises per type"),
+    exercises_difficulty: str = Form("medium", description="Difficulty level of the exercises"),
+    strategy: MixedExerciseStrategy = Form(MixedExerciseStrategy.auto, description="single_call, concurrent or auto"),
+    owner: Optional[str] = Depends(owner_header),
+):
+    if exercises_counts and len(exercises_counts) != len(exercises_types):
+        raise HTTPException(status_code=400, detail="exercises_counts must have one count per exercise type")
+    counts = exercises_counts or [5] * len(exercises_types)
+
+    # Content extraction
+    data, sources = await gather_documents(files, document_ids)
+    joined_content = "\n\n".join(
+        "\n\n".join(page for page in file_content) for file_content in data
+    )
+
+    response = await generate_mixed_exercises(
+        joined_content, list(zip(exercises_types, counts)), exercises_difficulty, strategy
+    )
+    if any(response["exercises"].values()):
+        response["artifact_id"] = await save_artifact("exercises", response, sources, owner)
+    return response
+
+
+@router.post(
+    "/mixed/by_topic",
+    response_model=dict,
+    description="""
+Generate several exercise types for a topic, e.g.
+`{"topic": "...", "exercises": [{"type": "multiple_choice", "count": 3}, {"type": "matching", "count": 1}]}`.
+`strategy` works as in /mixed and the response reports the strategy used.
+""",
+)
+async def mixed_exercises_by_topic(request: MixedExercisesByTopicRequest, owner: Optional[str] = Depends(owner_header)):
+    if not request.exercises:
+        raise HTTPException(status_code=400, detail="Provide at least one exercise type")
+    response = await generate_mixed_exercises(
+        request.topic,
+        [(item.type, item.count) for item in request.exercises],
+        request.exercises_difficulty,
+        request.strategy
+    )
+    if any(response["exercises"].values()):
+        response["artifact_id"] = await save_artifact("exercises", response, owner=owner)
+    return response
+
+
+async def exercises_for_topic(request: ExercisesByTopicRequest, owner: Optional[str] = None) -> dict:
     # Exercises Generation
     exercises = await generate_exercises(
         request.topic,
@@ -55,4 +151,7 @@ async def exercises_by_topic(request: ExercisesByTopicRequest):
         request.exercises_types
     )
 
-    return {"exercises": exercises}
+    response = {"exercises": exercises}
+    if exercises:
+        response["artifact_id"] = await save_artifact("exercises", response, owner=owner)
+    return response
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, File, Form, UploadFile
-from typing import List
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from functools import partial
+from typing import List, Optional
 from pydantic import BaseModel
+from app.services.artifact_service import save_artifact
 from app.services.flashcar_generation_service import generate_flashcards
-from app.infrastructure.files.file_manager import extract_file_contents
+from app.api.dependencies import owner_header
+from app.api.document_routes import gather_documents
+from app.api.batch import batch_response
 from app.domain.models import FlashcardRequest
+from app.api.responses import FastJSONRoute
 
 
-router = APIRouter(prefix="/flashcard", tags=["Flashcards"])
+router = APIRouter(prefix="/flashcard", tags=["Flashcards"], route_class=FastJSONRoute)
 
 class FlashcardByTopicRequest(BaseModel):
     topic: str
@@ -14,16 +19,22 @@ class FlashcardByTopicRequest(BaseModel):
     difficulty_level: str = "medium"
     focus_area: str = "key concepts"
 
+class FlashcardBatchRequest(BaseModel):
+    items: List[FlashcardByTopicRequest]
+    stream: bool = False
+
 @router.post("/", response_model=dict)
 async def flashcard(
     files: List[UploadFile] = File(default=[], description="Files to be summarized"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
     flashcards_count: int = Form(default=5),
     difficulty_level: str = Form(default="medium"),
-    focus_area: str = Form(default="key concepts")
+    focus_area: str = Form(default="key concepts"),
+    owner: Optional[str] = Depends(owner_header)
 ):
 
     # Content extraction
-    data = await extract_file_contents(files)
+    data, sources = await gather_documents(files, document_ids)
     joined_content = "\n\n".join("\n\n".join(page for page in file_content) for file_content in data)
 
     #Flashcard Request Construction
@@ -37,10 +48,21 @@ async def flashcard(
     # Flashcard Generation
     flashcards = await generate_flashcards(flashcard_request)
 
-    return {"flashcards": flashcards}
+    response = {"flashcards": flashcards}
+    if flashcards:
+        response["artifact_id"] = await save_artifact("flashcards", response, sources, owner)
+    return response
 
 @router.post("/by_topic",response_model=dict)
-async def flashcard_by_topic(request: FlashcardByTopicRequest):
+async def flashcard_by_topic(request: FlashcardByTopicRequest, owner: Optional[str] = Depends(owner_header)):
+    return await flashcards_for_topic(request, owner)
+
+@router.post("/by_topic/batch")
+async def flashcard_by_topic_batch(request: FlashcardBatchRequest, owner: Optional[str] = Depends(owner_header)):
+    """Many topics in one call, generated concurrently; set `stream` for NDJSON results as they complete"""
+    return await batch_response(request.items, partial(flashcards_for_topic, owner=owner), request.stream)
+
+async def flashcards_for_topic(request: FlashcardByTopicRequest, owner: Optional[str] = None) -> dict:
     # Flashcard Request Construction
     flashcard_request = FlashcardRequest(
         content=request.topic,
@@ -52,4 +74,7 @@ async def flashcard_by_topic(request: FlashcardByTopicRequest):
     # Flashcard Generation
     flashcards = await generate_flashcards(flashcard_request)
 
-    return {"flashcards": flashcards}
\ No newline at end of file
+    response = {"flashcards": flashcards}
+    if flashcards:
+        response["artifact_id"] = await save_artifact("flashcards", response, owner=owner)
+    return response
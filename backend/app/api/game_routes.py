@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from app.domain.games_models import GameOptions
+from app.api.batch import batch_response
+from app.domain.games_models import GameBatchRequest, GameOptions
 from app.services.game_generation_service import generate_game
+from app.api.responses import FastJSONRoute
 
-router = APIRouter(prefix="/games", tags=["Games"])
+router = APIRouter(prefix="/games", tags=["Games"], route_class=FastJSONRoute)
 
 
 @router.post(
@@ -19,3 +21,23 @@ Parameters:
 async def create_game(options: GameOptions):
     result = await generate_game(options)
     return result
+
+
+@router.post(
+        "/batch",
+        description="""
+Generate several games in one request. Items take the same options as /games/ and run
+concurrently; each result carries its `index` and either `result` or `error`.
+With `stream` set, results are sent as NDJSON lines in completion order.
+"""
+)
+async def create_games_batch(request: GameBatchRequest):
+    return await batch_response(request.items, game_or_error, request.stream)
+
+
+async def game_or_error(options: GameOptions) -> dict:
+    result = await generate_game(options)
+    if isinstance(result, dict) and "error" in result:
+        # Surface as a per-item error instead of a successful result
+        raise ValueError(result["error"])
+    return result
@@ -0,0 +1,116 @@
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from typing import List, Optional
+import anyio
+from app.api.dependencies import owner_header
+from app.api.document_routes import gather_contents, gather_documents
+from app.api.learning_path_routes import learning_path_options_form
+from app.api.streaming import sse_response
+from app.api.summarize_routes import summary_options_form
+from app.domain.models import SummaryOptions
+from app.infrastructure.jobs.queue import describe
+from app.infrastructure.jobs.store import FINISHED, SUCCEEDED
+from app.services.job_service import job_queue, submit_learning_path, submit_summary
+from app.api.responses import FastJSONRoute
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=FastJSONRoute)
+
+
+async def get_job_or_404(job_id: str) -> dict:
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post(
+    "/summary",
+    status_code=202,
+    description="Queue a summary (same fields as /summarize/) and return its job ID immediately. Default priority: high.",
+)
+async def submit_summary_job(
+    files: List[UploadFile] = File(default=[], description="PDFs to be summarized"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    options: SummaryOptions = Depends(summary_options_form),
+    priority: str = Form("high", description="high/normal/low"),
+):
+    data = await gather_contents(files, document_ids)
+    try:
+        job = await submit_summary(data, options, priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return describe(job)
+
+
+@router.post(
+    "/learning-path",
+    status_code=202,
+    description="""
+Queue a learning path (same fields as /learning-path/generate) and return its job ID immediately.
+Default priority: low with generate_full_content, normal otherwise.
+""",
+)
+async def submit_learning_path_job(
+    files: List[UploadFile] = File(default=[], description="PDF or DOCX files"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    options: dict = Depends(learning_path_options_form),
+    priority: Optional[str] = Form(None, description="high/normal/low"),
+    owner: Optional[str] = Depends(owner_header),
+):
+    data, sources = await gather_documents(files, document_ids)
+    joined_content = "\n\n".join("\n\n".join(page for page in file_content) for file_content in data)
+    try:
+        job = await submit_learning_path(joined_content, {**options, "document_ids": sources, "owner": owner}, priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return describe(job)
+
+
+@router.get("/stats")
+async def job_stats():
+    return await anyio.to_thread.run_sync(job_queue.stats)
+
+
+@router.get("/{job_id}")
+async def job_status(job_id: str):
+    return describe(await get_job_or_404(job_id))
+
+
+@router.get(
+    "/{job_id}/result",
+    description="The job result once it has succeeded; 202 with the job status while it is queued or running.",
+)
+async def job_result(job_id: str):
+    job = await get_job_or_404(job_id)
+    if job["status"] == SUCCEEDED:
+        return job["result"]
+    if job["status"] in FINISHED:
+        raise HTTPException(status_code=409, detail=job["error"] or f"Job {job['status']}")
+    return JSONResponse(status_code=202, content=describe(job))
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    await get_job_or_404(job_id)
+    return describe(await job_queue.cancel(job_id))
+
+
+@router.get(
+    "/{job_id}/events",
+    description="""
+Server-sent events for a job:
+- status: the job status, sent immediately and on every change
+- done: the finished job, with `result` when it succeeded
+""",
+)
+async def job_events(job_id: str):
+    await get_job_or_404(job_id)
+
+    async def events():
+        async for job in job_queue.events(job_id):
+            if job["status"] in FINISHED:
+                yield {"event": "done", "data": describe(job, include_result=True)}
+            else:
+                yield {"event": "status", "data": describe(job)}
+
+    return sse_response(events())
@@ -1,13 +1,15 @@
-from fastapi import APIRouter, File, UploadFile, Form
-from typing import List
-from app.services.learning_path_service import generate_learning_path
-from app.infrastructure.files.file_manager import extract_file_contents
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, Form
+from typing import List, Optional
+from app.services.learning_path_service import generate_learning_path, get_learning_path, get_session, stream_learning_path
+from app.api.streaming import sse_response
+from app.api.dependencies import owner_header
+from app.api.document_routes import gather_documents
+from app.api.responses import FastJSONRoute
 
-router = APIRouter(prefix="/learning-path", tags=["Learning Path"])
+router = APIRouter(prefix="/learning-path", tags=["Learning Path"], route_class=FastJSONRoute)
 
-@router.post("/generate", response_model=dict)
-async def generate_learning_path_endpoint(
-    files: List[UploadFile] = File(..., description="PDF or DOCX files"),
+
+def learning_path_options_form(
     difficulty: str = Form("intermediate"),
     total_duration: str = Form("4 weeks"),
     modules_count: int = Form(2, ge=1, le=10),
@@ -17,37 +19,52 @@ async def generate_learning_path_endpoint(
     questions_per_topic: int = Form(3, ge=2, le=10),
     include_theory: bool = Form(True),
     language: str = Form("Spanish"),
-    # Nuevos parámetros
     auto_structure: bool = Form(False, description="Let AI decide optimal structure"),
     learning_approach: str = Form("balanced", description="theoretical/practical/balanced/project-based/fast"),
     language_register: str = Form("neutral", description="formal/neutral/informal/technical/beginner/advanced"),
     detail_level: str = Form("intermediate", description="basic/intermediate/advanced/expert/master"),
     generate_full_content: bool = Form(False, description="Generate complete content for all sessions")
+) -> dict:
+    """The learning path form fields as a dependency, shared by every endpoint that takes them"""
+    return {
+        "difficulty": difficulty,
+        "total_duration": total_duration,
+        "modules_count": modules_count,
+        "sessions_per_module": sessions_per_module,
+        "topics_per_session": topics_per_session,
+        "flashcards_per_topic": flashcards_per_topic,
+        "questions_per_topic": questions_per_topic,
+        "include_theory": include_theory,
+        "language": language,
+        "auto_structure": auto_structure,
+        "learning_approach": learning_approach,
+        "language_register": language_register,
+        "detail_level": detail_level,
+        "generate_full_content": generate_full_content,
+    }
+
+
+@router.post("/generate", response_model=dict)
+async def generate_learning_path_endpoint(
+    files: List[UploadFile] = File(default=[], description="PDF or DOCX files"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    options: dict = Depends(learning_path_options_form),
+    owner: Optional[str] = Depends(owner_header)
 ):
     """Generate learning path from files with advanced customization options"""
     
+    # Extract content (same as Summarizer)
+    data, sources = await gather_documents(files, document_ids)
+
     try:
-        # Extract content (same as Summarizer)
-        data = await extract_file_contents(files)
         joined_content = "\n\n".join("\n\n".join(page for page in file_content) for file_content in data)
         
         # Generate learning path
         learning_path = await generate_learning_path(
             content=joined_content,
-            difficulty=difficulty,
-            total_duration=total_duration,
-            modules_count=modules_count,
-            sessions_per_module=sessions_per_module,
-            topics_per_session=topics_per_session,
-            flashcards_per_topic=flashcards_per_topic,
-            questions_per_topic=questions_per_topic,
-            include_theory=include_theory,
-            language=language,
-            auto_structure=auto_structure,
-            learning_approach=learning_approach,
-            language_register=language_register,
-            detail_level=detail_level,
-            generate_full_content=generate_full_content
+            **options,
+            document_ids=sources,
+            owner=owner
         )
         
         if "error" in learning_path:
@@ -63,6 +80,61 @@ async def generate_learning_path_endpoint(
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
+@router.post(
+    "/generate/stream",
+    description="""
+Same parameters as `/learning-path/generate`, streamed as server-sent events:
+- outline: titles of every module and session, sent after the first short model call ({"learningPathId", "outline"})
+- module: a module with its IDs, emitted as soon as it is complete ({"learningPathId", "module"})
+- done: the complete learning path ({"learning_path"})
+- error: generation failed ({"detail"})
+""",
+)
+async def generate_learning_path_stream_endpoint(
+    files: List[UploadFile] = File(default=[], description="PDF or DOCX files"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    options: dict = Depends(learning_path_options_form),
+    owner: Optional[str] = Depends(owner_header)
+):
+    data, sources = await gather_documents(files, document_ids)
+    joined_content = "\n\n".join("\n\n".join(page for page in file_content) for file_content in data)
+
+    return sse_response(stream_learning_path(
+        content=joined_content,
+        **options,
+        document_ids=sources,
+        owner=owner
+    ))
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "learning-path"}
+
+
+@router.get("/{learning_path_id}", response_model=dict)
+async def learning_path_by_id(learning_path_id: str):
+    """A generated learning path, including the sessions completed so far"""
+    learning_path = await get_learning_path(learning_path_id)
+    if learning_path is None:
+        raise HTTPException(status_code=404, detail="Unknown learning path")
+    return {"learning_path": learning_path}
+
+
+@router.get(
+    "/{learning_path_id}/sessions/{session_id}",
+    response_model=dict,
+    description="""
+Full content of one session (e.g. `module_1_session_2`). For paths generated with
+`generate_full_content=false` the content is written on first access, from the passages of the
+source documents relevant to the session, and stored: later calls return it immediately.
+""",
+)
+async def learning_path_session(learning_path_id: str, session_id: str):
+    session = await get_session(learning_path_id, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown learning path or session")
+    if "error" in session:
+        raise HTTPException(status_code=500, detail=session["error"])
+    return {"session": session}
+
@@ -0,0 +1,67 @@
+from functools import wraps
+from typing import Any, Callable, Optional
+import json
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value):
+    # Pydantic models nested in plain dicts (e.g. flashcards); orjson handles the rest natively
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also renders pydantic models, top-level (model_dump_json) or nested"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode("utf-8")
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def dumps(value) -> str:
+    """JSON text for streamed events and NDJSON lines, with orjson when FAST_JSON_RESPONSES is on"""
+    if settings.FAST_JSON_RESPONSES:
+        return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS).decode("utf-8")
+    # jsonable_encoder only for what json can't handle itself (pydantic models)
+    return json.dumps(value, ensure_ascii=False, default=jsonable_encoder)
+
+
+def fast_json_endpoint(endpoint: Callable, status_code: Optional[int]) -> Callable:
+    """Wrap an async endpoint so whatever it returns is sent as a FastJSONResponse"""
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result, status_code=status_code or 200)
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route class of every router in app/api. With FAST_JSON_RESPONSES, an endpoint's return value
+    goes straight to orjson, skipping FastAPI's response_model validation and serialization (or
+    its jsonable_encoder pass, much slower, for routes without a response_model). Responses
+    returned explicitly (streams, JSONResponse) are sent unchanged.
+    """
+
+    enabled: bool = settings.FAST_JSON_RESPONSES
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if self.enabled:
+            endpoint = fast_json_endpoint(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
@@ -1,9 +1,12 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
+from typing import List
+from app.api.batch import batch_response
 from app.domain.models import RoadmapOptions
 from app.services.roadmap_service import generate_roadmap
+from app.api.responses import FastJSONRoute
 
-router = APIRouter(prefix="/roadmap", tags=["Roadmap"])
+router = APIRouter(prefix="/roadmap", tags=["Roadmap"], route_class=FastJSONRoute)
 
 class RoadmapRequest(BaseModel):
     topic: str
@@ -11,8 +14,20 @@ class RoadmapRequest(BaseModel):
     duration: str
     include_resources: bool
 
+class RoadmapBatchRequest(BaseModel):
+    items: List[RoadmapRequest]
+    stream: bool = False
+
 @router.post("/", response_model=dict)
 async def create_roadmap(request: RoadmapRequest):
+    return await roadmap_for_request(request)
+
+@router.post("/batch")
+async def create_roadmap_batch(request: RoadmapBatchRequest):
+    """Many roadmaps in one call, generated concurrently; set `stream` for NDJSON results as they complete"""
+    return await batch_response(request.items, roadmap_for_request, request.stream)
+
+async def roadmap_for_request(request: RoadmapRequest) -> dict:
     options = RoadmapOptions(
         topic=request.topic,
         complexity_level=request.complexity_level,
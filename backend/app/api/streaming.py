@@ -0,0 +1,49 @@
+from typing import AsyncIterator
+import traceback
+
+from fastapi.responses import StreamingResponse
+
+from app.api.responses import dumps
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+
+def sse_response(events: AsyncIterator[dict]) -> StreamingResponse:
+    """
+    Server-sent events from an async iterator of {"event": ..., "data": ...} dicts.
+    Errors after the response has started are reported as an `error` event.
+    """
+    async def body():
+        try:
+            async for item in events:
+                yield sse_event(item["event"], item["data"])
+        except Exception as e:
+            traceback.print_exc()
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: keep proxies (nginx) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def ndjson_response(items: AsyncIterator[dict]) -> StreamingResponse:
+    """Newline-delimited JSON, one object per line, flushed as each item is produced"""
+    async def body():
+        try:
+            async for item in items:
+                # Results may hold pydantic models (e.g. flashcards)
+                yield dumps(item) + "\n"
+        except Exception as e:
+            traceback.print_exc()
+            yield dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
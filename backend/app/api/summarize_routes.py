@@ -1,15 +1,16 @@
-from fastapi import APIRouter, File, UploadFile, Form
+from fastapi import APIRouter, Depends, File, UploadFile, Form
 from typing import List
 from pydantic import BaseModel
-from app.services.summarize_service import summarize_content
-from app.infrastructure.files.file_manager import extract_file_contents
+from app.services.summarize_service import summarize_documents, stream_summary
+from app.api.streaming import sse_response
+from app.api.document_routes import gather_contents
 from app.domain.models import SummaryOptions
+from app.api.responses import FastJSONRoute
 
-router = APIRouter(prefix="/summarize", tags=["Summaries"])
+router = APIRouter(prefix="/summarize", tags=["Summaries"], route_class=FastJSONRoute)
 
-@router.post("/", response_model=dict)
-async def summarize(
-    files: List[UploadFile] = File(..., description="PDFs to be summarized"),
+
+def summary_options_form(
     character: str = Form("review"),
     language_register: str = Form("formal"),
     language: str = Form("English"),
@@ -17,8 +18,9 @@ async def summarize(
     include_references: bool = Form(False),
     include_examples: bool = Form(False),
     include_conclusions: bool = Form(False)
-):
-    options = SummaryOptions(
+) -> SummaryOptions:
+    """The summary form fields as a dependency, shared by every endpoint that takes them"""
+    return SummaryOptions(
         character=character,
         language_register=language_register,
         language=language,
@@ -28,10 +30,35 @@ async def summarize(
         include_conclusions=include_conclusions
     )
 
+
+@router.post("/", response_model=dict)
+async def summarize(
+    files: List[UploadFile] = File(default=[], description="PDFs to be summarized"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    options: SummaryOptions = Depends(summary_options_form),
+):
     # Content extraction
-    data = await extract_file_contents(files)    
-    joined_content = "\n\n".join("\n\n".join(page for page in file_content) for file_content in data)
+    data = await gather_contents(files, document_ids)
 
-    # Summary generation
-    summary = await summarize_content(joined_content, options)
+    # Summary generation (chunked map-reduce for documents larger than one prompt)
+    summary = await summarize_documents(data, options)
     return {"summary": summary}
+
+
+@router.post(
+    "/stream",
+    description="""
+Same as `/summarize/` but streams the summary as server-sent events:
+- progress: large documents are being reduced ({"stage", "chunks"})
+- token: a fragment of the summary text ({"text"})
+- done: the full summary, in the same shape as `/summarize/` ({"summary": {"summary", "references", "examples", "conclusions"}})
+- error: generation failed ({"detail"})
+""",
+)
+async def summarize_stream(
+    files: List[UploadFile] = File(default=[], description="PDFs to be summarized"),
+    document_ids: List[str] = Form(default=[], description="IDs returned by /api/documents"),
+    options: SummaryOptions = Depends(summary_options_form),
+):
+    data = await gather_contents(files, document_ids)
+    return sse_response(stream_summary(data, options))
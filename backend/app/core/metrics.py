@@ -0,0 +1,155 @@
+from contextlib import contextmanager
+from typing import Callable, Dict
+import re
+import time
+
+import anyio
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.tracing import span
+
+# Seconds; generation calls run from sub-second to a few minutes
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+TOKEN_BUCKETS = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time from request start to the last body byte",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being served, streamed responses included")
+
+STAGE_DURATION = Histogram(
+    "stage_duration_seconds",
+    "Time spent per pipeline stage (upload_read, pdf_parse, docx_parse, preprocess, prompt_render, llm_call, "
+    "structured_parse, json_repair, format_output, ...)",
+    ["stage"], buckets=LATENCY_BUCKETS,
+)
+
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Tokens per upstream call (usage metadata when the model reports it, otherwise estimated)",
+    ["model", "direction"], buckets=TOKEN_BUCKETS,
+)
+LLM_CALLS = Counter("llm_calls", "Upstream model calls by outcome (ok, error)", ["model", "outcome"])
+LLM_RETRIES = Counter("llm_retries", "Upstream calls retried after throttling", ["model"])
+LLM_IN_FLIGHT = Gauge("llm_calls_in_flight", "Upstream model calls in progress", ["model"])
+CACHE_LOOKUPS = Counter("response_cache_lookups", "Response cache lookups by result (hit, miss)", ["result"])
+PREPROCESS_CHARS = Counter(
+    "document_preprocess_chars", "Document characters before and after preprocessing (input, output)", ["side"]
+)
+
+
+@contextmanager
+def stage(name: str):
+    """Record the duration of a block under `stage_duration_seconds{stage=name}`, as a span too"""
+    started = time.perf_counter()
+    try:
+        with span(name):
+            yield
+    finally:
+        STAGE_DURATION.labels(name).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def llm_call(model_name: str):
+    """One upstream attempt: in-flight gauge, outcome counter and the `llm_call` stage"""
+    in_flight = LLM_IN_FLIGHT.labels(model_name)
+    in_flight.inc()
+    outcome = "error"
+    try:
+        with stage("llm_call"):
+            yield
+        outcome = "ok"
+    finally:
+        in_flight.dec()
+        LLM_CALLS.labels(model_name, outcome).inc()
+
+
+def record_tokens(model_name: str, prompt_tokens: int, response_tokens: int) -> None:
+    LLM_TOKENS.labels(model_name, "prompt").observe(prompt_tokens)
+    LLM_TOKENS.labels(model_name, "response").observe(response_tokens)
+
+
+def _metric_name(*parts: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", "_".join(parts)).lower()
+
+
+# `stats()` keys that only ever grow: exposed as counters so rate() and increase() apply
+COUNTER_KEYS = {"hits", "misses", "sets", "evictions", "builds", "leaders", "followers", "admitted", "throttled"}
+
+
+class StatsCollector:
+    """
+    Exposes the `stats()` dicts the app already keeps (caches, pools, queues) at scrape time,
+    e.g. {"entries": 3} from source "response_cache" becomes the gauge `response_cache_entries 3`
+    and {"hits": 3} (a COUNTER_KEYS key) the counter `response_cache_hits_total 3`.
+    """
+
+    def __init__(self, sources: Dict[str, Callable[[], dict]]):
+        self.sources = sources
+
+    def collect(self):
+        for source, read_stats in self.sources.items():
+            try:
+                stats = read_stats()
+            except Exception as e:
+                print(f"[WARNING] Failed to read {source} stats for /metrics: {e}")
+                continue
+            yield from self._flatten(source, stats)
+
+    def _flatten(self, prefix: str, stats: dict):
+        for key, value in stats.items():
+            name = _metric_name(prefix, str(key))
+            if isinstance(value, dict):
+                yield from self._flatten(name, value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                family = CounterMetricFamily if key in COUNTER_KEYS else GaugeMetricFamily
+                yield family(name, f"{prefix} {key}", value=value)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency and in-flight requests. Timing ends with the
+    last body chunk, so streamed (SSE/NDJSON) responses are measured in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+        REQUESTS_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            # The route template (e.g. /api/jobs/{job_id}) keeps label cardinality bounded
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_DURATION.labels(scope["method"], route, str(status["code"])).observe(time.perf_counter() - started)
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    # In a worker thread: collecting calls every registered stats() source, some of which query SQLite
+    return Response(await anyio.to_thread.run_sync(generate_latest, REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+
+_stats_collector = StatsCollector({})
+REGISTRY.register(_stats_collector)
+
+
+def register_stats(sources: Dict[str, Callable[[], dict]]) -> None:
+    """Add `stats()` sources to /metrics (calling it again with the same names replaces them)"""
+    _stats_collector.sources.update(sources)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
@@ -9,7 +10,104 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str
     GEMINI_MODEL_PRO: str
 
+    # Upstream scheduler: per-model budgets (0 = unlimited) and shared backoff when Gemini throttles
+    GEMINI_RPM: int = 1000
+    GEMINI_TPM: int = 1_000_000
+    GEMINI_MAX_CONCURRENCY: int = 16
+    GEMINI_PRO_RPM: int = 150
+    GEMINI_PRO_TPM: int = 2_000_000
+    GEMINI_PRO_MAX_CONCURRENCY: int = 8
+    UPSTREAM_MAX_ATTEMPTS: int = 5
+    UPSTREAM_BACKOFF_BASE_SECONDS: float = 1.0
+    UPSTREAM_BACKOFF_MAX_SECONDS: float = 60.0
+
+    # Response cache (memory / sqlite / none)
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL_SECONDS: int = 3600
+    CACHE_MAX_ENTRIES: int = 512
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_SQLITE_PATH: str = ".cache/responses.sqlite3"
+
+    # Map-reduce summarization of large documents
+    SUMMARY_CHUNK_TOKENS: int = 24000
+    SUMMARY_MAX_CONCURRENCY: int = 4
+
+    # Content budget for count-limited artifacts (flashcards, exercises): larger content is reduced
+    # to its most salient passages. Budget in tokens = base + per item, capped at max
+    CONTENT_BUDGET_ENABLED: bool = True
+    CONTENT_BUDGET_BASE_TOKENS: int = 4000
+    CONTENT_BUDGET_PER_ITEM_TOKENS: int = 1500
+    CONTENT_BUDGET_MAX_TOKENS: int = 48000
+    CONTENT_PASSAGE_TOKENS: int = 400
+    # Passage indexes are built once per document and reused by every call over it
+    RETRIEVAL_INDEX_MAX_ENTRIES: int = 32
+
+    # Learning paths: outline first, then one call per module in parallel
+    LEARNING_PATH_FANOUT: bool = True
+    LEARNING_PATH_MAX_CONCURRENCY: int = 4
+    # Each module call only gets the passages relevant to its outline, up to this many tokens
+    LEARNING_PATH_MODULE_CONTENT_TOKENS: int = 24000
+    # Sessions of structure-only paths are written on first access (GET /learning-path/{id}/sessions/{session_id})
+    LEARNING_PATH_SESSION_CONTENT_TOKENS: int = 12000
+
+    # Mixed exercise sets: "auto" uses one call for small sets or large documents, otherwise one call per type
+    EXERCISES_SINGLE_CALL_MAX_COUNT: int = 10
+    EXERCISES_SINGLE_CALL_MIN_CONTENT_TOKENS: int = 32000
+
+    # Batch endpoints (/by_topic/batch, /games/batch, /roadmap/batch); the concurrency is shared by all batch requests
+    BATCH_MAX_CONCURRENCY: int = 8
+    BATCH_MAX_ITEMS: int = 500
+
+    # Render JSON responses with orjson, skipping FastAPI's response validation and encoding
+    # (same JSON, compact). Off by default
+    FAST_JSON_RESPONSES: bool = False
+
+    # Background jobs (/api/jobs): memory or sqlite (survives restarts)
+    JOB_BACKEND: str = "memory"
+    JOB_SQLITE_PATH: str = ".cache/jobs.sqlite3"
+    JOB_WORKERS: int = 4
+    JOB_RESERVED_WORKERS: int = 1  # never given low-priority jobs
+    JOB_RESULT_TTL_SECONDS: int = 24 * 3600
+
+    # Generated learning paths, flashcards and exercises (/api/artifacts): memory or sqlite
+    # (survives restarts; falls back to memory when the path is not writable).
+    # Artifacts not updated for the TTL are purged at startup and every purge interval (0 = keep
+    # forever); past the entry or byte cap (artifacts plus stored source texts) the least
+    # recently updated are evicted
+    ARTIFACT_STORE_BACKEND: str = "memory"
+    ARTIFACT_STORE_PATH: str = ".cache/artifacts.sqlite3"
+    ARTIFACT_STORE_MAX_ENTRIES: int = 10000
+    ARTIFACT_STORE_MAX_BYTES: int = 512 * 1024 * 1024
+    ARTIFACT_TTL_SECONDS: int = 7 * 24 * 3600
+    ARTIFACT_PURGE_INTERVAL_SECONDS: int = 3600
+
+    # Tracing: a span tree per request, exported to none / console / file (JSON lines). Requests
+    # slower than the threshold get their span tree logged whatever the exporter (0 = off)
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = ".cache/traces.jsonl"
+    SLOW_REQUEST_THRESHOLD_SECONDS: float = 30.0
+
+    # File extraction
+    EXTRACTION_CONCURRENCY: int = 4
+    PDF_WORKERS: int = 0  # 0 = one worker process per CPU
+    PDF_PAGES_PER_SHARD: int = 25
+    UPLOAD_MEMORY_LIMIT_BYTES: int = 16 * 1024 * 1024  # per request, larger uploads are parsed from their temp file
+    UPLOAD_TEMP_DIR: Optional[str] = None
+    # Strip running headers/footers, page numbers, hyphenation breaks, whitespace runs and
+    # duplicate pages/paragraphs from the documents before they are sent to the model
+    PREPROCESS_DOCUMENTS: bool = True
+
+    # Extracted text cache, also backs the document IDs returned by /api/documents.
+    # Memory only by default; with a path on a writable disk (e.g. .cache/extractions.sqlite3)
+    # documents also go to SQLite, opened at startup, and survive restarts
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 256
+    EXTRACTION_CACHE_MEMORY_BYTES: int = 128 * 1024 * 1024
+    EXTRACTION_CACHE_PATH: Optional[str] = None
+    EXTRACTION_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    EXTRACTION_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+
 # avoid reloading settings
 @lru_cache()
 def get_settings():
-    return Settings()
\ No newline at end of file
+    return Settings()
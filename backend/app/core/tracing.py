@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import threading
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.trace import Status, StatusCode
+
+# Resolves to the provider installed by `configure_tracing`; spans are no-ops until then
+tracer = trace.get_tracer("app")
+
+# Traces whose root span never ends (e.g. a dropped stream) are forgotten past this many
+MAX_PENDING_TRACES = 1000
+
+
+def span(name: str, **attributes):
+    """Context manager opening a child span of the current one"""
+    return tracer.start_as_current_span(name, attributes=attributes or None)
+
+
+class SlowTraceLogger(SpanProcessor):
+    """
+    Keeps the finished spans of every trace until its root span ends, then logs the whole span
+    tree when the root took longer than `threshold_seconds`. Fast traces are simply dropped.
+    """
+
+    def __init__(self, threshold_seconds: float):
+        self.threshold_ns = int(threshold_seconds * 1e9)
+        self._pending: "OrderedDict[int, List[ReadableSpan]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.context.trace_id
+        with self._lock:
+            if span.parent is not None:
+                self._pending.setdefault(trace_id, []).append(span)
+                while len(self._pending) > MAX_PENDING_TRACES:
+                    self._pending.popitem(last=False)
+                return
+            spans = self._pending.pop(trace_id, []) + [span]
+
+        if span.end_time - span.start_time >= self.threshold_ns:
+            print(
+                f"[WARNING] Slow request: {span.name} took {(span.end_time - span.start_time) / 1e9:.2f}s\n"
+                + format_span_tree(spans)
+            )
+
+
+def format_span_tree(spans: List[ReadableSpan]) -> str:
+    """One line per span, indented under its parent: offset from the root start, duration, errors"""
+    children: Dict[Optional[int], List[ReadableSpan]] = {}
+    ids = {span.context.span_id for span in spans}
+    for span in sorted(spans, key=lambda span: span.start_time):
+        parent = span.parent.span_id if span.parent is not None and span.parent.span_id in ids else None
+        children.setdefault(parent, []).append(span)
+
+    roots = children.get(None, [])
+    origin = min(span.start_time for span in spans)
+    lines = []
+
+    def render(span: ReadableSpan, depth: int) -> None:
+        offset = (span.start_time - origin) / 1e6
+        duration = (span.end_time - span.start_time) / 1e6
+        error = " ERROR" if span.status.status_code == StatusCode.ERROR else ""
+        lines.append(f"{'  ' * depth}{span.name}  +{offset:.1f}ms  {duration:.1f}ms{error}")
+        for child in children.get(span.context.span_id, []):
+            render(child, depth + 1)
+
+    for root in roots:
+        render(root, 1)
+    return "\n".join(lines)
+
+
+def _file_exporter(path: str) -> ConsoleSpanExporter:
+    # One OTLP-style JSON span per line, readable with jq or importable into a trace viewer
+    return ConsoleSpanExporter(
+        out=open(path, "a", encoding="utf-8"),
+        formatter=lambda span: span.to_json(indent=None) + "\n",
+    )
+
+
+_configured = False
+
+
+def configure_tracing(exporter: str, file_path: str, slow_request_seconds: float) -> None:
+    """Install the tracer provider once: span export (none / console / file) and the slow-request log"""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    provider = TracerProvider(resource=Resource.create({"service.name": "chrome-ia-system"}))
+    if exporter == "console":
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    elif exporter == "file":
+        provider.add_span_processor(BatchSpanProcessor(_file_exporter(file_path)))
+    elif exporter != "none":
+        print(f"[WARNING] Unknown TRACING_EXPORTER '{exporter}', spans are not exported")
+    if slow_request_seconds > 0:
+        provider.add_span_processor(SlowTraceLogger(slow_request_seconds))
+    trace.set_tracer_provider(provider)
+
+
+def shutdown_tracing() -> None:
+    """Flush pending exports"""
+    provider = trace.get_tracer_provider()
+    if isinstance(provider, TracerProvider):
+        provider.shutdown()
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span of every request, so route handlers, extraction,
+    upstream calls and post-processing all nest under it. The span lasts until the last body
+    chunk and is renamed to the route template (e.g. `POST /api/learning-path/`) once known.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with tracer.start_as_current_span(f"{method} {scope['path']}", kind=trace.SpanKind.SERVER) as request_span:
+            request_span.set_attribute("http.method", method)
+            request_span.set_attribute("http.target", scope["path"])
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    request_span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        request_span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    request_span.set_attribute("http.route", route)
+                    request_span.update_name(f"{method} {route}")
@@ -17,6 +17,25 @@ class ExercisesByTopicRequest(BaseModel):
     exercises_difficulty: str = "medium"
     exercises_types: ExerciseType = ExerciseType.multiple_choice
 
+class MixedExerciseStrategy(str, Enum):
+    auto = "auto"
+    single_call = "single_call"
+    concurrent = "concurrent"
+
+class ExerciseTypeCount(BaseModel):
+    type: ExerciseType
+    count: int = 5
+
+class MixedExercisesByTopicRequest(BaseModel):
+    topic: str
+    exercises: List[ExerciseTypeCount]
+    exercises_difficulty: str = "medium"
+    strategy: MixedExerciseStrategy = MixedExerciseStrategy.auto
+
+class ExercisesBatchRequest(BaseModel):
+    items: List[ExercisesByTopicRequest]
+    stream: bool = False
+
 class MultipleChoiceExerciseSet(BaseModel):
     """Un contenedor para una lista de ejercicios de opción múltiple."""
     exercises: List[MultipleChoiceExercise] = Field(description="Lista de ejercicios de opción múltiple")
\ No newline at end of file
@@ -1,7 +1,11 @@
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal
 
 class GameOptions(BaseModel):
     topic: str = "any topic"
     game_type: Literal["word_search", "crossword"] = "word_search"
     language: str = "Spanish"
+
+class GameBatchRequest(BaseModel):
+    items: List[GameOptions]
+    stream: bool = False
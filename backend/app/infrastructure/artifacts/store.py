@@ -0,0 +1,459 @@
+from typing import Callable, Dict, List, Optional, Sequence
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import orjson
+
+# Artifact fields besides `data`, as returned by listings
+SUMMARY_FIELDS = ("id", "kind", "owner", "document_ids", "source_hash", "created_at", "updated_at", "size")
+
+
+def _default(value):
+    # Pydantic models (e.g. FlashCard) are stored as their plain dict
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode(value) -> bytes:
+    """orjson + zlib: typically 4-6x smaller than the JSON response for generated text"""
+    return zlib.compress(orjson.dumps(value, default=_default), 6)
+
+
+def decode(raw: bytes):
+    return orjson.loads(zlib.decompress(raw))
+
+
+def source_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class ArtifactStore:
+    """
+    Generated artifacts (learning paths, flashcards, exercises) as dicts: id, kind, owner,
+    document_ids (the /api/documents IDs they were generated from), source_hash, created_at,
+    updated_at, size and data. Source texts are kept separately, once per SHA-256 (`source_hash`),
+    for artifacts that are completed later. Past `max_entries` artifacts or
+    `max_bytes` (compressed artifacts plus sources; 0 = no limit) the least recently updated
+    artifacts are evicted, with the sources no artifact refers to any more. This base class keeps
+    everything in memory (nothing survives a restart).
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._artifacts: Dict[str, dict] = {}
+        self._blobs: Dict[str, bytes] = {}
+        self._sources: Dict[str, tuple] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _over_limits(self, count: int) -> bool:
+        return bool(self.max_entries and count > self.max_entries or self.max_bytes and self._size > self.max_bytes)
+
+    def put(
+        self,
+        artifact_id: str,
+        kind: str,
+        data,
+        document_ids: Sequence[str] = (),
+        source_hash: str = None,
+        owner: str = None,
+    ) -> dict:
+        """Insert or replace an artifact; returns its summary"""
+        raw = encode(data)
+        now = time.time()
+        with self._lock:
+            previous = self._artifacts.get(artifact_id)
+            summary = {
+                "id": artifact_id,
+                "kind": kind,
+                "owner": owner,
+                "document_ids": list(document_ids),
+                "source_hash": source_hash,
+                "created_at": previous["created_at"] if previous else now,
+                "updated_at": now,
+                "size": len(raw),
+            }
+            self._artifacts[artifact_id] = summary
+            self._size += len(raw) - len(self._blobs.get(artifact_id, b""))
+            self._blobs[artifact_id] = raw
+            self._evict()
+            return {**summary, "document_ids": list(summary["document_ids"])}
+
+    def get(self, artifact_id: str) -> Optional[dict]:
+        with self._lock:
+            summary = self._artifacts.get(artifact_id)
+            raw = self._blobs.get(artifact_id)
+        return {**summary, "document_ids": list(summary["document_ids"]), "data": decode(raw)} if summary else None
+
+    def update(self, artifact_id: str, data) -> bool:
+        """Replace the data of an existing artifact, keeping its metadata"""
+        raw = encode(data)
+        with self._lock:
+            if artifact_id not in self._artifacts:
+                return False
+            self._replace(artifact_id, raw)
+            return True
+
+    def modify(self, artifact_id: str, change: Callable) -> bool:
+        """
+        Read, change and write back the data of an artifact in one locked step, so concurrent
+        changes to different parts of it (e.g. two sessions of a learning path) are not lost.
+        `change` receives the data and returns the new data; False for an unknown artifact.
+        """
+        with self._lock:
+            if artifact_id not in self._artifacts:
+                return False
+            self._replace(artifact_id, encode(change(decode(self._blobs[artifact_id]))))
+            return True
+
+    def _replace(self, artifact_id: str, raw: bytes) -> None:
+        # Called with the lock held
+        self._artifacts[artifact_id].update(updated_at=time.time(), size=len(raw))
+        self._size += len(raw) - len(self._blobs[artifact_id])
+        self._blobs[artifact_id] = raw
+        self._evict()
+
+    def list(
+        self,
+        owner: str = None,
+        kind: str = None,
+        document_id: str = None,
+        before: float = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        """Summaries (no data), newest first; page with `before` = created_at of the last one"""
+        with self._lock:
+            matches = [
+                {**summary, "document_ids": list(summary["document_ids"])} for summary in self._artifacts.values()
+                if (owner is None or summary["owner"] == owner)
+                and (kind is None or summary["kind"] == kind)
+                and (document_id is None or document_id in summary["document_ids"])
+                and (before is None or summary["created_at"] < before)
+            ]
+        matches.sort(key=lambda summary: summary["created_at"], reverse=True)
+        return matches[:limit]
+
+    def put_source(self, content: str) -> str:
+        """Store a source text once and return its hash"""
+        digest = source_hash(content)
+        with self._lock:
+            if digest not in self._sources:
+                self._sources[digest] = (time.time(), zlib.compress(content.encode("utf-8"), 6))
+                self._size += len(self._sources[digest][1])
+        return digest
+
+    def source(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._sources.get(digest)
+        return zlib.decompress(entry[1]).decode("utf-8") if entry else None
+
+    def purge(self, older_than: float) -> int:
+        """Drop artifacts not updated since `older_than`, and the sources no artifact refers to"""
+        with self._lock:
+            expired = [artifact_id for artifact_id, summary in self._artifacts.items() if summary["updated_at"] < older_than]
+            for artifact_id in expired:
+                self._remove(artifact_id)
+            self._drop_orphan_sources()
+            return len(expired)
+
+    def _remove(self, artifact_id: str) -> None:
+        del self._artifacts[artifact_id]
+        self._size -= len(self._blobs.pop(artifact_id))
+
+    def _drop_orphan_sources(self) -> None:
+        referenced = {summary["source_hash"] for summary in self._artifacts.values()}
+        for digest in [digest for digest in self._sources if digest not in referenced]:
+            self._size -= len(self._sources.pop(digest)[1])
+
+    def _evict(self) -> None:
+        # Called with the lock held, after every write
+        if not self._over_limits(len(self._artifacts)):
+            return
+        for summary in sorted(self._artifacts.values(), key=lambda summary: summary["updated_at"]):
+            self._remove(summary["id"])
+            self.evictions += 1
+            if not self._over_limits(len(self._artifacts)):
+                break
+        self._drop_orphan_sources()
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds: Dict[str, int] = {}
+            for summary in self._artifacts.values():
+                kinds[summary["kind"]] = kinds.get(summary["kind"], 0) + 1
+            return {
+                "backend": self.__class__.__name__,
+                "artifacts": kinds,
+                "bytes": sum(len(raw) for raw in self._blobs.values()),
+                "sources": len(self._sources),
+                "source_bytes": sum(len(entry[1]) for entry in self._sources.values()),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+
+class SQLiteArtifactStore(ArtifactStore):
+    """Artifact store that survives restarts, indexed for lookups by owner, kind and source."""
+
+    def __init__(self, path: str, max_entries: int = 0, max_bytes: int = 0):
+        super().__init__(max_entries, max_bytes)
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                owner TEXT,
+                document_ids TEXT NOT NULL DEFAULT '',
+                source_hash TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(artifacts)")}
+        if "document_ids" not in columns:
+            # Stores created before artifacts recorded their documents
+            self._conn.execute("ALTER TABLE artifacts ADD COLUMN document_ids TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_owner ON artifacts (owner, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_kind ON artifacts (kind, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_source ON artifacts (source_hash, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_created ON artifacts (created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_updated ON artifacts (updated_at)")
+        # One row per (document, artifact), for lookups by document ID
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS artifact_documents (
+                document_id TEXT NOT NULL,
+                artifact_id TEXT NOT NULL,
+                PRIMARY KEY (document_id, artifact_id)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifact_documents_artifact ON artifact_documents (artifact_id)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                hash TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                data BLOB NOT NULL
+            )
+        """)
+        self._count, self._size = self._totals()
+
+    def _totals(self) -> tuple:
+        count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        source_bytes = self._conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM sources").fetchone()[0]
+        return count, size + source_bytes
+
+    @staticmethod
+    def _summary(row) -> dict:
+        summary = dict(zip(SUMMARY_FIELDS, row))
+        summary["document_ids"] = summary["document_ids"].split(",") if summary["document_ids"] else []
+        return summary
+
+    def put(
+        self,
+        artifact_id: str,
+        kind: str,
+        data,
+        document_ids: Sequence[str] = (),
+        source_hash: str = None,
+        owner: str = None,
+    ) -> dict:
+        raw = encode(data)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+            self._conn.execute(
+                "INSERT INTO artifacts (id, kind, owner, document_ids, source_hash, created_at, updated_at, size, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET kind = excluded.kind, owner = excluded.owner, "
+                "document_ids = excluded.document_ids, source_hash = excluded.source_hash, "
+                "updated_at = excluded.updated_at, size = excluded.size, data = excluded.data",
+                (artifact_id, kind, owner, ",".join(document_ids), source_hash, now, now, len(raw), sqlite3.Binary(raw)),
+            )
+            self._conn.execute("DELETE FROM artifact_documents WHERE artifact_id = ?", (artifact_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO artifact_documents (document_id, artifact_id) VALUES (?, ?)",
+                [(document_id, artifact_id) for document_id in document_ids],
+            )
+            row = self._conn.execute(
+                f"SELECT {', '.join(SUMMARY_FIELDS)} FROM artifacts WHERE id = ?", (artifact_id,)
+            ).fetchone()
+            if previous:
+                self._size -= previous[0]
+            else:
+                self._count += 1
+            self._size += len(raw)
+            self._evict()
+        return self._summary(row)
+
+    def get(self, artifact_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(SUMMARY_FIELDS)}, data FROM artifacts WHERE id = ?", (artifact_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {**self._summary(row[:-1]), "data": decode(row[-1])}
+
+    def update(self, artifact_id: str, data) -> bool:
+        raw = encode(data)
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+            if previous is None:
+                return False
+            self._conn.execute(
+                "UPDATE artifacts SET data = ?, size = ?, updated_at = ? WHERE id = ?",
+                (sqlite3.Binary(raw), len(raw), time.time(), artifact_id),
+            )
+            self._size += len(raw) - previous[0]
+            self._evict()
+            return True
+
+    def modify(self, artifact_id: str, change: Callable) -> bool:
+        with self._lock:
+            # IMMEDIATE: also holds off other processes writing to the same file
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT size, data FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return False
+                raw = encode(change(decode(row[1])))
+                self._conn.execute(
+                    "UPDATE artifacts SET data = ?, size = ?, updated_at = ? WHERE id = ?",
+                    (sqlite3.Binary(raw), len(raw), time.time(), artifact_id),
+                )
+                self._size += len(raw) - row[0]
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                self._count, self._size = self._totals()
+                raise
+            return True
+
+    def list(
+        self,
+        owner: str = None,
+        kind: str = None,
+        document_id: str = None,
+        before: float = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        conditions, values = [], []
+        for column, value in (("owner", owner), ("kind", kind)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        if document_id is not None:
+            conditions.append("id IN (SELECT artifact_id FROM artifact_documents WHERE document_id = ?)")
+            values.append(document_id)
+        if before is not None:
+            conditions.append("created_at < ?")
+            values.append(before)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(SUMMARY_FIELDS)} FROM artifacts {where}ORDER BY created_at DESC LIMIT ?",
+                values + [limit],
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def put_source(self, content: str) -> str:
+        digest = source_hash(content)
+        with self._lock:
+            exists = self._conn.execute("SELECT 1 FROM sources WHERE hash = ?", (digest,)).fetchone()
+            if not exists:
+                compressed = zlib.compress(content.encode("utf-8"), 6)
+                self._conn.execute(
+                    "INSERT INTO sources (hash, created_at, data) VALUES (?, ?, ?)",
+                    (digest, time.time(), sqlite3.Binary(compressed)),
+                )
+                self._size += len(compressed)
+        return digest
+
+    def source(self, digest: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sources WHERE hash = ?", (digest,)).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            expired = self._conn.execute("DELETE FROM artifacts WHERE updated_at < ?", (older_than,)).rowcount
+            self._drop_orphan_sources()
+            self._count, self._size = self._totals()
+            return expired
+
+    def _drop_orphan_sources(self) -> None:
+        # Also the document rows of deleted artifacts
+        self._conn.execute(
+            "DELETE FROM sources WHERE hash NOT IN (SELECT source_hash FROM artifacts WHERE source_hash IS NOT NULL)"
+        )
+        self._conn.execute("DELETE FROM artifact_documents WHERE artifact_id NOT IN (SELECT id FROM artifacts)")
+
+    def _evict(self) -> None:
+        while self._over_limits(self._count):
+            rows = self._conn.execute("SELECT id FROM artifacts ORDER BY updated_at LIMIT 32").fetchall()
+            if not rows:
+                break
+            for (artifact_id,) in rows:
+                self._conn.execute("DELETE FROM artifacts WHERE id = ?", (artifact_id,))
+                self.evictions += 1
+                self._count -= 1
+                if not self._over_limits(self._count):
+                    break
+            self._drop_orphan_sources()
+            self._count, self._size = self._totals()
+
+    def stats(self) -> dict:
+        with self._lock:
+            kinds = dict(self._conn.execute("SELECT kind, COUNT(*) FROM artifacts GROUP BY kind").fetchall())
+            size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+            sources, source_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sources"
+            ).fetchone()
+        return {
+            "backend": self.__class__.__name__,
+            "artifacts": kinds,
+            "bytes": size,
+            "sources": sources,
+            "source_bytes": source_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "path": self.path,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def build_artifact_store(backend: str, path: str, max_entries: int = 0, max_bytes: int = 0) -> ArtifactStore:
+    backend = (backend or "memory").lower()
+    if backend == "sqlite":
+        try:
+            return SQLiteArtifactStore(path, max_entries, max_bytes)
+        except (OSError, sqlite3.Error) as e:
+            # A read-only deployment still starts, without persistence
+            print(f"[WARNING] Artifact store at {path} unavailable, keeping artifacts in memory: {e}")
+            return ArtifactStore(max_entries, max_bytes)
+    if backend == "memory":
+        return ArtifactStore(max_entries, max_bytes)
+    raise ValueError(f"Unknown artifact backend: {backend}")
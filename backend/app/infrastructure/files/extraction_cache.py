@@ -0,0 +1,76 @@
+from typing import List, Optional
+import json
+import sqlite3
+import zlib
+
+from app.core.settings import get_settings
+from app.infrastructure.cache.backends import CacheBackend, MemoryCache, NullCache, SQLiteCache
+
+settings = get_settings()
+
+
+class ExtractionStore:
+    """
+    Extracted page lists keyed by the SHA-256 of the uploaded file.
+    A memory LRU sits in front of a zlib-compressed SQLite store that survives restarts
+    (attached by `open_extraction_store` at startup, when EXTRACTION_CACHE_PATH is set).
+    Both are blocking (SQLite, zlib, JSON of multi-MB documents): call them from worker threads.
+    """
+
+    def __init__(self, memory: CacheBackend, disk: CacheBackend):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, digest: str) -> Optional[dict]:
+        raw = self.memory.get(digest)
+        if raw is None:
+            compressed = self.disk.get(digest)
+            if compressed is None:
+                return None
+            raw = zlib.decompress(compressed)
+            self.memory.set(digest, raw)
+        return json.loads(raw)
+
+    def put(self, digest: str, filename: str, pages: List[str]) -> None:
+        raw = json.dumps({"filename": filename, "pages": pages}, ensure_ascii=False).encode("utf-8")
+        self.memory.set(digest, raw)
+        self.disk.set(digest, zlib.compress(raw, 6))
+
+    def touch(self, digest: str) -> None:
+        """Restart the TTL of a document, e.g. when the same file is uploaded again"""
+        self.memory.touch(digest)
+        self.disk.touch(digest)
+
+    def stats(self) -> dict:
+        return {"memory": self.memory.stats(), "disk": self.disk.stats()}
+
+
+def build_extraction_store() -> ExtractionStore:
+    """Memory-only store: importing the app never touches the filesystem"""
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return ExtractionStore(NullCache(), NullCache())
+    return ExtractionStore(
+        MemoryCache(
+            max_entries=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+            max_bytes=settings.EXTRACTION_CACHE_MEMORY_BYTES,
+            ttl_seconds=settings.EXTRACTION_CACHE_TTL_SECONDS,
+        ),
+        NullCache(),
+    )
+
+
+def open_extraction_store() -> None:
+    """Attach the SQLite store at startup; stays memory-only when its directory is not writable"""
+    if not settings.EXTRACTION_CACHE_ENABLED or not settings.EXTRACTION_CACHE_PATH:
+        return
+    try:
+        extraction_store.disk = SQLiteCache(
+            settings.EXTRACTION_CACHE_PATH,
+            max_bytes=settings.EXTRACTION_CACHE_MAX_BYTES,
+            ttl_seconds=settings.EXTRACTION_CACHE_TTL_SECONDS,
+        )
+    except (OSError, sqlite3.Error) as e:
+        print(f"[WARNING] Extraction cache at {settings.EXTRACTION_CACHE_PATH} unavailable, keeping it in memory: {e}")
+
+
+extraction_store = build_extraction_store()
@@ -1,20 +1,69 @@
-from typing import List
-import io
+from typing import BinaryIO, List, Optional, Tuple, Union
+import hashlib
+import os
 import anyio
 
 import pdfplumber
 import docx 
 
-def extract_pdf_content(file_bytes: bytes, filename: str) -> List[str]:
+from app.core.metrics import stage
+from app.core.settings import get_settings
+from app.core.tracing import span
+from app.infrastructure.files.extraction_cache import extraction_store
+from app.infrastructure.files.pdf_pool import extract_pdf_parallel, open_source, pdf_metadata_text
+
+settings = get_settings()
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Extractors accept the upload either as in-memory bytes or as its spooled file object
+FileSource = Union[bytes, BinaryIO]
+
+class MemoryBudget:
+    """Bytes of upload data a single request may read into memory; the rest is parsed from Starlette's spooled files"""
+
+    def __init__(self, limit: int):
+        self.remaining = limit
+
+    def reserve(self, size: int) -> bool:
+        if size > self.remaining:
+            return False
+        self.remaining -= size
+        return True
+
+    def release(self, size: int) -> None:
+        self.remaining += size
+
+def read_upload(upload: BinaryIO, in_memory: bool) -> Tuple[FileSource, str]:
+    """
+    The file of an UploadFile, which Starlette has already spooled (to disk past 1 MB), so it is
+    not copied again: read into memory when the request budget allowed it, otherwise the file
+    object itself, rewound. Also returns the SHA-256 of the content. Blocking: runs in a thread.
+    """
+    upload.seek(0)
+    if in_memory:
+        data = upload.read()
+        return data, hashlib.sha256(data).hexdigest()
+
+    digest = hashlib.sha256()
+    while True:
+        chunk = upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    upload.seek(0)
+    return upload, digest.hexdigest()
+
+def upload_size(upload: BinaryIO) -> int:
+    upload.seek(0, os.SEEK_END)
+    return upload.tell()
+
+def extract_pdf_content(source: FileSource, filename: str) -> List[str]:
+    """Single-process extraction (see pdf_pool.extract_pdf_parallel for the sharded version)"""
     pages = []
     try:
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-            metadata = pdf.metadata or {}
-            meta_text = [f"Filename: {filename}"]
-            for key in ("Title", "Author", "Subject", "Creator", "Producer"):
-                if metadata.get(key):
-                    meta_text.append(f"{key}: {metadata[key]}")
-            pages.append("\n".join(meta_text))
+        with pdfplumber.open(open_source(source)) as pdf:
+            pages.append(pdf_metadata_text(pdf, filename))
 
             for i, page in enumerate(pdf.pages, start=1):
                 page_text = page.extract_text() or ""
@@ -23,32 +72,87 @@ def extract_pdf_content(file_bytes: bytes, filename: str) -> List[str]:
         pages.append(f"Error processing PDF file {filename}: {str(e)}")
     return pages
 
-def extract_docx_content(file_bytes: bytes, filename: str) -> List[str]:
+def extract_docx_content(source: FileSource, filename: str) -> List[str]:
     """Extrae el texto de un archivo .docx."""
     try:
-        doc_stream = io.BytesIO(file_bytes)
-        document = docx.Document(doc_stream)
+        document = docx.Document(open_source(source))
         full_text = "\n".join([para.text for para in document.paragraphs])
         return [full_text]
     except Exception as e:
         return [f"Error processing Word file {filename}: {str(e)}"]
 
-async def extract_file_contents(files) -> List[List[str]]:
-    if not files or len(files) == 0:
-        return []
-    content = []
+def is_extraction_error(pages: List[str]) -> bool:
+    return len(pages) >= 1 and pages[-1].startswith("Error processing")
+
+def cached_document(digest: str) -> Optional[dict]:
+    """A previous extraction of the same content; uploading it again restarts its TTL"""
+    cached = extraction_store.get(digest)
+    if cached is not None:
+        extraction_store.touch(digest)
+    return cached
 
-    for file in files:
-        file_bytes = await file.read()
-        filename = file.filename.lower()
+async def extract_file_content(file, limiter: anyio.CapacityLimiter, budget: MemoryBudget) -> Tuple[Optional[str], List[str]]:
+    """Returns (content hash, pages). Parsing is skipped when the same content was extracted before."""
+    filename = file.filename.lower()
+    if not filename.endswith((".pdf", ".docx")):
+        return None, [f"{file.filename}\n------------\n\nUnsupported file type."]
+
+    size = upload_size(file.file)
+    in_memory = budget.reserve(size)
+    try:
+        async with limiter:
+            with stage("upload_read"):
+                source, digest = await anyio.to_thread.run_sync(read_upload, file.file, in_memory)
+
+        cached = await anyio.to_thread.run_sync(cached_document, digest)
+        if cached is not None:
+            return digest, cached["pages"]
 
         if filename.endswith(".pdf"):
-            extracted = await anyio.to_thread.run_sync(extract_pdf_content, file_bytes, file.filename)
-        elif filename.endswith(".docx"): 
-            extracted = await anyio.to_thread.run_sync(extract_docx_content, file_bytes, file.filename)
+            # pdfplumber is pure Python and GIL-bound: pages are parsed in the process pool
+            async with limiter:
+                with stage("pdf_parse"):
+                    pages = await extract_pdf_parallel(source, file.filename)
         else:
-            extracted = [f"{file.filename}\n------------\n\nUnsupported file type."]
+            with stage("docx_parse"):
+                pages = await anyio.to_thread.run_sync(extract_docx_content, source, file.filename, limiter=limiter)
+
+        if not is_extraction_error(pages):
+            await anyio.to_thread.run_sync(extraction_store.put, digest, file.filename, pages)
+        return digest, pages
+    finally:
+        if in_memory:
+            budget.release(size)
+
+async def extract_documents(files) -> List[Tuple[Optional[str], List[str]]]:
+    """(content hash, pages) per file; the hash doubles as the document ID of /api/documents"""
+    if not files or len(files) == 0:
+        return []
+    # Every file is read and parsed concurrently; results keep the upload order
+    results: List[Tuple[Optional[str], List[str]]] = [(None, []) for _ in files]
+    limiter = anyio.CapacityLimiter(settings.EXTRACTION_CONCURRENCY)
+    budget = MemoryBudget(settings.UPLOAD_MEMORY_LIMIT_BYTES)
+
+    async def extract_into(index: int, file):
+        with span("extract_file_content", filename=file.filename or ""):
+            results[index] = await extract_file_content(file, limiter, budget)
+
+    with span("extract_documents", files=len(files)):
+        async with anyio.create_task_group() as task_group:
+            for index, file in enumerate(files):
+                task_group.start_soon(extract_into, index, file)
 
-        content.append(extracted)
+    return results
 
-    return content
\ No newline at end of file
+async def extract_file_contents(files) -> List[List[str]]:
+    return [pages for _, pages in await extract_documents(files)]
+
+async def load_documents(document_ids: List[str]) -> List[List[str]]:
+    """Page lists of previously uploaded documents. Raises KeyError with the first unknown ID."""
+    content = []
+    for document_id in document_ids:
+        cached = await anyio.to_thread.run_sync(extraction_store.get, document_id)
+        if cached is None:
+            raise KeyError(document_id)
+        content.append(cached["pages"])
+    return content
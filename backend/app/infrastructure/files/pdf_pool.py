@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import asyncio
+import io
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+import anyio
+import pdfplumber
+
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def open_source(source):
+    """File object for in-memory bytes; paths and upload file objects are passed through"""
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def _open(source):
+    return pdfplumber.open(open_source(source))
+
+
+def pdf_metadata_text(pdf, filename: str) -> str:
+    metadata = pdf.metadata or {}
+    meta_text = [f"Filename: {filename}"]
+    for key in ("Title", "Author", "Subject", "Creator", "Producer"):
+        if metadata.get(key):
+            meta_text.append(f"{key}: {metadata[key]}")
+    return "\n".join(meta_text)
+
+
+def extract_first_range(source, filename: str, end: int) -> Tuple[str, int, List[str]]:
+    """Metadata header, page count and text of pages [0, end): the first shard also sizes the rest"""
+    with _open(source) as pdf:
+        return pdf_metadata_text(pdf, filename), len(pdf.pages), _extract_pages(pdf.pages[:end])
+
+
+def extract_page_range(source, start: int, end: int) -> List[str]:
+    """Text of pages [start, end). Runs inside a worker process, so it reopens the document."""
+    with _open(source) as pdf:
+        return _extract_pages(pdf.pages[start:end])
+
+
+def _extract_pages(pages) -> List[str]:
+    texts = []
+    for page in pages:
+        texts.append((page.extract_text() or "").strip())
+        # Layout objects are cached per page; drop them so long ranges stay flat in memory
+        page.flush_cache()
+    return texts
+
+
+def spool_bytes(data: bytes) -> str:
+    """Write in-memory upload bytes to a temp file, so shards receive a path instead of a pickled copy"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=settings.UPLOAD_TEMP_DIR) as temp_file:
+        temp_file.write(data)
+    return temp_file.name
+
+
+def spool_file(upload) -> str:
+    """Copy an upload file object, which cannot be sent to a worker process, to a named temp file"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=settings.UPLOAD_TEMP_DIR) as temp_file:
+        upload.seek(0)
+        shutil.copyfileobj(upload, temp_file)
+    upload.seek(0)
+    return temp_file.name
+
+
+def worker_count() -> int:
+    return settings.PDF_WORKERS or os.cpu_count() or 1
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Process pool shared by every request, created on first use"""
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that already runs the event loop and thread pools is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=worker_count(), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def page_ranges(page_count: int, shards: int, min_pages: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into at most `shards` contiguous ranges of at least `min_pages` pages"""
+    if page_count <= 0:
+        return []
+    size = max(min_pages, math.ceil(page_count / max(shards, 1)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+async def extract_pdf_parallel(source, filename: str) -> List[str]:
+    """
+    Extract a PDF by sharding its pages across the process pool. Shards are merged back in
+    page order; the first element is the metadata header, like `extract_pdf_content`.
+    The first shard also returns the page count, so PDFs of up to PDF_PAGES_PER_SHARD pages
+    take a single round trip; the remaining pages are then split across the workers.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    first_size = settings.PDF_PAGES_PER_SHARD
+    spooled = None
+    try:
+        if not isinstance(source, (bytes, bytearray, str)):
+            # Uploads past the request memory budget: Starlette's spooled file has no name to pass on
+            spooled = source = await anyio.to_thread.run_sync(spool_file, source)
+        header, page_count, pages = await loop.run_in_executor(
+            executor, extract_first_range, source, filename, first_size
+        )
+        ranges = [
+            (first_size + start, first_size + end)
+            for start, end in page_ranges(page_count - first_size, worker_count(), settings.PDF_PAGES_PER_SHARD)
+        ]
+        if ranges and isinstance(source, (bytes, bytearray)):
+            # Every shard would otherwise get its own pickled copy of the whole document
+            spooled = source = await anyio.to_thread.run_sync(spool_bytes, source)
+        shards = await asyncio.gather(*(
+            loop.run_in_executor(executor, extract_page_range, source, start, end) for start, end in ranges
+        ))
+    except Exception as e:
+        return [f"Error processing PDF file {filename}: {str(e)}"]
+    finally:
+        if spooled:
+            os.unlink(spooled)
+
+    pages = [header] + pages
+    for shard in shards:
+        pages.extend(shard)
+    return pages
@@ -0,0 +1,182 @@
+from typing import List, Optional, Set, Tuple
+import math
+import re
+
+from app.infrastructure.files.file_manager import is_extraction_error
+
+# First/last non-empty lines of a page checked for running headers and footers
+EDGE_LINES = 2
+# A normalized edge line on at least this share of pages (and 3 pages) is a running header/footer
+RUNNING_LINE_MIN_SHARE = 0.5
+RUNNING_LINE_MIN_PAGES = 3
+# Numbers in edge lines this short ("Slide 7", "Chapter 2") are compared as "#"; longer lines
+# ("Example 3: see figure 3") are content and must repeat verbatim to count as running lines
+RUNNING_NUMBER_MAX_WORDS = 3
+# Shorter paragraphs ("Example:", "Solution") legitimately repeat and are kept
+DUPLICATE_PARAGRAPH_MIN_CHARS = 60
+# Same estimate as the prompt budgets
+CHARS_PER_TOKEN = 4
+
+PAGE_NUMBER = re.compile(
+    r"^[-–—\s]*(?:page|pag\.?|página|p\.)?\s*\d{1,4}\s*(?:(?:/|of|de)\s*\d{1,4})?[-–—\s]*$", re.IGNORECASE
+)
+DIGITS = re.compile(r"\d+")
+WORD_PUNCTUATION = ".,;:!?)\"'"
+
+
+def _line_key(line: str) -> str:
+    # "Page 3 of 40" and "Page 4 of 40" are the same footer, "Example 3" and "Example 4" are not
+    key = " ".join(line.lower().split())
+    if len(key.split()) <= RUNNING_NUMBER_MAX_WORDS or PAGE_NUMBER.match(key):
+        return DIGITS.sub("#", key)
+    return key
+
+
+def _edge_indexes(lines: List[str]) -> List[int]:
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    # On pages this short every line is an edge line: nothing can be told apart from the body
+    if len(filled) <= 2 * EDGE_LINES:
+        return []
+    return sorted(set(filled[:EDGE_LINES] + filled[-EDGE_LINES:]))
+
+
+def _page_number(line: str) -> Optional[int]:
+    if not PAGE_NUMBER.match(line):
+        return None
+    return int(DIGITS.search(line).group())
+
+
+def strip_running_lines(pages: List[str]) -> Tuple[List[str], int]:
+    """
+    Remove the header/footer lines repeated at the edges of most pages and, for PDFs (a metadata
+    header then one entry per page, so page N is at index N), page numbers matching the page's
+    position. DOCX extraction is a single page and never loses a line to the page-number rule.
+    """
+    split_pages = [page.split("\n") for page in pages]
+    edges = [_edge_indexes(lines) for lines in split_pages]
+    counts = {}
+    for lines, indexes in zip(split_pages, edges):
+        for key in {_line_key(lines[index]) for index in indexes}:
+            counts[key] = counts.get(key, 0) + 1
+
+    eligible = sum(1 for indexes in edges if indexes)
+    threshold = max(RUNNING_LINE_MIN_PAGES, math.ceil(eligible * RUNNING_LINE_MIN_SHARE))
+    running = {key for key, count in counts.items() if count >= threshold}
+    paged = len(pages) > 1
+
+    removed = 0
+    cleaned = []
+    for position, (lines, indexes) in enumerate(zip(split_pages, edges)):
+        drop = {
+            index for index in indexes
+            if _line_key(lines[index]) in running or (paged and _page_number(lines[index]) == position)
+        }
+        removed += len(drop)
+        cleaned.append("\n".join(line for index, line in enumerate(lines) if index not in drop))
+    return cleaned, removed
+
+
+def clean_page(page: str, vocabulary: Set[str]) -> Tuple[str, int]:
+    """
+    Collapse whitespace runs and blank-line runs, and rejoin words hyphenated at a line break.
+    The hyphen is dropped only when the joined word is used elsewhere in the document
+    (`vocabulary`: its lowercased words), so "learn-\ning" -> "learning" but "well-\nknown",
+    "state-of-the-\nart" and "Anglo-\nSaxon" keep it. Returns the text and the number of rejoined
+    words. Line by line with str.split/join: regexes over multi-MB documents are several times slower.
+    """
+    lines: List[str] = []
+    joined = 0
+    for line in page.split("\n"):
+        line = " ".join(line.split())
+        if not line:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        previous = lines[-1] if lines else ""
+        if len(previous) > 1 and previous[-1] == "-" and previous[-2].isalpha() and line[0].isalpha():
+            lines[-1] = (previous[:-1] if _is_split_word(previous, line, vocabulary) else previous) + line
+            joined += 1
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip(), joined
+
+
+def _is_split_word(previous: str, line: str, vocabulary: Set[str]) -> bool:
+    head = previous.rsplit(" ", 1)[-1][:-1]
+    if "-" in head or not line[0].islower():
+        return False
+    word = (head + line.split(" ", 1)[0]).lower()
+    return word.rstrip(WORD_PUNCTUATION) in vocabulary
+
+
+def drop_duplicates(pages: List[str], seen_pages: Set[int], seen_paragraphs: Set[int]) -> Tuple[List[str], int, int]:
+    """
+    Drop pages and paragraphs (lines: DOCX paragraphs, PDF text lines) already seen in this
+    request, compared case-insensitively on their (already collapsed) whitespace. The sets are
+    shared across the documents of the request.
+    """
+    kept, duplicate_pages, duplicate_paragraphs = [], 0, 0
+    for page in pages:
+        page_hash = hash(page.lower())
+        if page and page_hash in seen_pages:
+            duplicate_pages += 1
+            continue
+        seen_pages.add(page_hash)
+
+        lines = []
+        for line in page.split("\n"):
+            if len(line) >= DUPLICATE_PARAGRAPH_MIN_CHARS:
+                line_hash = hash(line.lower())
+                if line_hash in seen_paragraphs:
+                    duplicate_paragraphs += 1
+                    continue
+                seen_paragraphs.add(line_hash)
+            lines.append(line)
+        kept.append("\n".join(lines))
+    return kept, duplicate_pages, duplicate_paragraphs
+
+
+def preprocess_documents(documents: List[List[str]]) -> Tuple[List[List[str]], dict]:
+    """
+    Clean-up of a request's documents before they are sent to the model: running headers/footers
+    and page numbers, hyphenation at line breaks, whitespace runs, and pages or paragraphs repeated
+    within or across documents. Returns the cleaned page lists and a report of what was removed.
+    Documents whose extraction failed are passed through unchanged.
+    """
+    seen_pages: Set[int] = set()
+    seen_paragraphs: Set[int] = set()
+    report = {
+        "chars_before": 0, "chars_after": 0, "running_lines": 0, "hyphenations": 0,
+        "duplicate_pages": 0, "duplicate_paragraphs": 0,
+    }
+
+    cleaned_documents = []
+    for pages in documents:
+        report["chars_before"] += sum(len(page) for page in pages)
+        if is_extraction_error(pages):
+            cleaned_documents.append(pages)
+            report["chars_after"] += sum(len(page) for page in pages)
+            continue
+
+        pages, running_lines = strip_running_lines(pages)
+        report["running_lines"] += running_lines
+        vocabulary = {word.rstrip(WORD_PUNCTUATION) for word in set(" ".join(pages).lower().split())}
+        cleaned = []
+        for page in pages:
+            page, joined = clean_page(page, vocabulary)
+            report["hyphenations"] += joined
+            cleaned.append(page)
+        cleaned, duplicate_pages, duplicate_paragraphs = drop_duplicates(cleaned, seen_pages, seen_paragraphs)
+        report["duplicate_pages"] += duplicate_pages
+        report["duplicate_paragraphs"] += duplicate_paragraphs
+
+        # Pages emptied by the clean-up are dropped, but a document keeps at least one
+        cleaned = [page for page in cleaned if page] or [""]
+        cleaned_documents.append(cleaned)
+        report["chars_after"] += sum(len(page) for page in cleaned)
+
+    saved = report["chars_before"] - report["chars_after"]
+    report["chars_saved"] = saved
+    report["tokens_saved"] = saved // CHARS_PER_TOKEN
+    report["saved_ratio"] = round(saved / report["chars_before"], 4) if report["chars_before"] else 0.0
+    return cleaned_documents, report
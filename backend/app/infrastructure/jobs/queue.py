@@ -0,0 +1,210 @@
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import time
+import traceback
+import uuid
+
+import anyio
+
+from app.infrastructure.jobs.store import (
+    CANCELLED, FAILED, FINISHED, PRIORITIES, QUEUED, RUNNING, SUCCEEDED, JobStore,
+)
+
+Handler = Callable[[dict], Awaitable[Any]]
+
+PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+
+def describe(job: dict, include_result: bool = False) -> dict:
+    """Public view of a job (the payload can be a whole document, so it is never returned)"""
+    view = {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "priority": PRIORITY_NAMES.get(job["priority"], job["priority"]),
+        "status": job["status"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+    }
+    if include_result:
+        view["result"] = job["result"]
+    return view
+
+
+class JobQueue:
+    """
+    In-process job runner: `workers` asyncio tasks pull jobs from a `JobStore` by priority.
+    `reserved_workers` are never given low-priority jobs, so a backlog of slow low-priority
+    work cannot hold every worker while short jobs wait. Store calls run in worker threads:
+    with the SQLite backend they read and write multi-MB payloads and results.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 4, reserved_workers: int = 1, result_ttl_seconds: float = 24 * 3600):
+        self.store = store
+        self.workers = max(1, workers)
+        self.reserved_workers = min(max(0, reserved_workers), self.workers - 1)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.handlers: Dict[str, Handler] = {}
+        self.started = False
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._low_running = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._listeners: Dict[str, List[asyncio.Queue]] = {}
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self.handlers[kind] = handler
+
+    async def start(self) -> None:
+        if self.started:
+            return
+        requeued = await anyio.to_thread.run_sync(self.store.requeue_running)
+        if requeued:
+            print(f"[INFO] Requeued {requeued} job(s) interrupted by the last shutdown")
+        await anyio.to_thread.run_sync(self.store.purge_finished, time.time() - self.result_ttl_seconds)
+
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self.started = True
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs that were running go back to the queue for the next start"""
+        if not self.started:
+            return
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self.started = False
+
+    async def submit(self, kind: str, payload: dict, priority: str = "normal") -> dict:
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})")
+
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "priority": PRIORITIES[priority],
+            "status": QUEUED,
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        await anyio.to_thread.run_sync(self.store.add, job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        """The job without its payload"""
+        return await anyio.to_thread.run_sync(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued or running job; finished jobs are left as they are"""
+        job = await self.get(job_id)
+        if job is None:
+            return None
+        if job["status"] == QUEUED:
+            await self._update(job_id, status=CANCELLED, finished_at=time.time())
+            await self._publish(job_id)
+        elif job["status"] == RUNNING and job_id in self._running:
+            # The worker records the cancellation once the handler has unwound
+            self._running[job_id].cancel()
+        return await self.get(job_id)
+
+    async def events(self, job_id: str) -> AsyncIterator[dict]:
+        """The job's current state, then every status change until it finishes"""
+        listener: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(job_id, []).append(listener)
+        try:
+            job = await self.get(job_id)
+            while job is not None:
+                yield job
+                if job["status"] in FINISHED:
+                    return
+                job = await listener.get()
+        finally:
+            self._listeners[job_id].remove(listener)
+            if not self._listeners[job_id]:
+                del self._listeners[job_id]
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "reserved_workers": self.reserved_workers,
+            "running": len(self._running),
+            "running_low_priority": self._low_running,
+            "jobs": self.store.counts(),
+        }
+
+    async def _update(self, job_id: str, **fields) -> None:
+        await anyio.to_thread.run_sync(partial(self.store.update, job_id, **fields))
+
+    async def _publish(self, job_id: str) -> None:
+        listeners = self._listeners.get(job_id)
+        if listeners:
+            job = await self.get(job_id)
+            for listener in listeners:
+                listener.put_nowait(job)
+
+    async def _claim(self) -> Optional[dict]:
+        max_priority = PRIORITIES["low"]
+        if self._low_running >= self.workers - self.reserved_workers:
+            max_priority -= 1
+        return await anyio.to_thread.run_sync(self.store.claim, max_priority)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._claim()
+            if job is None:
+                # submit() sets the event after its job is stored: a job stored before clear() is seen
+                # by the second claim, one stored after it leaves the event set and wait() returns at once
+                self._wakeup.clear()
+                job = await self._claim()
+                if job is None:
+                    await self._wakeup.wait()
+                    continue
+            await self._run(job)
+
+    async def _run(self, job: dict) -> None:
+        job_id = job["id"]
+        low_priority = job["priority"] >= PRIORITIES["low"]
+        if low_priority:
+            self._low_running += 1
+        await self._publish(job_id)
+
+        handler = self.handlers.get(job["kind"])
+        task = asyncio.ensure_future(handler(job["payload"])) if handler else None
+        if task is not None:
+            self._running[job_id] = task
+        try:
+            if task is None:
+                raise ValueError(f"No handler registered for job kind: {job['kind']}")
+            result = await task
+            await self._update(job_id, status=SUCCEEDED, result=result, finished_at=time.time())
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Shutting down: record it before the cancellation propagates, without another await
+                self.store.update(job_id, status=QUEUED, started_at=None)
+                raise
+            await self._update(job_id, status=CANCELLED, finished_at=time.time())
+        except Exception as e:
+            traceback.print_exc()
+            print(f"[ERROR] Job {job_id} ({job['kind']}) failed: {e}")
+            await self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            self._running.pop(job_id, None)
+            if low_priority:
+                self._low_running -= 1
+            if not self._stopping:
+                await self._publish(job_id)
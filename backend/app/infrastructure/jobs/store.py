@@ -0,0 +1,194 @@
+from typing import Dict, List, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Lower runs first
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobStore:
+    """
+    Jobs as plain dicts: id, kind, priority, status, payload, result, error,
+    created_at, started_at, finished_at. This base class keeps them in memory.
+    The payload (a whole document) is only returned by `claim`, to the worker that runs the job;
+    `get` serves status polls without it. Calls block (SQLite, JSON): run them in worker threads.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, job: dict) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """The job without its payload"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return {key: value for key, value in job.items() if key != "payload"} if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def claim(self, max_priority: int) -> Optional[dict]:
+        """Mark the next queued job (by priority, then age) with priority <= max_priority as running"""
+        with self._lock:
+            queued = [
+                job for job in self._jobs.values()
+                if job["status"] == QUEUED and job["priority"] <= max_priority
+            ]
+            if not queued:
+                return None
+            job = min(queued, key=lambda job: (job["priority"], job["created_at"]))
+            job.update(status=RUNNING, started_at=time.time())
+            return dict(job)
+
+    def requeue_running(self) -> int:
+        """Jobs left running by a previous process go back to the queue"""
+        with self._lock:
+            running = [job for job in self._jobs.values() if job["status"] == RUNNING]
+            for job in running:
+                job.update(status=QUEUED, started_at=None)
+            return len(running)
+
+    def purge_finished(self, older_than: float) -> int:
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["status"] in FINISHED and (job["finished_at"] or 0) < older_than
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return counts
+
+
+class SQLiteJobStore(JobStore):
+    """Job store that survives restarts; payloads and results are stored as JSON text."""
+
+    COLUMNS = ("id", "kind", "priority", "status", "payload", "result", "error", "created_at", "started_at", "finished_at")
+    STATUS_COLUMNS = tuple(column for column in COLUMNS if column != "payload")
+    JSON_COLUMNS = ("payload", "result")
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs (status, priority, created_at)")
+
+    def _row_to_job(self, row, columns=COLUMNS) -> dict:
+        job = dict(zip(columns, row))
+        for column in self.JSON_COLUMNS:
+            if job.get(column) is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    def _encode(self, column: str, value):
+        if column in self.JSON_COLUMNS and value is not None:
+            return json.dumps(value, ensure_ascii=False)
+        return value
+
+    def add(self, job: dict) -> None:
+        values = [self._encode(column, job.get(column)) for column in self.COLUMNS]
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                values,
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.STATUS_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row, self.STATUS_COLUMNS) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        if not fields:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        values: List = [self._encode(column, value) for column, value in fields.items()]
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", values + [job_id])
+
+    def claim(self, max_priority: int) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE status = ? AND priority <= ? "
+                "ORDER BY priority, created_at LIMIT 1",
+                (QUEUED, max_priority),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, now, row[0]))
+        job = self._row_to_job(row)
+        job.update(status=RUNNING, started_at=now)
+        return job
+
+    def requeue_running(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+            ).rowcount
+
+    def purge_finished(self, older_than: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED))}) AND finished_at < ?",
+                (*FINISHED, older_than),
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+def build_job_store(backend: str, path: str) -> JobStore:
+    backend = (backend or "memory").lower()
+    if backend == "sqlite":
+        return SQLiteJobStore(path)
+    if backend == "memory":
+        return JobStore()
+    raise ValueError(f"Unknown job backend: {backend}")
@@ -0,0 +1,92 @@
+from typing import Dict, List, Tuple
+import re
+
+import numpy as np
+
+TOKEN = re.compile(r"[^\W\d_]{3,}")
+
+# The most frequent English/Spanish function words; they carry no topical signal
+STOPWORDS = frozenset("""
+the and for are but not you all any can had her was one our out has him his how its may new now
+own see two way who did get let put say she too use that with have this will your from they been
+were what when which their there than them then these those into more some such only also other
+about after would could should because between through during before under while where each most
+los las una uno unos unas del por con para como pero sus que est esta este estos estas ese esa
+eso son ser fue han hay muy más mas sin sobre entre cuando donde también tambien porque desde
+hasta todo toda todos todas otro otra otros otras puede pueden cada según segun tiene tienen
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a list of passages. Postings are kept as flat NumPy arrays with the
+    BM25 weight of every (passage, term) pair precomputed, so scoring a query is a single
+    weighted `bincount` over the postings.
+    """
+
+    def __init__(self, passages: List[str], k1: float = 1.5, b: float = 0.75):
+        self.passages = passages
+        self.vocabulary: Dict[str, int] = {}
+
+        doc_ids: List[int] = []
+        term_ids: List[int] = []
+        for index, passage in enumerate(passages):
+            tokens = tokenize(passage)
+            term_ids.extend(self.vocabulary.setdefault(token, len(self.vocabulary)) for token in tokens)
+            doc_ids.extend([index] * len(tokens))
+
+        self.n_docs = len(passages)
+        self.n_terms = len(self.vocabulary)
+        doc_array = np.asarray(doc_ids, dtype=np.int64)
+        term_array = np.asarray(term_ids, dtype=np.int64)
+
+        # One posting per distinct (passage, term) pair, with its term frequency
+        pairs, tf = np.unique(doc_array * max(self.n_terms, 1) + term_array, return_counts=True)
+        self.doc = pairs // max(self.n_terms, 1)
+        self.term = pairs % max(self.n_terms, 1)
+        self.tf = tf.astype(np.float64)
+
+        doc_len = np.bincount(doc_array, minlength=self.n_docs).astype(np.float64)
+        df = np.bincount(self.term, minlength=self.n_terms)
+        self.idf = np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+        self.collection_tf = np.bincount(self.term, weights=self.tf, minlength=self.n_terms)
+
+        average_len = doc_len.mean() if self.n_docs and doc_len.mean() > 0 else 1.0
+        norm = k1 * (1 - b + b * doc_len / average_len)
+        self.weights = self.idf[self.term] * self.tf * (k1 + 1) / (self.tf + norm[self.doc])
+
+    def query_weights(self, query: str) -> np.ndarray:
+        """Vocabulary-sized vector with the count of every query term (unknown terms are dropped)"""
+        weights = np.zeros(self.n_terms)
+        for token in tokenize(query):
+            term_id = self.vocabulary.get(token)
+            if term_id is not None:
+                weights[term_id] += 1.0
+        return weights
+
+    def salience_weights(self, top_terms: int = 64) -> np.ndarray:
+        """
+        Query vector made of the document's own most characteristic terms (collection
+        frequency x IDF), for ranking passages when there is no explicit query.
+        """
+        weights = self.collection_tf * self.idf
+        if self.n_terms > top_terms:
+            cutoff = np.partition(weights, -top_terms)[-top_terms]
+            weights = np.where(weights >= cutoff, weights, 0.0)
+        total = weights.sum()
+        return weights / total if total > 0 else weights
+
+    def scores(self, weights: np.ndarray) -> np.ndarray:
+        """BM25 score of every passage for a vocabulary-sized query weight vector"""
+        if not self.n_terms:
+            return np.zeros(self.n_docs)
+        return np.bincount(self.doc, weights=self.weights * weights[self.term], minlength=self.n_docs)
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        scores = self.scores(self.query_weights(query))
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [(int(index), float(scores[index])) for index in order if scores[index] > 0]
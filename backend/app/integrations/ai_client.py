@@ -1,23 +1,205 @@
-from app.core.settings import get_settings 
+from typing import AsyncIterator, Optional, Type
+from functools import partial
+import hashlib
+import json
+
+import anyio
+
+from app.core.metrics import CACHE_LOOKUPS, llm_call, record_tokens, stage
+from app.core.settings import get_settings
+from app.core.tracing import span
+from app.infrastructure.cache.backends import build_cache
+from app.integrations.model_pool import ModelPool
+from app.integrations.single_flight import SingleFlight
+from app.integrations.summaries.map_reduce import estimate_tokens
+from app.integrations.token_budget import prompt_tokens
+from app.integrations.upstream_scheduler import ModelLimits, UpstreamScheduler
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import BaseOutputParser
+from langchain_core.runnables import RunnableSequence
 from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel
 
 settings = get_settings()
 
+# Shared by every AIClient subclass so a repeated upload hits the cache regardless of route
+response_cache = build_cache(
+    settings.CACHE_BACKEND,
+    path=settings.CACHE_SQLITE_PATH,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+)
+
+# Identical requests arriving while the first one is still running share its upstream call
+inflight_requests = SingleFlight()
+
+# Opened/closed by the FastAPI lifespan (see app.main)
+model_pool = ModelPool()
+
+# Every upstream call goes through here: per-model RPM/TPM budgets, fair admission, shared backoff
+upstream_scheduler = UpstreamScheduler(
+    {
+        settings.GEMINI_MODEL: ModelLimits(settings.GEMINI_RPM, settings.GEMINI_TPM, settings.GEMINI_MAX_CONCURRENCY),
+        settings.GEMINI_MODEL_PRO: ModelLimits(settings.GEMINI_PRO_RPM, settings.GEMINI_PRO_TPM, settings.GEMINI_PRO_MAX_CONCURRENCY),
+    },
+    default_limits=ModelLimits(settings.GEMINI_RPM, settings.GEMINI_TPM, settings.GEMINI_MAX_CONCURRENCY),
+    max_attempts=settings.UPSTREAM_MAX_ATTEMPTS,
+    base_delay=settings.UPSTREAM_BACKOFF_BASE_SECONDS,
+    max_delay=settings.UPSTREAM_BACKOFF_MAX_SECONDS,
+)
+
+def message_text(message) -> str:
+    """Plain text of a chat message (Gemini may return a list of content blocks)"""
+    content = getattr(message, "content", message)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            block if isinstance(block, str) else block.get("text", "")
+            for block in content
+            if isinstance(block, (str, dict))
+        )
+    return str(content or "")
+
+def split_output_parser(runnable):
+    """
+    (model step, output parser) of a `with_structured_output` sequence, so the upstream call and
+    the structured parsing can be timed apart; (runnable, None) when there is no trailing parser.
+    """
+    if isinstance(runnable, RunnableSequence) and isinstance(runnable.last, BaseOutputParser):
+        steps = runnable.steps[:-1]
+        return (steps[0] if len(steps) == 1 else RunnableSequence(*steps)), runnable.last
+    return runnable, None
+
+def response_tokens(result) -> int:
+    if isinstance(result, BaseModel):
+        return estimate_tokens(result.model_dump_json())
+    return estimate_tokens(message_text(result))
+
 class AIClient:
     def __init__(self):
         self.model_name = settings.GEMINI_MODEL
         self.api_key = settings.GEMINI_API_KEY
-        self.max_retries = 7
+        # 1 = no retries inside the SDK; upstream_scheduler retries with a backoff shared by all requests
+        self.max_retries = 1
 
-        self.model = ChatGoogleGenerativeAI(
+    def new_model(self, **model_options):
+        return ChatGoogleGenerativeAI(
             model=self.model_name,
             api_key=self.api_key,
-            max_retries=self.max_retries
+            max_retries=self.max_retries,
+            **model_options
         )
 
-    def new_model(self):
-        return ChatGoogleGenerativeAI(
-            model=self.model_name,
-            api_key=self.api_key,
-            max_retries=self.max_retries
+    def get_runnable(self, structure: Optional[Type[BaseModel]] = None, **model_options):
+        """Pooled model when the app lifespan is running, otherwise a model per request"""
+        if model_pool.started:
+            return model_pool.runnable(
+                self.model_name, self.api_key, self.max_retries, structure, **model_options
+            )
+        model = self.new_model(**model_options)
+        return model.with_structured_output(structure) if structure else model
+
+    def cache_key(self, instructions, payload: dict, structure: Optional[Type[BaseModel]] = None, **model_options) -> str:
+        """Content hash of everything that determines the model output"""
+        key_source = {
+            "model": self.model_name,
+            "template": getattr(instructions, "template", repr(instructions)),
+            "inputs": payload,
+            "schema": structure.model_json_schema() if structure else None,
+            "options": model_options,
+        }
+        encoded = json.dumps(key_source, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def lookup(self, instructions, payload: dict, structure: Optional[Type[BaseModel]] = None, **model_options) -> tuple:
+        """(cache key, cached response or None); hashes the whole payload and may hit disk, so runs in a thread"""
+        key = self.cache_key(instructions, payload, structure, **model_options)
+        return key, response_cache.get(key)
+
+    async def run_chain(self, instructions, payload: dict, structure: Optional[Type[BaseModel]] = None, **model_options):
+        """
+        Run `instructions | model` through the response cache, coalescing identical in-flight calls.
+        Returns a `structure` instance when a structure is given, otherwise the raw AIMessage.
+        """
+        key, cached = await anyio.to_thread.run_sync(
+            partial(self.lookup, instructions, payload, structure, **model_options)
+        )
+        CACHE_LOOKUPS.labels("miss" if cached is None else "hit").inc()
+        if cached is not None:
+            if structure:
+                return structure.model_validate_json(cached)
+            return AIMessage(content=cached.decode("utf-8"))
+
+        return await inflight_requests.do(
+            key, lambda: self._invoke_and_cache(key, instructions, payload, structure, **model_options)
+        )
+
+    async def _invoke_and_cache(self, key: str, instructions, payload: dict, structure: Optional[Type[BaseModel]] = None, **model_options):
+        # Covers the wait for an upstream slot and any retries, not just the call itself
+        with span("chain.ainvoke", model=self.model_name, structure=structure.__name__ if structure else ""):
+            return await self._invoke(key, instructions, payload, structure, **model_options)
+
+    async def _invoke(self, key: str, instructions, payload: dict, structure: Optional[Type[BaseModel]] = None, **model_options):
+        with stage("prompt_render"):
+            prompt = instructions.invoke(payload)
+        model, parser = split_output_parser(self.get_runnable(structure, **model_options))
+        tokens = prompt_tokens(instructions, payload)
+
+        async def call():
+            with llm_call(self.model_name):
+                return await model.ainvoke(prompt)
+
+        result = await upstream_scheduler.run(self.model_name, tokens, call)
+
+        usage = getattr(result, "usage_metadata", None) or {}
+        record_tokens(
+            self.model_name,
+            usage.get("input_tokens", tokens),
+            usage.get("output_tokens") or response_tokens(result),
         )
+        if parser is not None:
+            with stage("structured_parse"):
+                result = await parser.ainvoke(result)
+
+        if result:
+            text = result.model_dump_json() if structure else message_text(result)
+            await anyio.to_thread.run_sync(response_cache.set, key, text.encode("utf-8"))
+        return result
+
+    async def stream_chain(self, instructions, payload: dict, **model_options) -> AsyncIterator[str]:
+        """
+        Stream the text of `instructions | model` chunk by chunk. Shares the response cache with
+        `run_chain` (a cached response is yielded as a single chunk) and stores the full text at the end.
+        """
+        key, cached = await anyio.to_thread.run_sync(partial(self.lookup, instructions, payload, **model_options))
+        CACHE_LOOKUPS.labels("miss" if cached is None else "hit").inc()
+        if cached is not None:
+            yield cached.decode("utf-8")
+            return
+
+        chain = instructions | self.get_runnable(**model_options)
+        tokens = prompt_tokens(instructions, payload)
+        parts = []
+        attempt = 0
+        while True:
+            attempt += 1
+            async with upstream_scheduler.slot(self.model_name, tokens):
+                try:
+                    with llm_call(self.model_name):
+                        async for chunk in chain.astream(payload):
+                            text = message_text(chunk)
+                            if text:
+                                parts.append(text)
+                                yield text
+                    break
+                except Exception as e:
+                    # Once text has reached the caller a retry would repeat it
+                    if parts or not upstream_scheduler.should_retry(self.model_name, e, attempt):
+                        raise
+        upstream_scheduler.succeeded(self.model_name)
+        record_tokens(self.model_name, tokens, estimate_tokens("".join(parts)))
+
+        if parts:
+            await anyio.to_thread.run_sync(response_cache.set, key, "".join(parts).encode("utf-8"))
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import threading
+import time
+
+import numpy as np
+
+from app.core.settings import get_settings
+from app.infrastructure.retrieval.bm25 import BM25Index
+from app.integrations.summaries.map_reduce import chunk_documents, estimate_tokens
+
+settings = get_settings()
+
+OMISSION_MARKER = "\n\n[...]\n\n"
+MARKER_TOKENS = estimate_tokens(OMISSION_MARKER)
+
+
+class DocumentIndex:
+    """Passages of a document (~CONTENT_PASSAGE_TOKENS each) with a BM25 index over them."""
+
+    def __init__(self, content: str, passage_tokens: int):
+        self.passages = chunk_documents([[content]], passage_tokens)
+        self.tokens = [estimate_tokens(passage) for passage in self.passages]
+        self.bm25 = BM25Index(self.passages)
+        self.salience = self.bm25.salience_weights()
+
+    def select(self, budget_tokens: int, query: str = "", query_weight: float = 1.0) -> List[int]:
+        """
+        Indices (in document order) of the highest ranked passages that fit in `budget_tokens`.
+        Passages are ranked by BM25 against the document's salient terms plus `query`, which
+        weighs `query_weight` times as much as the whole salience vector.
+        """
+        weights = self.salience
+        if query:
+            query_weights = self.bm25.query_weights(query)
+            if query_weights.any():
+                weights = weights + query_weight * query_weights / query_weights.sum()
+        ranking = np.argsort(-self.bm25.scores(weights), kind="stable")
+
+        selected, used, seen = [], 0, set()
+        for position in ranking:
+            passage = self.passages[position]
+            # Counting a marker per passage keeps the joined `text` within the budget too
+            cost = self.tokens[position] + MARKER_TOKENS
+            if used + cost > budget_tokens or passage in seen:
+                continue
+            selected.append(int(position))
+            seen.add(passage)
+            used += cost
+        return sorted(selected)
+
+    def text(self, indices: List[int]) -> str:
+        return OMISSION_MARKER.join(self.passages[i] for i in indices)
+
+
+class DocumentIndexCache:
+    """LRU of built indexes keyed by the SHA-256 of the content, so every call over a document shares one build"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._indexes: "OrderedDict[str, DocumentIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per document being built: concurrent calls for it wait for a single build,
+        # while lookups and builds of other documents go ahead
+        self._building: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.builds = 0
+        self.build_seconds = 0.0
+
+    def get(self, content: str) -> DocumentIndex:
+        key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        index = self._lookup(key)
+        if index is not None:
+            return index
+
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+        with build_lock:
+            index = self._lookup(key)
+            if index is not None:
+                return index
+            try:
+                started = time.perf_counter()
+                index = DocumentIndex(content, settings.CONTENT_PASSAGE_TOKENS)
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.build_seconds += elapsed
+                    self.builds += 1
+                    self._indexes[key] = index
+                    while len(self._indexes) > self.max_entries:
+                        self._indexes.popitem(last=False)
+                return index
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+
+    def _lookup(self, key: str) -> Optional[DocumentIndex]:
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                self.hits += 1
+            return index
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._indexes),
+            "hits": self.hits,
+            "builds": self.builds,
+            "avg_build_ms": round(self.build_seconds / self.builds * 1000, 1) if self.builds else 0.0,
+        }
+
+
+document_indexes = DocumentIndexCache(settings.RETRIEVAL_INDEX_MAX_ENTRIES)
@@ -1,41 +1,121 @@
-from typing import List
-from app.domain.exercises_models import ExerciseType
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import anyio
+from app.core.settings import get_settings
+from app.domain.exercises_models import ExerciseType, MixedExerciseStrategy
 import app.integrations.exercises.templates as templates
 import app.integrations.exercises.structures as structures
 
 from app.integrations.ai_client import AIClient
+from app.integrations.summaries.map_reduce import estimate_tokens
+from app.integrations.token_budget import TOPIC_QUERY_WEIGHT, fit_content, fit_prompt, prompt_content_budget
+
+settings = get_settings()
 
 class ExercisesAIClient(AIClient):
-    async def generate_exercises(self, content: str, exercises_count: int = 5, exercises_difficulty: str = "medium", exercises_types: ExerciseType = ExerciseType.multiple_choice):
+    async def generate_exercises(self, content: str, exercises_count: int = 5, exercises_difficulty: str = "medium", exercises_types: ExerciseType = ExerciseType.multiple_choice, topic: Optional[str] = None):
+
+        exercises_template, ExerciseSet = self.exercise_set(exercises_types)
+        instructions = exercises_template()
+        payload = await fit_prompt(
+            instructions,
+            self._exercises_payload(content, exercises_count, exercises_difficulty),
+            exercises_count,
+            # With a topic, large documents are reduced to the passages about it
+            query=topic or "",
+            query_weight=TOPIC_QUERY_WEIGHT if topic else 1.0
+        )
+        result = await self.run_chain(instructions, payload, ExerciseSet)
+        if result:
+            return result.model_dump()
+        return []
+
+    async def generate_mixed_exercises(
+        self,
+        content: str,
+        exercises: List[Tuple[ExerciseType, int]],
+        exercises_difficulty: str = "medium",
+        strategy: MixedExerciseStrategy = MixedExerciseStrategy.auto
+    ) -> dict:
+        """
+        Several exercise types over the same content, either in one structured call (`single_call`)
+        or one call per type running concurrently (`concurrent`). Returns the exercises keyed by
+        type and the strategy that was used.
+        """
+        counts: Dict[str, int] = {}
+        for exercise_type, count in exercises:
+            exercise_type = ExerciseType(exercise_type).value
+            counts[exercise_type] = counts.get(exercise_type, 0) + count
+
+        strategy = MixedExerciseStrategy(strategy)
+        if strategy == MixedExerciseStrategy.auto:
+            strategy = self.choose_mixed_strategy(content, counts)
+
+        if strategy == MixedExerciseStrategy.single_call:
+            exercise_plan = "\n".join(
+                f"    - {count} {exercise_type.replace('_', ' ')} exercises" for exercise_type, count in counts.items()
+            )
+            instructions = templates.mixed_exercises_template()
+            payload = await fit_prompt(
+                instructions,
+                {"content": content, "exercise_plan": exercise_plan, "exercises_difficulty": exercises_difficulty},
+                sum(counts.values())
+            )
+            result = await self.run_chain(instructions, payload, structures.mixed_exercise_set(tuple(counts)))
+            exercises_by_type = {
+                exercise_type: [exercise.model_dump() for exercise in getattr(result, exercise_type)] if result else []
+                for exercise_type in counts
+            }
+        else:
+            # The document is ranked once, to the tightest per-type budget: every call then finds it fits
+            budget = min(
+                prompt_content_budget(
+                    self.exercise_set(exercise_type)[0](),
+                    self._exercises_payload(content, count, exercises_difficulty),
+                    count
+                )
+                for exercise_type, count in counts.items()
+            )
+            if estimate_tokens(content) > budget:
+                content = await anyio.to_thread.run_sync(fit_content, content, budget)
+            results = await asyncio.gather(*(
+                self.generate_exercises(content, count, exercises_difficulty, ExerciseType(exercise_type))
+                for exercise_type, count in counts.items()
+            ))
+            exercises_by_type = {
+                exercise_type: result["exercises"] if result else []
+                for exercise_type, result in zip(counts, results)
+            }
 
+        return {"exercises": exercises_by_type, "strategy": strategy.value}
+
+    def exercise_set(self, exercises_types: ExerciseType):
+        """(template, structured output) of an exercise type"""
         if exercises_types == ExerciseType.multiple_choice:
-            exercises_template = templates.multiple_choice_exercises_template
-            ExerciseSet = structures.MultipleChoiceExerciseSet
+            return templates.multiple_choice_exercises_template, structures.MultipleChoiceExerciseSet
         elif exercises_types == ExerciseType.fill_in_the_blank:
-            exercises_template = templates.fill_in_the_blank_exercises_template
-            ExerciseSet = structures.FillInTheBlankExerciseSet
-
+            return templates.fill_in_the_blank_exercises_template, structures.FillInTheBlankExerciseSet
         elif exercises_types == ExerciseType.true_false:
-            exercises_template = templates.true_false_exercises_template
-            ExerciseSet = structures.TrueFalseExerciseSet
-
+            return templates.true_false_exercises_template, structures.TrueFalseExerciseSet
         elif exercises_types == ExerciseType.short_answer:
-            exercises_template = templates.short_answer_exercises_template
-            ExerciseSet = structures.ShortAnswerExerciseSet
-
+            return templates.short_answer_exercises_template, structures.ShortAnswerExerciseSet
         elif exercises_types == ExerciseType.matching:
-            exercises_template = templates.matching_exercises_template
-            ExerciseSet = structures.MatchingExerciseSet
-        else:
-            raise ValueError(f"Unsupported exercise type: {exercises_types}")   
-        
-        #model instance per req
-        model = self.new_model()
+            return templates.matching_exercises_template, structures.MatchingExerciseSet
+        raise ValueError(f"Unsupported exercise type: {exercises_types}")
 
-        instructions = exercises_template()
-        structured_llm = model.with_structured_output(ExerciseSet)
-        chain = instructions | structured_llm
-        result = await chain.ainvoke({"content": content, "exercises_count": exercises_count, "exercises_difficulty": exercises_difficulty})
-        if result:
-            return result.model_dump()
-        return []
+    def _exercises_payload(self, content: str, exercises_count: int, exercises_difficulty: str) -> dict:
+        return {"content": content, "exercises_count": exercises_count, "exercises_difficulty": exercises_difficulty}
+
+    def choose_mixed_strategy(self, content: str, counts: Dict[str, int]) -> MixedExerciseStrategy:
+        """
+        Latency is dominated by output length, which per-type calls split across parallel streams,
+        while each extra call resends the whole content. One call wins for small sets, where the
+        output is short anyway, and for large documents, where resending costs more than it saves.
+        """
+        if len(counts) == 1:
+            return MixedExerciseStrategy.concurrent
+        if sum(counts.values()) <= settings.EXERCISES_SINGLE_CALL_MAX_COUNT:
+            return MixedExerciseStrategy.single_call
+        if estimate_tokens(content) >= settings.EXERCISES_SINGLE_CALL_MIN_CONTENT_TOKENS:
+            return MixedExerciseStrategy.single_call
+        return MixedExerciseStrategy.concurrent
@@ -1,5 +1,6 @@
-from typing import List, Optional, Union, Dict
-from pydantic import BaseModel, Field
+from typing import List, Optional, Union, Dict, Tuple, Type
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
 
 # --- Structures for Multiple Choice ---
 
@@ -93,3 +94,24 @@ class ShortAnswerExerciseSet(BaseModel):
 class MatchingExerciseSet(BaseModel):
     exercises: List[MatchingExercise]
 
+# --- Mixed set: one list per requested type ---
+
+EXERCISE_MODELS = {
+    "multiple_choice": MultipleChoiceExercise,
+    "fill_in_the_blank": FillInTheBlankExercise,
+    "true_false": TrueFalseExercise,
+    "short_answer": ShortAnswerExercise,
+    "matching": MatchingExercise,
+}
+
+@lru_cache()
+def mixed_exercise_set(exercise_types: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Schema with one required list per requested type. Unlike `ExerciseSet`, items keep their type:
+    fill-in-the-blank and short-answer exercises have the same fields and are ambiguous in the union.
+    """
+    fields = {
+        exercise_type: (List[EXERCISE_MODELS[exercise_type]], Field(description=f"The {exercise_type.replace('_', ' ')} exercises"))
+        for exercise_type in exercise_types
+    }
+    return create_model("MixedExerciseSet", **fields)
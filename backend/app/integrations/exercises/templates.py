@@ -98,4 +98,28 @@ def matching_exercises_template():
         - A brief explanation for why those matches are correct.
     This is the document content:
     {content}
-    """)    
\ No newline at end of file
+    """)    
+
+def mixed_exercises_template():
+    return PromptTemplate.from_template("""
+    You are an expert educational assistant. 
+    Given a document content or topic, your task is to create well-structured exercises to help students learn the material.
+
+    ### INSTRUCTIONS:
+    - Read the provided topic or document content carefully.
+    - Generate exactly the following exercises, all related to the main ideas:
+    {exercise_plan}
+    - Assign a difficulty level {exercises_difficulty}.
+    - Put each exercise in the list of its type and do not repeat the same idea across types.
+    - For each exercise, provide:
+        - A clear question or statement (with a blank space for fill in the blank exercises).
+        - For multiple choice, 3-5 answer choices (mark which one is correct).
+        - For true/false, whether the statement is true.
+        - For matching, Column A, Column B and the correct matches between them.
+        - The correct answer text where applicable.
+        - A brief explanation for why that answer is correct.
+        - If possible, the learning objective (what concept the question tests).
+
+    This is the document content:
+    {content}
+    """)
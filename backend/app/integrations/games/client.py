@@ -13,10 +13,6 @@ class GameAIClient(AIClient):
             raise ValueError(f"Unsupported game type: {options.game_type}") 
 
         instructions = game_template()
-        model = self.new_model()
-
-        structured_llm = model.with_structured_output(game_structure)
-        chain = instructions | structured_llm
 
         payload = {
             "topic": options.topic,
@@ -24,7 +20,7 @@ class GameAIClient(AIClient):
             "language": options.language,
         }
 
-        result = await chain.ainvoke(payload)
+        result = await self.run_chain(instructions, payload, game_structure)
 
         if not result:
             return {"error": "No game could be generated."}
@@ -0,0 +1,306 @@
+from typing import Any, Iterable, List, Optional, Tuple
+import json
+import re
+
+_STRING_STOP = re.compile(r'["\\]')
+_WHITESPACE = re.compile(r"[ \t\r\n]+")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_NUMBER_CHARS = re.compile(r"[-+0-9.eE]+")
+_BAREWORD = re.compile(r"[A-Za-z_]+")
+_LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_VALUE_START = set('"{[-0123456789tfnTFN')
+
+Path = Tuple[Any, ...]
+
+
+class _Frame:
+    __slots__ = ("container", "path", "key", "expect_key")
+
+    def __init__(self, container, path: Path):
+        self.container = container
+        self.path = path
+        self.key = None
+        self.expect_key = isinstance(container, dict)
+
+
+class JSONStreamParser:
+    """
+    Single-pass, incremental and tolerant JSON parser for LLM output.
+
+    - Text before the top-level value (markdown fences, prose) and after it is ignored. The value
+      starts at the first `{` followed by a key or `}`, or `[` followed by a string, container or `]`,
+      so brackets in leading prose ("see [1]", "{name}") are skipped.
+    - Unescaped quotes inside strings are kept when the next character cannot end the string.
+    - Raw newlines/control characters in strings, invalid escapes and trailing commas are accepted.
+    - Truncated input is closed on `close()`: open strings and containers keep what was received.
+
+    `watch` lists paths whose values are reported by `feed()` as soon as they are complete,
+    e.g. ("modules", "*") for every element of the top-level "modules" array.
+    """
+
+    def __init__(self, watch: Iterable[Path] = ()):
+        self.watch = [tuple(path) for path in watch]
+        self.buffer = ""
+        self.pos = 0
+        self.root = None
+        self.done = False
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._string_is_key = False
+        self._string_parts: List[str] = []
+        self._completed: List[Tuple[Path, Any]] = []
+
+    def feed(self, text: str) -> List[Tuple[Path, Any]]:
+        """Parse more text; returns (path, value) for every watched value completed by it"""
+        self.buffer += text
+        self._consume(final=False)
+        return self._take_completed()
+
+    def close(self) -> Any:
+        """Finish parsing (closing anything left open by truncation) and return the parsed value"""
+        self._consume(final=True)
+        if self._in_string:
+            self._in_string = False
+            if not self._string_is_key:
+                self._value_done(self._joined_string())
+        while self._stack:
+            self._pop()
+        self.done = True
+        return self.root
+
+    def _take_completed(self) -> List[Tuple[Path, Any]]:
+        completed, self._completed = self._completed, []
+        # Parsed text is never revisited; drop it so long streams do not keep growing the buffer
+        if self.pos > 65536:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        return completed
+
+    def _consume(self, final: bool) -> None:
+        buffer = self.buffer
+        end = len(buffer)
+        pos = self.pos
+
+        while pos < end and not self.done:
+            if self._in_string:
+                match = _STRING_STOP.search(buffer, pos)
+                if match is None:
+                    self._string_parts.append(buffer[pos:])
+                    pos = end
+                    break
+                self._string_parts.append(buffer[pos:match.start()])
+                pos = match.start()
+
+                if buffer[pos] == "\\":
+                    if pos + 1 >= end:
+                        if final:
+                            pos = end
+                        break
+                    escape = buffer[pos + 1]
+                    if escape == "u":
+                        if pos + 6 > end and not final:
+                            break
+                        try:
+                            self._string_parts.append(chr(int(buffer[pos + 2:pos + 6], 16)))
+                            pos += 6
+                        except ValueError:
+                            self._string_parts.append("u")
+                            pos += 2
+                    else:
+                        self._string_parts.append(_ESCAPES.get(escape, escape))
+                        pos += 2
+                    continue
+
+                closes = self._quote_closes_string(buffer, pos, end, final)
+                if closes is None:
+                    break
+                pos += 1
+                if closes:
+                    self._in_string = False
+                    value = self._joined_string()
+                    if self._string_is_key:
+                        self._stack[-1].key = value
+                        self._stack[-1].expect_key = False
+                    else:
+                        self._value_done(value)
+                else:
+                    self._string_parts.append('"')
+                continue
+
+            char = buffer[pos]
+            if char in " \t\r\n":
+                pos = _WHITESPACE.match(buffer, pos).end()
+                continue
+
+            if self.root is None:
+                # Markdown fences or prose before the JSON value
+                starts = _starts_json(buffer, pos, end) if char in "{[" else False
+                if starts is None:
+                    if not final:
+                        break
+                    starts = True
+                if not starts:
+                    pos += 1
+                    continue
+
+            if char == "{" or char == "[":
+                self._push({} if char == "{" else [])
+                pos += 1
+            elif char == "}" or char == "]":
+                self._pop()
+                pos += 1
+            elif char == '"':
+                frame = self._stack[-1] if self._stack else None
+                self._string_is_key = frame is not None and frame.expect_key
+                self._in_string = True
+                self._string_parts = []
+                pos += 1
+            elif char == ",":
+                if self._stack and isinstance(self._stack[-1].container, dict):
+                    self._stack[-1].expect_key = True
+                    self._stack[-1].key = None
+                pos += 1
+            elif char == ":":
+                if self._stack:
+                    self._stack[-1].expect_key = False
+                pos += 1
+            else:
+                if char in "-+.0123456789":
+                    extent = _NUMBER_CHARS.match(buffer, pos)
+                    if extent.end() >= end and not final:
+                        # The number may continue in the next chunk
+                        break
+                    match = _NUMBER.match(buffer, pos)
+                    if match is None:
+                        pos = extent.end()
+                        continue
+                else:
+                    match = _BAREWORD.match(buffer, pos)
+                    if match is None:
+                        pos += 1
+                        continue
+                    if match.end() >= end and not final:
+                        break
+                token = match.group()
+                if token[0] in "-0123456789":
+                    value = float(token) if any(c in token for c in ".eE") else int(token)
+                elif token in _LITERALS:
+                    value = _LITERALS[token]
+                else:
+                    # A literal cut off by truncation ("tr") still means the literal
+                    value = next((v for k, v in _LITERALS.items() if k.startswith(token)), token)
+                self._value_done(value)
+                pos = match.end()
+
+        self.pos = pos
+
+    def _quote_closes_string(self, buffer: str, pos: int, end: int, final: bool) -> Optional[bool]:
+        """Whether the quote at `pos` ends the current string (None: need more input to decide)"""
+        after = _skip_whitespace(buffer, pos + 1, end)
+        if after >= end:
+            return True if final else None
+
+        following = buffer[after]
+        if self._string_is_key:
+            return following == ":"
+        if following in "}]":
+            return True
+        if following != ",":
+            return False
+
+        # `", ` ends the string only if a plausible next key/value follows the comma
+        next_start = _skip_whitespace(buffer, after + 1, end)
+        if next_start >= end:
+            return True if final else None
+        next_char = buffer[next_start]
+        if self._stack and isinstance(self._stack[-1].container, dict):
+            return next_char == '"' or next_char == "}"
+        return next_char in _VALUE_START or next_char == "]"
+
+    def _joined_string(self) -> str:
+        value = "".join(self._string_parts)
+        self._string_parts = []
+        if any("\ud800" <= char <= "\udfff" for char in value):
+            # \uXXXX surrogate pairs were decoded one half at a time
+            value = value.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+        return value
+
+    def _child_path(self) -> Path:
+        frame = self._stack[-1]
+        if isinstance(frame.container, list):
+            return frame.path + (len(frame.container),)
+        return frame.path + (frame.key,)
+
+    def _attach(self, value) -> Optional[Path]:
+        """Attach a value to the current container; returns its path (None when it had no key)"""
+        if not self._stack:
+            self.root = value
+            return ()
+        frame = self._stack[-1]
+        path = self._child_path()
+        if isinstance(frame.container, list):
+            frame.container.append(value)
+        elif frame.key is not None:
+            frame.container[frame.key] = value
+            frame.key = None
+        else:
+            return None
+        return path
+
+    def _push(self, container) -> None:
+        if self.root is not None and not self._stack:
+            return
+        path = self._attach(container)
+        self._stack.append(_Frame(container, path if path is not None else ()))
+
+    def _pop(self) -> None:
+        if not self._stack:
+            self.done = self.root is not None
+            return
+        frame = self._stack.pop()
+        self._report(frame.path, frame.container)
+        if not self._stack:
+            self.done = True
+
+    def _value_done(self, value) -> None:
+        if not self._stack:
+            return
+        path = self._attach(value)
+        if path is not None:
+            self._report(path, value)
+
+    def _report(self, path: Path, value) -> None:
+        for pattern in self.watch:
+            if len(pattern) == len(path) and all(p == "*" or p == k for p, k in zip(pattern, path)):
+                self._completed.append((path, value))
+                return
+
+
+def _skip_whitespace(buffer: str, pos: int, end: int) -> int:
+    while pos < end and buffer[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def _starts_json(buffer: str, pos: int, end: int) -> Optional[bool]:
+    """Whether the bracket at `pos` opens the top-level value (None: need more input to decide)"""
+    after = _skip_whitespace(buffer, pos + 1, end)
+    if after >= end:
+        return None
+    following = buffer[after]
+    if buffer[pos] == "{":
+        return following == '"' or following == "}"
+    return following in '"{[]'
+
+
+def parse_model_json(text: str) -> Any:
+    """Parse a complete (possibly fenced, malformed or truncated) model response"""
+    try:
+        # Well-formed responses (the common case in JSON mode) go through the C decoder
+        return json.loads(text)
+    except ValueError:
+        pass
+    parser = JSONStreamParser()
+    parser.feed(text)
+    return parser.close()
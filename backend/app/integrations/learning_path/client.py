@@ -1,13 +1,25 @@
 from app.integrations.learning_path.templates import (
     learning_path_generation_template,
+    learning_path_outline_template,
+    learning_path_module_template,
+    learning_path_session_template,
     get_structure_instructions,
     get_content_instructions
 )
-from app.integrations.learning_path.structures import LearningPathOutput
-from app.integrations.ai_client import AIClient
+from app.integrations.learning_path.structures import LearningPathOutput, LearningPathOutline, ModuleOutline
+from app.core.settings import get_settings
+from app.integrations.ai_client import AIClient, message_text
+from app.core.metrics import stage
+from app.integrations.json_stream import JSONStreamParser, parse_model_json
+from app.integrations.token_budget import retrieve
+from typing import AsyncIterator, Optional
 from datetime import datetime
+import asyncio
+import json
 import uuid
 
+settings = get_settings()
+
 class LearningPathAIClient(AIClient):
     """AI Client for learning paths - exactly like SummarizeAIClient"""
     
@@ -31,167 +43,67 @@ class LearningPathAIClient(AIClient):
     ) -> dict:
         """Generate learning path with advanced customization"""
         
-        # Get dynamic instructions
-        structure_instr = get_structure_instructions(
-            auto_structure, modules_count, sessions_per_module,
-            topics_per_session, flashcards_per_topic, questions_per_topic
-        )
-        content_instr = get_content_instructions(generate_full_content, learning_approach, detail_level)
-        
+        if settings.LEARNING_PATH_FANOUT:
+            modules = []
+            outline = None
+            async for event, data in self._fanout(
+                content, difficulty, modules_count, sessions_per_module, topics_per_session,
+                flashcards_per_topic, questions_per_topic, language, auto_structure,
+                learning_approach, language_register, detail_level, generate_full_content
+            ):
+                if event == "outline":
+                    outline = data
+                    modules = [None] * len(outline.modules)
+                else:
+                    index, module = data
+                    modules[index] = module
+
+            if outline is None:
+                return {"error": "No learning path could be generated."}
+            return self._format_output({
+                "title": outline.title,
+                "description": outline.description,
+                "modules": modules
+            }, total_duration, difficulty)
+
         instructions = learning_path_generation_template()
+        payload = self._payload(
+            content, difficulty, modules_count, sessions_per_module, topics_per_session,
+            flashcards_per_topic, questions_per_topic, language, auto_structure,
+            learning_approach, language_register, detail_level, generate_full_content
+        )
         
-        # Determine output format based on mode
-        if generate_full_content:
-            output_format_text = """Respond with a JSON object: {"title": "...", "description": "...", "modules": [...]}"""
-        else:
-            output_format_text = """Respond with: {"title": "...", "description": "...", "modules_json": "[...]"}"""
-        
-        # Create a model per request with JSON mode for full content generation
         # When generating full content, use JSON mode instead of structured output
         # to avoid escaping issues with complex content
-        from langchain_google_genai import ChatGoogleGenerativeAI
-        
         if generate_full_content:
             # Use JSON mode for full content - directly request JSON without structured output
-            model = ChatGoogleGenerativeAI(
-                model=self.model_name,
-                api_key=self.api_key,
-                max_retries=self.max_retries,
-                response_mime_type="application/json"  # Force valid JSON output
-            )
-            
-            # Use the model directly (no structured output)
-            chain = instructions | model
-            
-            response = await chain.ainvoke({
-                "content": content,
-                "difficulty": difficulty,
-                "modules_count": modules_count,
-                "sessions_per_module": sessions_per_module,
-                "topics_per_session": topics_per_session,
-                "flashcards_per_topic": flashcards_per_topic,
-                "questions_per_topic": questions_per_topic,
-                "language": language,
-                "auto_structure": "YES - Analyze and decide optimal structure" if auto_structure else "NO - Use specified counts",
-                "learning_approach": learning_approach,
-                "language_register": language_register,
-                "detail_level": detail_level,
-                "generate_full_content": "YES - Generate complete content" if generate_full_content else "NO - Generate structure only",
-                "structure_instructions": structure_instr,
-                "content_instructions": content_instr,
-                "content_field": "Complete detailed content with examples and explanations",
-                "output_format": output_format_text
-            })
+            response = await self.run_chain(instructions, payload, response_mime_type="application/json")  # Force valid JSON output
             
-            # Parse the JSON response manually
-            import json
-            try:
-                result_dict = json.loads(response.content)
-                # Create a mock result object with the expected structure
-                class MockResult:
-                    def __init__(self, data):
-                        self.title = data.get("title", "Learning Path")
-                        self.description = data.get("description", "")
-                        self.modules_json = json.dumps(data.get("modules", []))
-                
-                result = MockResult(result_dict)
-            except Exception as e:
-                print(f"[ERROR] Failed to parse JSON mode response: {e}")
-                return {"error": f"Failed to parse response: {e}"}
-                
+            # Parse the JSON response manually (tolerates fences, stray quotes and truncation)
+            with stage("json_repair"):
+                data = parse_model_json(message_text(response))
+            if not isinstance(data, dict):
+                print(f"[ERROR] JSON mode response is not an object: {message_text(response)[:500]}")
+                return {"error": "Failed to parse response"}
+            result = LearningPathOutput(
+                title=data.get("title", "Learning Path"),
+                description=data.get("description", ""),
+                modules_json=""
+            )
+            modules = data.get("modules", [])
         else:
             # Use standard structured output for structure-only (faster)
-            model = self.new_model()
-            structured_llm = model.with_structured_output(LearningPathOutput)
-            chain = instructions | structured_llm
-            
-            result = await chain.ainvoke({
-                "content": content,
-                "difficulty": difficulty,
-                "modules_count": modules_count,
-                "sessions_per_module": sessions_per_module,
-                "topics_per_session": topics_per_session,
-                "flashcards_per_topic": flashcards_per_topic,
-                "questions_per_topic": questions_per_topic,
-                "language": language,
-                "auto_structure": "YES - Analyze and decide optimal structure" if auto_structure else "NO - Use specified counts",
-                "learning_approach": learning_approach,
-                "language_register": language_register,
-                "detail_level": detail_level,
-                "generate_full_content": "NO - Generate structure only",
-                "structure_instructions": structure_instr,
-                "content_instructions": content_instr,
-                "content_field": "Brief description",
-                "output_format": output_format_text
-            })
+            result = await self.run_chain(instructions, payload, LearningPathOutput)
+            modules = None
         
         if not result:
             return {"error": "No learning path could be generated."}
         
         try:
             # Parse JSON and add IDs
-            import json
-            import re
-            
-            modules_json = result.modules_json if result.modules_json else "[]"
-            
-            # Clean JSON string before parsing (common AI mistakes)
-            def clean_json(json_str: str) -> str:
-                """Clean and fix common JSON formatting issues from AI output"""
-                # Remove any markdown code blocks
-                json_str = re.sub(r'```json\s*', '', json_str)
-                json_str = re.sub(r'```\s*$', '', json_str)
-                
-                # Remove any leading/trailing whitespace
-                json_str = json_str.strip()
-                
-                # Fix unescaped quotes in string values using a more sophisticated approach
-                # This regex finds "key": "value" pairs and escapes quotes inside the value
-                def fix_value_quotes(match):
-                    key = match.group(1)
-                    value = match.group(2)
-                    # Escape unescaped quotes in the value
-                    # But be careful not to double-escape already escaped quotes
-                    value = value.replace('\\"', '___ALREADY_ESCAPED___')
-                    value = value.replace('"', '\\"')
-                    value = value.replace('___ALREADY_ESCAPED___', '\\"')
-                    return f'"{key}": "{value}"'
-                
-                # Pattern to match "key": "value" where value might contain unescaped quotes
-                # This is a simplified approach - match field: string pairs
-                pattern = r'"(content|question|answer|title|description)"\s*:\s*"((?:[^"\\]|\\.)*)(?<!\\)"'
-                
-                try:
-                    # Try to fix quote issues in content fields
-                    json_str = re.sub(pattern, fix_value_quotes, json_str)
-                except:
-                    pass  # If regex fails, continue with original
-                
-                return json_str
-            
-            # Clean the JSON first
-            modules_json = clean_json(modules_json)
-            
-            # Parse with fallback
-            try:
-                decoder = json.JSONDecoder()
-                modules, _ = decoder.raw_decode(modules_json)
-            except json.JSONDecodeError as e:
-                print(f"[WARNING] JSONDecoder failed: {e}")
-                print(f"[DEBUG] First 500 chars of JSON: {modules_json[:500]}")
-                print(f"[DEBUG] Problem area: {modules_json[max(0, e.pos-100):e.pos+100]}")
-                
-                # Try standard json.loads
-                try:
-                    modules = json.loads(modules_json)
-                except json.JSONDecodeError as e2:
-                    print(f"[ERROR] json.loads also failed: {e2}")
-                    # Last resort: try to extract array from the string
-                    match = re.search(r'\[.*\]', modules_json, re.DOTALL)
-                    if match:
-                        modules = json.loads(match.group(0))
-                    else:
-                        raise
+            if modules is None:
+                with stage("json_repair"):
+                    modules = parse_model_json(result.modules_json) if result.modules_json else []
             
             # Ensure it's a list
             modules = modules if isinstance(modules, list) else []
@@ -208,6 +120,384 @@ class LearningPathAIClient(AIClient):
             traceback.print_exc()
             return {"error": f"Failed to format learning path: {str(e)}"}
     
+    async def stream_learning_path(
+        self,
+        content: str,
+        difficulty: str,
+        total_duration: str,
+        modules_count: int,
+        sessions_per_module: int,
+        topics_per_session: int,
+        flashcards_per_topic: int,
+        questions_per_topic: int,
+        include_theory: bool,
+        language: str,
+        auto_structure: bool = False,
+        learning_approach: str = "balanced",
+        language_register: str = "neutral",
+        detail_level: str = "intermediate",
+        generate_full_content: bool = False
+    ) -> AsyncIterator[dict]:
+        """
+        Stream a learning path as events: `module` as soon as each module is complete in the
+        model output, then `done` with the formatted learning path (same shape as generate_learning_path).
+        """
+        learning_path_id = str(uuid.uuid4())
+
+        if settings.LEARNING_PATH_FANOUT:
+            # The outline arrives after one short call; modules follow as each parallel call finishes
+            modules = []
+            outline = None
+            async for event, data in self._fanout(
+                content, difficulty, modules_count, sessions_per_module, topics_per_session,
+                flashcards_per_topic, questions_per_topic, language, auto_structure,
+                learning_approach, language_register, detail_level, generate_full_content
+            ):
+                if event == "outline":
+                    outline = data
+                    modules = [None] * len(outline.modules)
+                    yield {"event": "outline", "data": {"learningPathId": learning_path_id, "outline": outline.model_dump()}}
+                else:
+                    index, module = data
+                    modules[index] = module
+                    yield {"event": "module", "data": {"learningPathId": learning_path_id, "module": module}}
+
+            if outline is None:
+                yield {"event": "error", "data": {"detail": "No learning path could be generated."}}
+                return
+            learning_path = self._format_output(
+                {"title": outline.title, "description": outline.description, "modules": modules},
+                total_duration, difficulty
+            )
+            learning_path["id"] = learning_path_id
+            yield {"event": "done", "data": {"learning_path": learning_path}}
+            return
+
+        # Always JSON mode: modules arrive inline, so they can be emitted while the response streams
+        payload = self._payload(
+            content, difficulty, modules_count, sessions_per_module, topics_per_session,
+            flashcards_per_topic, questions_per_topic, language, auto_structure,
+            learning_approach, language_register, detail_level, generate_full_content,
+            json_mode=True
+        )
+
+        parser = JSONStreamParser(watch=[("modules", "*")])
+        modules = []
+        async for text in self.stream_chain(
+            learning_path_generation_template(), payload, response_mime_type="application/json"
+        ):
+            for _, module in parser.feed(text):
+                if not isinstance(module, dict):
+                    continue
+                self._assign_ids(module, len(modules))
+                modules.append(module)
+                yield {"event": "module", "data": {"learningPathId": learning_path_id, "module": module}}
+
+        with stage("json_repair"):
+            data = parser.close()
+        if not isinstance(data, dict):
+            data = {}
+        learning_path = self._format_output(
+            {"title": data.get("title", "Learning Path"), "description": data.get("description", ""), "modules": modules},
+            total_duration, difficulty
+        )
+        learning_path["id"] = learning_path_id
+        yield {"event": "done", "data": {"learning_path": learning_path}}
+
+    async def _fanout(
+        self,
+        content: str,
+        difficulty: str,
+        modules_count: int,
+        sessions_per_module: int,
+        topics_per_session: int,
+        flashcards_per_topic: int,
+        questions_per_topic: int,
+        language: str,
+        auto_structure: bool,
+        learning_approach: str,
+        language_register: str,
+        detail_level: str,
+        generate_full_content: bool
+    ) -> AsyncIterator[tuple]:
+        """
+        Two-phase generation. Yields ("outline", LearningPathOutline) after one short structured call,
+        then ("module", (index, module)) for each module as its own call completes. Module calls run
+        concurrently (bounded by LEARNING_PATH_MAX_CONCURRENCY), so latency is roughly
+        outline + slowest module and no single response has to hold the whole path.
+        Structure-only paths need no module calls: their modules are the outline itself, and
+        sessions are written on first access (see generate_session).
+        """
+        payload = self._payload(
+            content, difficulty, modules_count, sessions_per_module, topics_per_session,
+            flashcards_per_topic, questions_per_topic, language, auto_structure,
+            learning_approach, language_register, detail_level, generate_full_content
+        )
+        outline = await self.run_chain(learning_path_outline_template(), {
+            key: payload[key] for key in (
+                "content", "language", "difficulty", "learning_approach",
+                "detail_level", "auto_structure", "structure_instructions"
+            )
+        }, LearningPathOutline)
+
+        if not outline or not outline.modules:
+            return
+        yield "outline", outline
+
+        if not generate_full_content:
+            for index, module_outline in enumerate(outline.modules):
+                yield "module", (index, self._assign_ids(self._outline_module(module_outline), index))
+            return
+
+        path_outline = "\n".join(
+            f"{index + 1}. {module.title}: " + "; ".join(session.title for session in module.sessions)
+            for index, module in enumerate(outline.modules)
+        )
+        module_payload = {
+            key: payload[key] for key in (
+                "content", "language", "difficulty", "learning_approach", "language_register",
+                "detail_level", "content_instructions", "content_field"
+            )
+        }
+        module_payload.update({
+            "path_title": outline.title,
+            "path_description": outline.description,
+            "path_outline": path_outline,
+            # Counts are asked per topic in the form, but flashcards/practice live at session level
+            "flashcards_count": flashcards_per_topic * topics_per_session,
+            "questions_count": questions_per_topic * topics_per_session,
+        })
+
+        semaphore = asyncio.Semaphore(settings.LEARNING_PATH_MAX_CONCURRENCY)
+
+        async def build(index: int, module_outline: ModuleOutline):
+            # Only the passages about this module, from an index built once for the document
+            module_content = await retrieve(
+                content, self._module_query(module_outline), settings.LEARNING_PATH_MODULE_CONTENT_TOKENS
+            )
+            try:
+                async with semaphore:
+                    response = await self.run_chain(
+                        learning_path_module_template(),
+                        {
+                            **module_payload,
+                            "content": module_content,
+                            "module_outline": module_outline.model_dump_json(indent=2),
+                        },
+                        response_mime_type="application/json"
+                    )
+            except Exception as e:
+                # Like an unparseable module: one failed call does not sink the path
+                print(f"[WARNING] Module call failed for '{module_outline.title}': {e}")
+                return index, self._assign_ids(self._outline_module(module_outline), index)
+            return index, self._assign_ids(self._parse_module(message_text(response), module_outline), index)
+
+        for next_module in asyncio.as_completed([build(i, m) for i, m in enumerate(outline.modules)]):
+            yield "module", await next_module
+
+    async def generate_session(self, content: str, learning_path: dict, session_id: str, options: dict) -> Optional[dict]:
+        """
+        Full content for one session of a stored learning path (e.g. `module_1_session_2`), written
+        from the passages of `content` relevant to that session. None if the session does not
+        exist, {"error": ...} if the model output cannot be parsed.
+        """
+        located = self.find_session(learning_path, session_id)
+        if located is None:
+            return None
+        module, session = located
+
+        topic_titles = [topic.get("title", "") for topic in session.get("topics", []) if isinstance(topic, dict)]
+        query = " ".join(part for part in [module.get("title"), session.get("title"), session.get("description"), *topic_titles] if part)
+        session_content = await retrieve(content, query, settings.LEARNING_PATH_SESSION_CONTENT_TOKENS)
+
+        path_outline = "\n".join(
+            f"{index + 1}. {path_module.get('title', '')}: "
+            + "; ".join(path_session.get("title", "") for path_session in path_module.get("sessions", []))
+            for index, path_module in enumerate(learning_path.get("modules", []))
+        )
+        session_outline = json.dumps({
+            "title": session.get("title", ""),
+            "description": session.get("description", ""),
+            "estimatedDuration": session.get("estimatedDuration", ""),
+            "topics": topic_titles,
+        }, ensure_ascii=False, indent=2)
+
+        topics_per_session = max(len(topic_titles), 1)
+        response = await self.run_chain(learning_path_session_template(), {
+            "path_title": learning_path.get("title", ""),
+            "path_description": learning_path.get("description", ""),
+            "path_outline": path_outline,
+            "module_title": module.get("title", ""),
+            "session_outline": session_outline,
+            "language": options.get("language", "Spanish"),
+            "difficulty": options.get("difficulty", "intermediate"),
+            "learning_approach": options.get("learning_approach", "balanced"),
+            "language_register": options.get("language_register", "neutral"),
+            "detail_level": options.get("detail_level", "intermediate"),
+            "flashcards_count": options.get("flashcards_per_topic", 3) * topics_per_session,
+            "questions_count": options.get("questions_per_topic", 3) * topics_per_session,
+            "content_instructions": get_content_instructions(
+                True, options.get("learning_approach", "balanced"), options.get("detail_level", "intermediate")
+            ),
+            "content": session_content,
+        }, response_mime_type="application/json")
+
+        with stage("json_repair"):
+            generated = parse_model_json(message_text(response))
+        if isinstance(generated, dict) and isinstance(generated.get("session"), dict):
+            generated = generated["session"]
+        if not isinstance(generated, dict) or not isinstance(generated.get("topics"), list):
+            print(f"[WARNING] Failed to parse session '{session_id}': {message_text(response)[:200]}")
+            return {"error": f"Failed to generate session {session_id}"}
+
+        for key in ("title", "description", "estimatedDuration"):
+            generated.setdefault(key, session.get(key, ""))
+        generated.setdefault("flashcards", [])
+        generated.setdefault("practice", [])
+        return self._assign_session_ids(generated, session_id)
+
+    def find_session(self, learning_path: dict, session_id: str) -> Optional[tuple]:
+        """(module, session) dicts for a session ID"""
+        for module in learning_path.get("modules", []):
+            for session in module.get("sessions", []) if isinstance(module, dict) else []:
+                if isinstance(session, dict) and session.get("id") == session_id:
+                    return module, session
+        return None
+
+    def _module_query(self, module_outline: ModuleOutline) -> str:
+        """Retrieval query for a module: its own titles, descriptions and topics"""
+        parts = [module_outline.title, module_outline.description]
+        for session in module_outline.sessions:
+            parts.extend([session.title, session.description, *session.topics])
+        return " ".join(part for part in parts if part)
+
+    def _parse_module(self, text: str, module_outline: ModuleOutline) -> dict:
+        """Module JSON from a module call; falls back to the outline so one bad module does not sink the path"""
+        with stage("json_repair"):
+            module = parse_model_json(text)
+        if isinstance(module, dict) and isinstance(module.get("module"), dict):
+            module = module["module"]
+        elif isinstance(module, list) and module and isinstance(module[0], dict):
+            module = module[0]
+        if isinstance(module, dict) and isinstance(module.get("sessions"), list):
+            module.setdefault("title", module_outline.title)
+            module.setdefault("description", module_outline.description)
+            module.setdefault("estimatedDuration", module_outline.estimatedDuration)
+            return module
+
+        print(f"[WARNING] Failed to parse module '{module_outline.title}': {text[:200]}")
+        return self._outline_module(module_outline)
+
+    def _outline_module(self, module_outline: ModuleOutline) -> dict:
+        """
+        A module with the outline's titles and no content. Its sessions are marked
+        `contentGenerated: False`, so they are written on first access (see generate_session),
+        whatever the options of the path.
+        """
+        return {
+            "title": module_outline.title,
+            "description": module_outline.description,
+            "estimatedDuration": module_outline.estimatedDuration,
+            "sessions": [
+                {
+                    "title": session.title,
+                    "description": session.description,
+                    "estimatedDuration": session.estimatedDuration,
+                    "topics": [{"title": topic, "content": ""} for topic in session.topics],
+                    "flashcards": [],
+                    "practice": [],
+                    "contentGenerated": False,
+                }
+                for session in module_outline.sessions
+            ],
+        }
+
+    def _payload(
+        self,
+        content: str,
+        difficulty: str,
+        modules_count: int,
+        sessions_per_module: int,
+        topics_per_session: int,
+        flashcards_per_topic: int,
+        questions_per_topic: int,
+        language: str,
+        auto_structure: bool,
+        learning_approach: str,
+        language_register: str,
+        detail_level: str,
+        generate_full_content: bool,
+        json_mode: Optional[bool] = None
+    ) -> dict:
+        """Prompt inputs for learning_path_generation_template. JSON mode returns modules inline."""
+        if json_mode is None:
+            json_mode = generate_full_content
+
+        # Get dynamic instructions
+        structure_instr = get_structure_instructions(
+            auto_structure, modules_count, sessions_per_module,
+            topics_per_session, flashcards_per_topic, questions_per_topic
+        )
+        content_instr = get_content_instructions(generate_full_content, learning_approach, detail_level)
+
+        # Determine output format based on mode
+        if json_mode:
+            output_format_text = """Respond with a JSON object: {"title": "...", "description": "...", "modules": [...]}"""
+        else:
+            output_format_text = """Respond with: {"title": "...", "description": "...", "modules_json": "[...]"}"""
+
+        return {
+            "content": content,
+            "difficulty": difficulty,
+            "modules_count": modules_count,
+            "sessions_per_module": sessions_per_module,
+            "topics_per_session": topics_per_session,
+            "flashcards_per_topic": flashcards_per_topic,
+            "questions_per_topic": questions_per_topic,
+            "language": language,
+            "auto_structure": "YES - Analyze and decide optimal structure" if auto_structure else "NO - Use specified counts",
+            "learning_approach": learning_approach,
+            "language_register": language_register,
+            "detail_level": detail_level,
+            "generate_full_content": "YES - Generate complete content" if generate_full_content else "NO - Generate structure only",
+            "structure_instructions": structure_instr,
+            "content_instructions": content_instr,
+            "content_field": "Complete detailed content with examples and explanations" if generate_full_content else "Brief description",
+            "output_format": output_format_text
+        }
+
+    def _assign_ids(self, module: dict, module_idx: int) -> dict:
+        """Add IDs to a module and all of its nested structures"""
+        module["id"] = f"module_{module_idx + 1}"
+        
+        for session_idx, session in enumerate(module.get("sessions", [])):
+            if not isinstance(session, dict):
+                continue
+            self._assign_session_ids(session, f"{module['id']}_session_{session_idx + 1}")
+        return module
+
+    def _assign_session_ids(self, session: dict, session_id: str) -> dict:
+        """Add IDs to a session, its topics, flashcards and practice questions"""
+        session["id"] = session_id
+        
+        # Add IDs to topics (topics only have title and content now)
+        for topic_idx, topic in enumerate(session.get("topics", [])):
+            if not isinstance(topic, dict):
+                continue
+                
+            topic["id"] = f"{session_id}_topic_{topic_idx + 1}"
+        
+        # Add IDs to flashcards (at session level)
+        for fc_idx, flashcard in enumerate(session.get("flashcards", [])):
+            if isinstance(flashcard, dict):
+                flashcard["id"] = f"{session_id}_flashcard_{fc_idx + 1}"
+        
+        # Add IDs to practice questions (at session level)
+        for q_idx, question in enumerate(session.get("practice", [])):
+            if isinstance(question, dict):
+                question["id"] = f"{session_id}_question_{q_idx + 1}"
+        return session
+
     def _format_output(self, data: dict, total_duration: str, difficulty: str) -> dict:
         """Add IDs and metadata to the output"""
         
@@ -215,34 +505,10 @@ class LearningPathAIClient(AIClient):
         modules = data.get("modules", [])
         
         # Add IDs to all nested structures
-        for module_idx, module in enumerate(modules):
-            if not isinstance(module, dict):
-                continue
-                
-            module["id"] = f"module_{module_idx + 1}"
-            
-            for session_idx, session in enumerate(module.get("sessions", [])):
-                if not isinstance(session, dict):
-                    continue
-                    
-                session["id"] = f"{module['id']}_session_{session_idx + 1}"
-                
-                # Add IDs to topics (topics only have title and content now)
-                for topic_idx, topic in enumerate(session.get("topics", [])):
-                    if not isinstance(topic, dict):
-                        continue
-                        
-                    topic["id"] = f"{session['id']}_topic_{topic_idx + 1}"
-                
-                # Add IDs to flashcards (at session level)
-                for fc_idx, flashcard in enumerate(session.get("flashcards", [])):
-                    if isinstance(flashcard, dict):
-                        flashcard["id"] = f"{session['id']}_flashcard_{fc_idx + 1}"
-                
-                # Add IDs to practice questions (at session level)
-                for q_idx, question in enumerate(session.get("practice", [])):
-                    if isinstance(question, dict):
-                        question["id"] = f"{session['id']}_question_{q_idx + 1}"
+        with stage("format_output"):
+            for module_idx, module in enumerate(modules):
+                if isinstance(module, dict):
+                    self._assign_ids(module, module_idx)
         
         return {
             "id": learning_path_id,
@@ -253,5 +519,3 @@ class LearningPathAIClient(AIClient):
             "createdAt": datetime.utcnow().isoformat() + "Z",
             "modules": modules
         }
-
-
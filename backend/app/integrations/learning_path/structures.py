@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 class LearningPathOutput(BaseModel):
@@ -7,3 +7,21 @@ class LearningPathOutput(BaseModel):
     description: str = Field(description="Brief overview")
     modules_json: str = Field(description="Complete modules structure as JSON string")
 
+
+class SessionOutline(BaseModel):
+    title: str = Field(description="Title of the session")
+    description: str = Field(description="One-line overview of the session")
+    estimatedDuration: Optional[str] = Field(default=None, description="Estimated duration, e.g. '30 min'")
+    topics: List[str] = Field(description="Titles of the topics covered in the session, in order")
+
+class ModuleOutline(BaseModel):
+    title: str = Field(description="Title of the module")
+    description: str = Field(description="One-line overview of the module")
+    estimatedDuration: Optional[str] = Field(default=None, description="Estimated duration, e.g. '2 hours'")
+    sessions: List[SessionOutline] = Field(description="Sessions of the module, in order")
+
+class LearningPathOutline(BaseModel):
+    """First phase of the fan-out pipeline: titles only, content is generated per module"""
+    title: str = Field(description="Title of the learning path")
+    description: str = Field(description="Brief overview")
+    modules: List[ModuleOutline] = Field(description="Modules of the learning path, in order")
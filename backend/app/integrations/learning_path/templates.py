@@ -164,3 +164,125 @@ def get_content_instructions(generate_full_content: bool, learning_approach: str
         """
 
 
+def learning_path_outline_template():
+    return PromptTemplate.from_template("""
+    You are an expert educational content creator. Design the OUTLINE of a structured learning path from the document content.
+    Only titles, one-line descriptions and durations are needed here; the content of each module is written later.
+    
+    CONFIGURATION:
+    - Language: {language}
+    - Difficulty: {difficulty}
+    - Learning Approach: {learning_approach}
+    - Detail Level: {detail_level}
+    - Auto Structure: {auto_structure}
+    
+    STRUCTURE REQUIREMENTS:
+    {structure_instructions}
+    
+    For every session list the titles of its topics, in teaching order.
+    Modules and sessions must not overlap: each concept of the document belongs to exactly one session.
+    
+    Content to analyze:
+    {content}
+    """)
+
+def learning_path_module_template():
+    return PromptTemplate.from_template("""
+    You are an expert educational content creator. You are writing ONE module of a learning path.
+    
+    LEARNING PATH: {path_title}
+    {path_description}
+    
+    FULL OUTLINE (for context only, do not write the other modules):
+    {path_outline}
+    
+    MODULE TO WRITE (keep these exact titles and this order):
+    {module_outline}
+    
+    CONFIGURATION:
+    - Language: {language}
+    - Difficulty: {difficulty}
+    - Learning Approach: {learning_approach} (theoretical/practical/balanced/project-based/fast)
+    - Language Register: {language_register} (formal/neutral/informal/technical/beginner/advanced)
+    - Detail Level: {detail_level} (basic/intermediate/advanced/expert/master)
+    - Flashcards per session: {flashcards_count}
+    - Practice questions per session: {questions_count}
+    
+    CONTENT GENERATION:
+    {content_instructions}
+    
+    OUTPUT FORMAT:
+    Respond with a single JSON object for this module, escaping quotes (\\") and newlines (\\n) inside strings:
+    {{
+      "title": "Module Title",
+      "description": "Brief overview in a single line",
+      "estimatedDuration": "2 hours",
+      "sessions": [
+        {{
+          "title": "Session Title",
+          "description": "Brief overview in a single line",
+          "estimatedDuration": "30 min",
+          "topics": [
+            {{"title": "Topic Title", "content": "{content_field}"}}
+          ],
+          "flashcards": [
+            {{"question": "Question about ANY topic in this session?", "answer": "Answer without newlines"}}
+          ],
+          "practice": [
+            {{"question": "Question about ANY topic in this session?", "options": ["Option A", "Option B", "Option C", "Option D"], "correctAnswer": 0}}
+          ]
+        }}
+      ]
+    }}
+    
+    Content to analyze:
+    {content}
+    """)
+
+def learning_path_session_template():
+    return PromptTemplate.from_template("""
+    You are an expert educational content creator. You are writing the full content of ONE session of a learning path.
+    
+    LEARNING PATH: {path_title}
+    {path_description}
+    
+    FULL OUTLINE (for context only, do not write the other sessions):
+    {path_outline}
+    
+    MODULE: {module_title}
+    
+    SESSION TO WRITE (keep these exact titles and this order):
+    {session_outline}
+    
+    CONFIGURATION:
+    - Language: {language}
+    - Difficulty: {difficulty}
+    - Learning Approach: {learning_approach} (theoretical/practical/balanced/project-based/fast)
+    - Language Register: {language_register} (formal/neutral/informal/technical/beginner/advanced)
+    - Detail Level: {detail_level} (basic/intermediate/advanced/expert/master)
+    - Flashcards: {flashcards_count}
+    - Practice questions: {questions_count}
+    
+    CONTENT GENERATION:
+    {content_instructions}
+    
+    OUTPUT FORMAT:
+    Respond with a single JSON object for this session, escaping quotes (\\") and newlines (\\n) inside strings:
+    {{
+      "title": "Session Title",
+      "description": "Brief overview in a single line",
+      "estimatedDuration": "30 min",
+      "topics": [
+        {{"title": "Topic Title", "content": "Complete detailed content with examples and explanations"}}
+      ],
+      "flashcards": [
+        {{"question": "Question about ANY topic in this session?", "answer": "Answer without newlines"}}
+      ],
+      "practice": [
+        {{"question": "Question about ANY topic in this session?", "options": ["Option A", "Option B", "Option C", "Option D"], "correctAnswer": 0}}
+      ]
+    }}
+    
+    Content to analyze:
+    {content}
+    """)
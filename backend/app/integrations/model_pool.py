@@ -0,0 +1,78 @@
+from typing import Callable, Dict, Optional, Tuple, Type
+import asyncio
+import inspect
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel
+
+
+class ModelPool:
+    """
+    Long-lived ChatGoogleGenerativeAI instances keyed by (model, options, structured schema).
+
+    The pool is opened and closed by the FastAPI lifespan, so every pooled client (and its
+    HTTP connection pool) belongs to the serving event loop and is closed exactly once on
+    shutdown. Outside of the lifespan (scripts, serverless cold paths) `started` is False and
+    callers should fall back to building a model per request.
+    """
+
+    def __init__(self, factory: Callable[..., ChatGoogleGenerativeAI] = ChatGoogleGenerativeAI):
+        self.factory = factory
+        self.started = False
+        self._models: Dict[Tuple, ChatGoogleGenerativeAI] = {}
+        self._runnables: Dict[Tuple, object] = {}
+        self._lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        self.started = True
+
+    async def shutdown(self) -> None:
+        async with self._lock:
+            self.started = False
+            models = list(self._models.values())
+            self._models.clear()
+            self._runnables.clear()
+
+        for model in models:
+            await _close_model(model)
+
+    def get(self, model_name: str, api_key: str, max_retries: int, **model_options) -> ChatGoogleGenerativeAI:
+        key = (model_name, tuple(sorted(model_options.items())))
+        model = self._models.get(key)
+        if model is None:
+            model = self.factory(model=model_name, api_key=api_key, max_retries=max_retries, **model_options)
+            self._models[key] = model
+        return model
+
+    def runnable(self, model_name: str, api_key: str, max_retries: int,
+                 structure: Optional[Type[BaseModel]] = None, **model_options):
+        """Pooled model, wrapped with `with_structured_output(structure)` when a structure is given"""
+        key = (model_name, tuple(sorted(model_options.items())), structure)
+        runnable = self._runnables.get(key)
+        if runnable is None:
+            model = self.get(model_name, api_key, max_retries, **model_options)
+            runnable = model.with_structured_output(structure) if structure else model
+            self._runnables[key] = runnable
+        return runnable
+
+    def stats(self) -> dict:
+        return {"started": self.started, "models": len(self._models), "runnables": len(self._runnables)}
+
+
+async def _close_model(model) -> None:
+    """Best-effort close of the sync and async transports held by a model's client"""
+    client = getattr(model, "client", None)
+    if client is None:
+        return
+
+    async_client = getattr(client, "aio", None)
+    for target, method in ((async_client, "aclose"), (client, "close")):
+        close = getattr(target, method, None) if target is not None else None
+        if close is None:
+            continue
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"[WARNING] Failed to close model client: {e}")
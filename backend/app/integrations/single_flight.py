@@ -0,0 +1,37 @@
+from typing import Awaitable, Callable, Dict
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller runs the work,
+    everyone arriving while it is in flight awaits the same future.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable]):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.followers += 1
+            # shield: a follower being cancelled must not cancel the shared call
+            return await asyncio.shield(future)
+
+        self.leaders += 1
+        future = asyncio.ensure_future(work())
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._inflight), "leaders": self.leaders, "followers": self.followers}
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Retrieve the exception so an unobserved failure is not logged as "never retrieved"
+        if not future.cancelled():
+            future.exception()
@@ -1,18 +1,130 @@
+from typing import AsyncIterator, List, Optional
+from app.core.settings import get_settings
 from app.domain.models import SummaryOptions
-from app.integrations.summaries.templates import summarize_template
+from app.integrations.summaries.templates import (
+    SUMMARY_SECTION_HEADINGS,
+    summarize_template,
+    stream_summary_template,
+    chunk_summary_template,
+    reduce_summary_template,
+)
 from app.integrations.summaries.structures import Summary
-from app.integrations.ai_client import AIClient
+from app.integrations.summaries.map_reduce import chunk_documents, map_reduce
+from app.integrations.ai_client import AIClient, message_text
+
+settings = get_settings()
+
+BULLETS = ("- ", "* ", "• ")
+
+
+def _heading(line: str) -> Optional[str]:
+    """Section name for a stream_summary_template heading line ("### Examples", "**Examples:**")"""
+    stripped = line.strip().strip("#*: ").lower()
+    for section, heading in SUMMARY_SECTION_HEADINGS.items():
+        if line.lstrip().startswith(("#", "*")) and stripped == heading.strip("# ").lower():
+            return section
+    return None
+
+
+def _items(lines: List[str]) -> Optional[List[str]]:
+    items = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith(BULLETS):
+            line = line[2:].strip()
+        elif line[:1].isdigit() and ". " in line[:4]:
+            line = line.split(". ", 1)[1].strip()
+        if line:
+            items.append(line)
+    return items or None
+
+
+def parse_summary_text(text: str) -> dict:
+    """Split streamed summary text into the fields of the structured Summary returned by /summarize"""
+    sections = {"summary": []}
+    current = "summary"
+    for line in text.split("\n"):
+        section = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+
+    conclusions = "\n".join(sections.get("conclusions", [])).strip()
+    return Summary(
+        summary="\n".join(sections["summary"]).strip(),
+        references=_items(sections.get("references", [])),
+        examples=_items(sections.get("examples", [])),
+        conclusions=conclusions or None,
+    ).model_dump()
+
 
 class SummarizeAIClient(AIClient):
     async def summarize_text(self, content: str, options: SummaryOptions) -> dict:
         instructions = summarize_template()
 
-        # Create a model per request (no global model that open and close (that cause the vercel error))
-        model = self.new_model()
+        result = await self.run_chain(instructions, self._summary_payload(content, options), Summary)
+
+        if not result:
+            return {"error": "No summary could be generated."}
+        return result.model_dump()
+
+    async def summarize_documents(self, documents: List[List[str]], options: SummaryOptions) -> dict:
+        """Summarize per-page document lists, using map-reduce when they exceed one chunk"""
+        content = await self._prepare_content(chunk_documents(documents, settings.SUMMARY_CHUNK_TOKENS), options)
+        return await self.summarize_text(content, options)
+
+    async def stream_summary(self, documents: List[List[str]], options: SummaryOptions) -> AsyncIterator[dict]:
+        """
+        Events for a streamed summary: `progress` while large documents are reduced,
+        `token` for each text fragment of the final summary and `done` with the summary in the
+        structured shape of `summarize_text` (parsed from the streamed text).
+        """
+        chunks = chunk_documents(documents, settings.SUMMARY_CHUNK_TOKENS)
+        if len(chunks) > 1:
+            yield {"event": "progress", "data": {"stage": "map_reduce", "chunks": len(chunks)}}
+        content = await self._prepare_content(chunks, options)
+
+        parts = []
+        async for text in self.stream_chain(stream_summary_template(), self._summary_payload(content, options)):
+            parts.append(text)
+            yield {"event": "token", "data": {"text": text}}
+        yield {"event": "done", "data": {"summary": parse_summary_text("".join(parts))}}
+
+    async def _prepare_content(self, chunks: List[str], options: SummaryOptions) -> str:
+        """The content for the final summary call: the document itself, or map-reduced notes"""
+        if len(chunks) <= 1:
+            return chunks[0] if chunks else ""
+
+        max_tokens = settings.SUMMARY_CHUNK_TOKENS
+        # Notes per chunk are kept small enough that several of them fit in one reduce call
+        max_words = max(max_tokens // 8, 200)
+
+        async def summarize_chunk(chunk: str, part: int, total_parts: int) -> str:
+            response = await self.run_chain(chunk_summary_template(), {
+                "content": chunk,
+                "part": part,
+                "total_parts": total_parts,
+                "language": options.language,
+                "max_words": max_words,
+            })
+            return message_text(response)
 
-        structured_llm = model.with_structured_output(Summary)
-        chain = instructions | structured_llm
-        result = await chain.ainvoke({
+        async def reduce_notes(notes: str) -> str:
+            response = await self.run_chain(reduce_summary_template(), {
+                "content": notes,
+                "language": options.language,
+                "max_words": max_words,
+            })
+            return message_text(response)
+
+        return await map_reduce(
+            chunks, summarize_chunk, reduce_notes, max_tokens, settings.SUMMARY_MAX_CONCURRENCY
+        )
+
+    def _summary_payload(self, content: str, options: SummaryOptions) -> dict:
+        return {
             "content": content,
             "character": options.character,
             "language_register": options.language_register,
@@ -21,8 +133,4 @@ class SummarizeAIClient(AIClient):
             "include_references": options.include_references,
             "include_examples": options.include_examples,
             "include_conclusions": options.include_conclusions
-        })
-
-        if not result:
-            return {"error": "No summary could be generated."}
-        return result.model_dump()
+        }
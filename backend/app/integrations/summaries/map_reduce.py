@@ -0,0 +1,118 @@
+from typing import Awaitable, Callable, List
+import asyncio
+
+# Rough Gemini ratio for mixed Spanish/English prose; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """Split a single oversized page on paragraph, then line, then hard character boundaries"""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return [text]
+
+    pieces = []
+    current = ""
+    for separator in ("\n\n", "\n"):
+        if separator in text:
+            for part in text.split(separator):
+                if len(part) > max_chars:
+                    if current:
+                        pieces.append(current)
+                        current = ""
+                    pieces.extend(split_text(part, max_tokens))
+                elif len(current) + len(separator) + len(part) > max_chars:
+                    pieces.append(current)
+                    current = part
+                else:
+                    current = f"{current}{separator}{part}" if current else part
+            if current:
+                pieces.append(current)
+            return pieces
+
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def chunk_documents(documents: List[List[str]], max_tokens: int) -> List[str]:
+    """
+    Pack the per-page lists from `extract_file_contents` into chunks of at most `max_tokens`,
+    never splitting a page unless the page alone exceeds the budget. Page order is preserved.
+    """
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for pages in documents:
+        for page in pages:
+            if not page:
+                continue
+            for piece in split_text(page, max_tokens):
+                piece_tokens = estimate_tokens(piece)
+                if current and current_tokens + piece_tokens > max_tokens:
+                    chunks.append("\n\n".join(current))
+                    current, current_tokens = [], 0
+                current.append(piece)
+                current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def group_by_budget(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Consecutive groups of texts whose combined size fits in `max_tokens`. Every group but the last
+    holds at least 2 texts, even past the budget, so each reduce level at least halves the count.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if len(current) >= 2 and current_tokens + tokens > max_tokens:
+            groups.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def map_reduce(
+    chunks: List[str],
+    summarize_chunk: Callable[[str, int, int], Awaitable[str]],
+    reduce_notes: Callable[[str], Awaitable[str]],
+    max_tokens: int,
+    max_concurrency: int,
+) -> str:
+    """
+    Summarize chunks concurrently, then merge the notes level by level until they fit in
+    a single `max_tokens` window. Every level runs concurrently, so latency grows with the
+    depth of the reduction tree (logarithmic in document length), not with the page count.
+    Every level at least halves the number of notes, so the loop always ends.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(work: Awaitable[str]) -> str:
+        async with semaphore:
+            return await work
+
+    total = len(chunks)
+    notes = await asyncio.gather(*(
+        bounded(summarize_chunk(chunk, index + 1, total)) for index, chunk in enumerate(chunks)
+    ))
+
+    levels = 0
+    while len(notes) > 1 and sum(estimate_tokens(note) for note in notes) > max_tokens:
+        groups = group_by_budget(list(notes), max_tokens)
+        notes = await asyncio.gather(*(bounded(reduce_notes("\n\n".join(group))) for group in groups))
+        levels += 1
+
+    merged = "\n\n".join(notes)
+    print(f"[INFO] Map-reduce summary: {total} chunks, {levels} reduce levels, ~{estimate_tokens(merged)} tokens of notes")
+    return merged
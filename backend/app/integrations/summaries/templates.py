@@ -1,7 +1,6 @@
 from langchain_core.prompts import PromptTemplate
 
-def summarize_template():
-    return PromptTemplate.from_template("""
+SUMMARY_PROMPT = """
     You are an expert AI assistant specialized in summarizing documents.
     Given the following document content, your task is to generate summary that captures the main points and key information.
     The summary should be written in {language} with a {language_register} tone and a {character} style.
@@ -12,4 +11,43 @@ def summarize_template():
     - If {include_conclusions} is true, add a conclusion section summarizing the overall insights.
     Content:
     {content}
+    """
+
+# Streamed summaries are plain text (readable token by token); these headings let the finished
+# text be split into the same fields as the structured Summary
+SUMMARY_SECTION_HEADINGS = {"references": "### References", "examples": "### Examples", "conclusions": "### Conclusions"}
+
+STREAM_OUTPUT_FORMAT = """    ### OUTPUT FORMAT:
+    Write the summary as plain text, with no heading before it. Put each additional section that applies
+    after it, under exactly one of these headings: "### References", "### Examples", "### Conclusions".
+    Write references and examples as one "- " bullet per line.
+"""
+
+def summarize_template():
+    return PromptTemplate.from_template(SUMMARY_PROMPT)
+
+def stream_summary_template():
+    """summarize_template for streamed text: same instructions, sections under fixed headings"""
+    return PromptTemplate.from_template(SUMMARY_PROMPT.replace("    Content:\n", STREAM_OUTPUT_FORMAT + "    Content:\n"))
+
+def chunk_summary_template():
+    return PromptTemplate.from_template("""
+    You are an expert AI assistant specialized in summarizing documents.
+    The following text is part {part} of {total_parts} of a larger document.
+    Write dense notes in {language} that capture every main point, definition, key figure and example of this part.
+    Do not add introductions or conclusions, and do not mention that this is a part of a document.
+    Keep the notes under {max_words} words.
+    Content:
+    {content}
+    """)
+
+def reduce_summary_template():
+    return PromptTemplate.from_template("""
+    You are an expert AI assistant specialized in summarizing documents.
+    The following are consecutive notes taken from different parts of the same document.
+    Merge them into a single set of notes in {language}, keeping the original order of ideas,
+    removing repetitions and preserving every main point, definition, key figure and example.
+    Keep the merged notes under {max_words} words.
+    Notes:
+    {content}
     """)
@@ -0,0 +1,66 @@
+import time
+
+import anyio
+
+from app.core.settings import get_settings
+from app.integrations.document_index import document_indexes
+from app.integrations.summaries.map_reduce import estimate_tokens
+
+settings = get_settings()
+
+# How much a topic outweighs the document's overall salience in topic-grounded selection
+TOPIC_QUERY_WEIGHT = 10.0
+
+
+def prompt_tokens(instructions, payload: dict) -> int:
+    """Estimated input tokens of `instructions` rendered with `payload`"""
+    template = getattr(instructions, "template", "")
+    return estimate_tokens(template) + sum(estimate_tokens(str(value)) for value in payload.values())
+
+
+def content_budget(items: int) -> int:
+    """Prompt budget for an artifact limited to `items` results (flashcards, exercises...)"""
+    return min(
+        settings.CONTENT_BUDGET_MAX_TOKENS,
+        settings.CONTENT_BUDGET_BASE_TOKENS + settings.CONTENT_BUDGET_PER_ITEM_TOKENS * max(items, 1),
+    )
+
+
+def fit_content(content: str, budget_tokens: int, query: str = "", query_weight: float = 1.0) -> str:
+    """`content` itself when it fits the budget, otherwise its best ranked passages in document order"""
+    content_tokens = estimate_tokens(content)
+    if not settings.CONTENT_BUDGET_ENABLED or content_tokens <= budget_tokens:
+        return content
+
+    started = time.perf_counter()
+    index = document_indexes.get(content)
+    selected = index.select(budget_tokens, query, query_weight)
+    reduced = index.text(selected)
+    print(
+        f"[INFO] Content reduced from ~{content_tokens} to ~{estimate_tokens(reduced)} tokens "
+        f"({len(selected)}/{len(index.passages)} passages, {(time.perf_counter() - started) * 1000:.0f} ms)"
+    )
+    return reduced
+
+
+def prompt_content_budget(instructions, payload: dict, items: int) -> int:
+    """Tokens left for `content` once the rest of the prompt is counted against `content_budget(items)`"""
+    overhead = prompt_tokens(instructions, {key: value for key, value in payload.items() if key != "content"})
+    return max(content_budget(items) - overhead, settings.CONTENT_PASSAGE_TOKENS)
+
+
+async def fit_prompt(instructions, payload: dict, items: int, query: str = "", query_weight: float = 1.0) -> dict:
+    """Payload whose `content` has been fitted so the whole prompt stays within `content_budget(items)`"""
+    budget = prompt_content_budget(instructions, payload, items)
+    if estimate_tokens(payload["content"]) <= budget:
+        return payload
+    # Ranking a large document takes a few hundred ms: keep it off the event loop
+    content = await anyio.to_thread.run_sync(fit_content, payload["content"], budget, query, query_weight)
+    return {**payload, "content": content}
+
+
+async def retrieve(content: str, query: str, budget_tokens: int) -> str:
+    """The passages of `content` most relevant to `query` that fit in `budget_tokens`"""
+    if estimate_tokens(content) <= budget_tokens:
+        return content
+    return await anyio.to_thread.run_sync(fit_content, content, budget_tokens, query, TOPIC_QUERY_WEIGHT)
@@ -0,0 +1,225 @@
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+import asyncio
+import random
+import re
+import time
+
+from app.core.metrics import LLM_RETRIES
+
+# 429 quota errors and 503 "model overloaded" both mean: send less, later
+THROTTLE_CODES = (429, 503)
+THROTTLE_MARKERS = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "overloaded", "Too Many Requests")
+RETRY_DELAY = re.compile(r"retryDelay['\"]?\s*:\s*['\"]?(\d+(?:\.\d+)?)s")
+
+
+class ModelLimits(NamedTuple):
+    requests_per_minute: int  # 0 = unlimited
+    tokens_per_minute: int  # 0 = unlimited
+    max_concurrency: int
+
+
+class TokenBucket:
+    """Refills continuously at `per_minute / 60` per second, holding at most one minute of budget."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def drain(self) -> None:
+        self.level = min(self.level, 0.0)
+
+
+class ModelLimiter:
+    """Concurrency, RPM and TPM budget of one model, plus its shared throttling backoff."""
+
+    def __init__(self, limits: ModelLimits):
+        self.limits = limits
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.slots = asyncio.Semaphore(max(1, limits.max_concurrency))
+        # Only the caller at the head of the queue waits for budget, so callers are admitted in order
+        self.turn = asyncio.Lock()
+        self.paused_until = 0.0
+        self.consecutive_throttles = 0
+        self.waiting = 0
+        self.active = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    async def acquire(self, tokens: int) -> None:
+        self.waiting += 1
+        started = time.monotonic()
+        try:
+            await self.slots.acquire()
+            try:
+                async with self.turn:
+                    while True:
+                        now = time.monotonic()
+                        delay = self.paused_until - now
+                        if self.requests:
+                            delay = max(delay, self.requests.wait_time(1, now))
+                        if self.tokens:
+                            delay = max(delay, self.tokens.wait_time(tokens, now))
+                        if delay <= 0:
+                            break
+                        await asyncio.sleep(delay)
+                    if self.requests:
+                        self.requests.take(1)
+                    if self.tokens:
+                        self.tokens.take(tokens)
+            except BaseException:
+                self.slots.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        self.wait_seconds += time.monotonic() - started
+
+    def release(self) -> None:
+        self.active -= 1
+        self.slots.release()
+
+    def backoff(self, base_delay: float, max_delay: float, retry_after: Optional[float]) -> float:
+        """Pause every caller of this model; returns the pause in seconds"""
+        now = time.monotonic()
+        self.throttled += 1
+        # Throttles that arrive during an ongoing pause come from the same burst: do not escalate
+        if now >= self.paused_until:
+            self.consecutive_throttles += 1
+        delay = min(max_delay, base_delay * 2 ** (self.consecutive_throttles - 1))
+        # Equal jitter: waiters do not all resume in the same instant
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.paused_until = max(self.paused_until, now + delay)
+        # Restart from an empty bucket so traffic ramps back up instead of bursting
+        if self.requests:
+            self.requests.drain()
+        return self.paused_until - now
+
+    def succeeded(self) -> None:
+        self.consecutive_throttles = 0
+
+    def stats(self) -> dict:
+        return {
+            "requests_per_minute": self.limits.requests_per_minute,
+            "tokens_per_minute": self.limits.tokens_per_minute,
+            "max_concurrency": self.limits.max_concurrency,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+            "avg_wait_seconds": round(self.wait_seconds / self.admitted, 4) if self.admitted else 0.0,
+        }
+
+
+class UpstreamScheduler:
+    """
+    Admits upstream calls per model within their RPM/TPM/concurrency budget, in arrival order,
+    and owns retries: a throttled call pauses every caller of that model (jittered exponential
+    backoff, honouring the server's retryDelay) instead of each client retrying on its own.
+    """
+
+    def __init__(self, limits: Dict[str, ModelLimits], default_limits: ModelLimits,
+                 max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.limits = limits
+        self.default_limits = default_limits
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._limiters: Dict[str, ModelLimiter] = {}
+
+    def limiter(self, model_name: str) -> ModelLimiter:
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limiter = ModelLimiter(self.limits.get(model_name, self.default_limits))
+            self._limiters[model_name] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, model_name: str, tokens: int):
+        limiter = self.limiter(model_name)
+        await limiter.acquire(tokens)
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def should_retry(self, model_name: str, error: Exception, attempt: int) -> bool:
+        """Whether a failed call should be retried; throttling also pauses the model for everyone"""
+        if not is_throttling(error):
+            return False
+        delay = self.limiter(model_name).backoff(self.base_delay, self.max_delay, retry_after(error))
+        if attempt >= self.max_attempts:
+            print(f"[ERROR] {model_name} throttled, giving up after {attempt} attempts")
+            return False
+        print(f"[WARNING] {model_name} throttled (attempt {attempt}/{self.max_attempts}), pausing {delay:.1f}s")
+        LLM_RETRIES.labels(model_name).inc()
+        return True
+
+    def succeeded(self, model_name: str) -> None:
+        self.limiter(model_name).succeeded()
+
+    async def run(self, model_name: str, tokens: int, call: Callable[[], Awaitable]):
+        attempt = 0
+        while True:
+            attempt += 1
+            async with self.slot(model_name, tokens):
+                try:
+                    result = await call()
+                except Exception as e:
+                    if self.should_retry(model_name, e, attempt):
+                        continue
+                    raise
+            self.succeeded(model_name)
+            return result
+
+    def stats(self) -> dict:
+        return {model_name: limiter.stats() for model_name, limiter in self._limiters.items()}
+
+
+def _error_chain(error: BaseException):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def is_throttling(error: BaseException) -> bool:
+    for link in _error_chain(error):
+        code = getattr(link, "code", None) or getattr(link, "status_code", None)
+        if code in THROTTLE_CODES:
+            return True
+        text = str(link)
+        if any(marker in text for marker in THROTTLE_MARKERS):
+            return True
+    return False
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """The retryDelay Gemini attaches to quota errors, in seconds"""
+    for link in _error_chain(error):
+        match = RETRY_DELAY.search(str(link))
+        if match:
+            return float(match.group(1))
+    return None
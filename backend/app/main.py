@@ -1,9 +1,43 @@
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.api.responses import FastJSONResponse
 from app.api.routes import router as api_router
+from app.core.metrics import MetricsMiddleware, metrics_endpoint, register_stats
+from app.core.settings import get_settings
+from app.core.tracing import TracingMiddleware, configure_tracing, shutdown_tracing
+from app.integrations.ai_client import inflight_requests, model_pool, response_cache, upstream_scheduler
+from app.integrations.document_index import document_indexes
+from app.infrastructure.files.extraction_cache import extraction_store, open_extraction_store
+from app.infrastructure.files.pdf_pool import shutdown_executor
+from app.services.artifact_service import artifact_store, purge_artifacts_periodically
+from app.services.job_service import job_queue
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models are created lazily inside the pool and closed here, on the same event loop
+    await model_pool.startup()
+    open_extraction_store()
+    await job_queue.start()
+    artifact_purge = asyncio.ensure_future(purge_artifacts_periodically())
+    yield
+    artifact_purge.cancel()
+    # Running jobs are requeued, so with the SQLite job backend they resume on the next start
+    await job_queue.stop()
+    await model_pool.shutdown()
+    shutdown_executor()
+    shutdown_tracing()
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Chrome IA System", version="1.0.0")
+    settings = get_settings()
+    app = FastAPI(
+        title="Chrome IA System",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse,
+    )
 
     # CORS settings
     app.add_middleware(
@@ -19,7 +53,26 @@ def create_app() -> FastAPI:
         return {"message": "Welcome to the Chrome IA System API"}
 
     app.include_router(api_router, prefix="/api")
+
+    # Prometheus scrape target: request/stage latency histograms, LLM calls and tokens, plus
+    # the counters of the caches, pools and queues sampled at scrape time
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+    register_stats({
+        "response_cache": response_cache.stats,
+        "extraction_cache": extraction_store.stats,
+        "document_indexes": document_indexes.stats,
+        "single_flight": inflight_requests.stats,
+        "model_pool": model_pool.stats,
+        "upstream": upstream_scheduler.stats,
+        "job_queue": job_queue.stats,
+        "artifacts": artifact_store.stats,
+    })
+
+    # Outermost, so the request span encloses everything else, streamed bodies included
+    configure_tracing(settings.TRACING_EXPORTER, settings.TRACING_FILE_PATH, settings.SLOW_REQUEST_THRESHOLD_SECONDS)
+    app.add_middleware(TracingMiddleware)
     
     return app
 
-app = create_app()
\ No newline at end of file
+app = create_app()
@@ -0,0 +1,72 @@
+from functools import partial
+from typing import List, Optional, Sequence
+import asyncio
+import time
+import uuid
+
+import anyio
+
+from app.core.settings import get_settings
+from app.infrastructure.artifacts.store import build_artifact_store
+
+settings = get_settings()
+
+artifact_store = build_artifact_store(
+    settings.ARTIFACT_STORE_BACKEND,
+    settings.ARTIFACT_STORE_PATH,
+    max_entries=settings.ARTIFACT_STORE_MAX_ENTRIES,
+    max_bytes=settings.ARTIFACT_STORE_MAX_BYTES,
+)
+
+
+# Encoding, compression and SQLite I/O run in worker threads: artifacts reach several MB
+async def save_artifact(
+    kind: str,
+    data,
+    document_ids: Sequence[str] = (),
+    owner: Optional[str] = None,
+    artifact_id: Optional[str] = None,
+) -> str:
+    """Persist a generated artifact under the IDs of the documents it was generated from; returns its ID"""
+    artifact_id = artifact_id or str(uuid.uuid4())
+    await anyio.to_thread.run_sync(
+        partial(artifact_store.put, artifact_id, kind, data, document_ids=document_ids, owner=owner)
+    )
+    return artifact_id
+
+
+async def get_artifact(artifact_id: str) -> Optional[dict]:
+    return await anyio.to_thread.run_sync(artifact_store.get, artifact_id)
+
+
+async def list_artifacts(
+    owner: Optional[str] = None,
+    kind: Optional[str] = None,
+    document_id: Optional[str] = None,
+    before: Optional[float] = None,
+    limit: int = 50,
+) -> List[dict]:
+    return await anyio.to_thread.run_sync(
+        partial(artifact_store.list, owner=owner, kind=kind, document_id=document_id, before=before, limit=limit)
+    )
+
+
+async def get_artifact_stats() -> dict:
+    return await anyio.to_thread.run_sync(artifact_store.stats)
+
+
+def purge_expired_artifacts() -> int:
+    if not settings.ARTIFACT_TTL_SECONDS:
+        return 0
+    return artifact_store.purge(time.time() - settings.ARTIFACT_TTL_SECONDS)
+
+
+async def purge_artifacts_periodically() -> None:
+    """Purge expired artifacts now and then every ARTIFACT_PURGE_INTERVAL_SECONDS; run as a task by the lifespan"""
+    while True:
+        purged = await anyio.to_thread.run_sync(purge_expired_artifacts)
+        if purged:
+            print(f"[INFO] Purged {purged} expired artifacts")
+        if not settings.ARTIFACT_TTL_SECONDS or not settings.ARTIFACT_PURGE_INTERVAL_SECONDS:
+            return
+        await asyncio.sleep(settings.ARTIFACT_PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,51 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Sequence
+import asyncio
+
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+Handler = Callable[[Any], Awaitable[Any]]
+
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def batch_slots() -> asyncio.Semaphore:
+    """BATCH_MAX_CONCURRENCY slots shared by every batch request, created on first use"""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    return _slots
+
+
+async def _run_item(index: int, item, handler: Handler) -> dict:
+    async with batch_slots():
+        try:
+            return {"index": index, "result": await handler(item), "error": None}
+        except Exception as e:
+            print(f"[ERROR] Batch item {index} failed: {e}")
+            return {"index": index, "result": None, "error": str(e)}
+
+
+async def stream_batch(items: Sequence, handler: Handler) -> AsyncIterator[dict]:
+    """
+    Run `handler` over every item, yielding {"index", "result", "error"} in completion order.
+    A failing item never fails the batch. At most BATCH_MAX_CONCURRENCY items run at a time
+    across all batch requests, so concurrent batches share the slots instead of multiplying them.
+    """
+    tasks = [asyncio.ensure_future(_run_item(index, item, handler)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The client went away mid-stream: stop the items that have not run yet
+        for task in tasks:
+            task.cancel()
+
+
+async def run_batch(items: Sequence, handler: Handler) -> List[dict]:
+    """Same as `stream_batch`, collected back into request order"""
+    results: List[dict] = [None] * len(items)
+    async for item_result in stream_batch(items, handler):
+        results[item_result["index"]] = item_result
+    return results
@@ -1,7 +1,11 @@
-from app.domain.exercises_models import ExerciseType
+from typing import List, Optional, Tuple
+from app.domain.exercises_models import ExerciseType, MixedExerciseStrategy
 from app.integrations.exercises.client import ExercisesAIClient
 
 ai_client = ExercisesAIClient()
 
-async def generate_exercises(content: str, exercises_count: int = 5, exercises_difficulty: str = "medium", exercises_types: ExerciseType = ExerciseType.multiple_choice):
-    return await ai_client.generate_exercises(content, exercises_count, exercises_difficulty, exercises_types)
\ No newline at end of file
+async def generate_exercises(content: str, exercises_count: int = 5, exercises_difficulty: str = "medium", exercises_types: ExerciseType = ExerciseType.multiple_choice, topic: Optional[str] = None):
+    return await ai_client.generate_exercises(content, exercises_count, exercises_difficulty, exercises_types, topic)
+
+async def generate_mixed_exercises(content: str, exercises: List[Tuple[ExerciseType, int]], exercises_difficulty: str = "medium", strategy: MixedExerciseStrategy = MixedExerciseStrategy.auto):
+    return await ai_client.generate_mixed_exercises(content, exercises, exercises_difficulty, strategy)
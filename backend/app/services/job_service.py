@@ -0,0 +1,46 @@
+from typing import List
+from app.core.settings import get_settings
+from app.domain.models import SummaryOptions
+from app.infrastructure.jobs.queue import JobQueue
+from app.infrastructure.jobs.store import build_job_store
+from app.services.learning_path_service import generate_learning_path
+from app.services.summarize_service import summarize_documents
+
+settings = get_settings()
+
+# Started/stopped by the FastAPI lifespan (see app.main)
+job_queue = JobQueue(
+    build_job_store(settings.JOB_BACKEND, settings.JOB_SQLITE_PATH),
+    workers=settings.JOB_WORKERS,
+    reserved_workers=settings.JOB_RESERVED_WORKERS,
+    result_ttl_seconds=settings.JOB_RESULT_TTL_SECONDS,
+)
+
+
+async def run_summary_job(payload: dict) -> dict:
+    summary = await summarize_documents(payload["documents"], SummaryOptions(**payload["options"]))
+    if "error" in summary:
+        raise RuntimeError(summary["error"])
+    return {"summary": summary}
+
+
+async def run_learning_path_job(payload: dict) -> dict:
+    learning_path = await generate_learning_path(content=payload["content"], **payload["options"])
+    if "error" in learning_path:
+        raise RuntimeError(learning_path["error"])
+    return {"learning_path": learning_path}
+
+
+job_queue.register("summary", run_summary_job)
+job_queue.register("learning_path", run_learning_path_job)
+
+
+async def submit_summary(documents: List[List[str]], options: SummaryOptions, priority: str = "high") -> dict:
+    return await job_queue.submit("summary", {"documents": documents, "options": options.model_dump()}, priority)
+
+
+async def submit_learning_path(content: str, options: dict, priority: str = None) -> dict:
+    if priority is None:
+        # Full content takes several long calls; keep it from crowding out quicker jobs
+        priority = "low" if options.get("generate_full_content") else "normal"
+    return await job_queue.submit("learning_path", {"content": content, "options": options}, priority)
@@ -1,7 +1,43 @@
+from typing import AsyncIterator, Optional, Sequence
+from functools import partial
+
+import anyio
+
 from app.integrations.learning_path.client import LearningPathAIClient
+from app.services.artifact_service import artifact_store
 
 ai_client = LearningPathAIClient()
 
+
+def session_options(options: dict) -> dict:
+    """What a session call needs to write content consistent with the rest of its path"""
+    keys = (
+        "language", "difficulty", "learning_approach", "language_register", "detail_level",
+        "flashcards_per_topic", "questions_per_topic", "generate_full_content",
+    )
+    return {key: options[key] for key in keys}
+
+
+def store_learning_path(
+    learning_path: dict, content: str, options: dict, document_ids: Sequence[str], owner: Optional[str]
+) -> None:
+    digest = artifact_store.put_source(content)
+    artifact_store.put(
+        learning_path["id"], "learning_path", {"learning_path": learning_path, "options": options},
+        document_ids=document_ids, source_hash=digest, owner=owner,
+    )
+
+
+async def save_learning_path(
+    learning_path: dict, content: str, options: dict, document_ids: Sequence[str], owner: Optional[str]
+) -> None:
+    """
+    Persist a path with the source text and options it was generated from, for later sessions.
+    In a worker thread: paths and source texts reach several MB to encode, compress and write.
+    """
+    await anyio.to_thread.run_sync(store_learning_path, learning_path, content, options, document_ids, owner)
+
+
 async def generate_learning_path(
     content: str,
     difficulty: str,
@@ -17,10 +53,12 @@ async def generate_learning_path(
     learning_approach: str = "balanced",
     language_register: str = "neutral",
     detail_level: str = "intermediate",
-    generate_full_content: bool = False
+    generate_full_content: bool = False,
+    document_ids: Sequence[str] = (),
+    owner: Optional[str] = None
 ) -> dict:
     """Generate a complete learning path from document content using AI"""
-    return await ai_client.generate_learning_path(
+    learning_path = await ai_client.generate_learning_path(
         content=content,
         difficulty=difficulty,
         total_duration=total_duration,
@@ -37,3 +75,99 @@ async def generate_learning_path(
         detail_level=detail_level,
         generate_full_content=generate_full_content
     )
+    if "error" not in learning_path:
+        await save_learning_path(learning_path, content, session_options(locals()), document_ids, owner)
+    return learning_path
+
+
+async def stream_learning_path(
+    content: str,
+    difficulty: str,
+    total_duration: str,
+    modules_count: int,
+    sessions_per_module: int,
+    topics_per_session: int,
+    flashcards_per_topic: int,
+    questions_per_topic: int,
+    include_theory: bool,
+    language: str,
+    auto_structure: bool = False,
+    learning_approach: str = "balanced",
+    language_register: str = "neutral",
+    detail_level: str = "intermediate",
+    generate_full_content: bool = False,
+    document_ids: Sequence[str] = (),
+    owner: Optional[str] = None
+) -> AsyncIterator[dict]:
+    """Stream a learning path as `module` / `done` events"""
+    options = session_options(locals())
+    async for event in ai_client.stream_learning_path(
+        content=content,
+        difficulty=difficulty,
+        total_duration=total_duration,
+        modules_count=modules_count,
+        sessions_per_module=sessions_per_module,
+        topics_per_session=topics_per_session,
+        flashcards_per_topic=flashcards_per_topic,
+        questions_per_topic=questions_per_topic,
+        include_theory=include_theory,
+        language=language,
+        auto_structure=auto_structure,
+        learning_approach=learning_approach,
+        language_register=language_register,
+        detail_level=detail_level,
+        generate_full_content=generate_full_content
+    ):
+        if event["event"] == "done":
+            await save_learning_path(event["data"]["learning_path"], content, options, document_ids, owner)
+        yield event
+
+
+async def get_learning_path(learning_path_id: str) -> Optional[dict]:
+    artifact = await anyio.to_thread.run_sync(artifact_store.get, learning_path_id)
+    if artifact is None or artifact["kind"] != "learning_path":
+        return None
+    return artifact["data"]["learning_path"]
+
+
+async def get_session(learning_path_id: str, session_id: str) -> Optional[dict]:
+    """
+    A session of a stored learning path, with its full content. Sessions without content (paths
+    created with structure only, or modules whose call failed in a full-content path, marked
+    `contentGenerated: False`) are generated on first access, then kept in the store.
+    None for an unknown path/session.
+    """
+    artifact = await anyio.to_thread.run_sync(artifact_store.get, learning_path_id)
+    if artifact is None or artifact["kind"] != "learning_path":
+        return None
+    entry = artifact["data"]
+    learning_path = entry["learning_path"]
+    located = ai_client.find_session(learning_path, session_id)
+    if located is None:
+        return None
+    _, session = located
+    # Sessions without the flag carry whatever the path was asked for
+    if session.get("contentGenerated", entry["options"].get("generate_full_content", False)):
+        return session
+
+    content = await anyio.to_thread.run_sync(artifact_store.source, artifact["source_hash"])
+    if content is None:
+        return {"error": "The source documents of this learning path are no longer stored; generate it again"}
+
+    generated = await ai_client.generate_session(content, learning_path, session_id, entry["options"])
+    if generated is None or "error" in generated:
+        return generated
+    generated["contentGenerated"] = True
+
+    await anyio.to_thread.run_sync(artifact_store.modify, learning_path_id, partial(with_session, session_id, generated))
+    return generated
+
+
+def with_session(session_id: str, generated: dict, entry: dict) -> dict:
+    # Applied under the store's lock to the latest stored path, so sessions generated concurrently are all kept
+    for module in entry["learning_path"].get("modules", []):
+        sessions = module.get("sessions", [])
+        for index, stored in enumerate(sessions):
+            if isinstance(stored, dict) and stored.get("id") == session_id:
+                sessions[index] = generated
+    return entry
@@ -1,7 +1,14 @@
+from typing import List
 from app.integrations.summaries.client import SummarizeAIClient
 from app.domain.models import SummaryOptions
 
 ai_client = SummarizeAIClient()
 
 async def summarize_content(content: str, options: SummaryOptions):
-    return await ai_client.summarize_text(content, options)
\ No newline at end of file
+    return await ai_client.summarize_text(content, options)
+
+async def summarize_documents(documents: List[List[str]], options: SummaryOptions):
+    return await ai_client.summarize_documents(documents, options)
+
+def stream_summary(documents: List[List[str]], options: SummaryOptions):
+    return ai_client.stream_summary(documents, options)
@@ -0,0 +1,187 @@
+"""
+Extraction speed and memory over a generated corpus, stored as JSON to track regressions.
+
+Builds PDFs (text-heavy, table-heavy, scanned pages without a text layer) and DOCX files
+(text-heavy, table-heavy) of each size in `--pages`, caches them under `--corpus-dir`, and
+times `extract_pdf_content` / `extract_docx_content` on each one. Every file is extracted in
+a fresh process so its peak RSS is its own. Results go to `--output`; with `--compare` the
+run is checked against an earlier result file and slowdowns above `--tolerance` are flagged.
+
+    python -m benchmarks.bench_extraction --pages 1 10 100 1000
+    python -m benchmarks.bench_extraction --pages 1 10 100 --compare latest
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks import corpus
+
+GENERATORS = {
+    ("pdf", "text"): corpus.text_pdf,
+    ("pdf", "table"): corpus.table_pdf,
+    ("pdf", "scanned"): corpus.scanned_pdf,
+    ("docx", "text"): corpus.text_docx,
+    ("docx", "table"): corpus.table_docx,
+}
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def corpus_file(corpus_dir: str, file_format: str, kind: str, pages: int) -> str:
+    """Path of a corpus file, generated on first use (generation is deterministic)"""
+    path = os.path.join(corpus_dir, f"{kind}-{pages}.{file_format}")
+    if not os.path.exists(path):
+        os.makedirs(corpus_dir, exist_ok=True)
+        data = GENERATORS[(file_format, kind)](pages)
+        with open(path + ".tmp", "wb") as output:
+            output.write(data)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def measure(path: str, repeat: int, time_budget: float) -> dict:
+    """Runs in a fresh process: per-run latency, extracted size and peak RSS of this file alone"""
+    from app.infrastructure.files.file_manager import extract_docx_content, extract_pdf_content
+
+    extract = extract_pdf_content if path.endswith(".pdf") else extract_docx_content
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = []
+    spent = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = extract(path, os.path.basename(path))
+        latencies.append(time.perf_counter() - start)
+        spent += latencies[-1]
+        if spent > time_budget:
+            break
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "latencies_ms": [round(latency * 1000, 1) for latency in latencies],
+        "chars": sum(len(page) for page in pages),
+        "error": pages[-1] if pages and pages[-1].startswith("Error processing") else None,
+        "peak_rss_mb": round(peak_rss / 1024, 1),
+        "extraction_rss_mb": round((peak_rss - baseline_rss) / 1024, 1),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def load_previous(compare: str, output: str) -> dict:
+    if compare != "latest":
+        with open(compare) as previous:
+            return json.load(previous)
+    earlier = sorted(path for path in glob.glob(os.path.join(RESULTS_DIR, "extraction-*.json")) if path != output)
+    if not earlier:
+        return {}
+    with open(earlier[-1]) as previous:
+        return json.load(previous)
+
+
+def report_regressions(cases: list, previous: dict, tolerance: float, min_delta_ms: float) -> int:
+    before = {case["name"]: case for case in previous.get("cases", [])}
+    regressions = 0
+    print(f"\ncompared with {previous.get('commit', '?')} ({previous.get('timestamp', '?')}):")
+    for case in cases:
+        old = before.get(case["name"])
+        if not old or not old["best_ms"]:
+            continue
+        change = case["best_ms"] / old["best_ms"] - 1
+        flag = ""
+        # Tiny files vary by a few ms from run to run: only flag slowdowns that also matter in absolute terms
+        if change > tolerance and case["best_ms"] - old["best_ms"] > min_delta_ms:
+            flag = "  <-- REGRESSION"
+            regressions += 1
+        print(f"  {case['name']:<20} {old['best_ms']:>10.1f} -> {case['best_ms']:>10.1f} ms  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(args):
+    # Settings are read on import by the extraction modules
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+    os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+
+    formats = [key for key in GENERATORS if key[0] in args.formats and key[1] in args.kinds]
+    cases = []
+    print(f"{'file':<20} | {'size KiB':>9} | {'best ms':>10} | {'pages/s':>9} | {'chars':>10} | {'peak RSS MB':>11} | {'extract MB':>10}")
+    context = multiprocessing.get_context("spawn")
+    for pages in args.pages:
+        for file_format, kind in formats:
+            path = corpus_file(args.corpus_dir, file_format, kind, pages)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(measure, path, args.repeat, args.time_budget).result()
+
+            best_ms = min(result["latencies_ms"])
+            case = {
+                "name": f"{kind}-{pages}.{file_format}",
+                "format": file_format,
+                "kind": kind,
+                "pages": pages,
+                "size_kib": round(os.path.getsize(path) / 1024, 1),
+                "best_ms": best_ms,
+                "pages_per_second": round(pages / (best_ms / 1000), 1) if best_ms else None,
+                **result,
+            }
+            cases.append(case)
+            print(
+                f"{case['name']:<20} | {case['size_kib']:>9.1f} | {best_ms:>10.1f} | {case['pages_per_second'] or 0:>9.1f} | "
+                f"{case['chars']:>10} | {case['peak_rss_mb']:>11.1f} | {case['extraction_rss_mb']:>10.1f}"
+                + (f"  {case['error']}" if case["error"] else "")
+            )
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(RESULTS_DIR, f"extraction-{timestamp}.json")
+    results = {
+        "timestamp": timestamp,
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "config": vars(args),
+        "cases": cases,
+    }
+
+    regressions = 0
+    if args.compare:
+        previous = load_previous(args.compare, output)
+        if previous:
+            regressions = report_regressions(cases, previous, args.tolerance, args.min_delta_ms)
+        else:
+            print("\nno earlier results to compare with")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as result_file:
+        json.dump(results, result_file, indent=2)
+    print(f"\nresults written to {output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"], choices=["pdf", "docx"])
+    parser.add_argument("--kinds", nargs="+", default=["text", "table", "scanned"], choices=["text", "table", "scanned"])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per file (best is reported)")
+    parser.add_argument("--time-budget", type=float, default=30.0, help="stop repeating a file after this many seconds")
+    parser.add_argument("--corpus-dir", default=os.path.join(".cache", "bench-corpus"))
+    parser.add_argument("--output", help=f"result file (default: {RESULTS_DIR}/extraction-<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result file, or 'latest' for the newest one in the results directory")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="slowdown flagged as a regression (0.10 = 10%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="ignore slowdowns smaller than this")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Parse time and recovery rate of `parse_model_json` against the regex clean-up pipeline it replaced.
+
+"recovered" is the number of modules that came back out of each response; the legacy
+pipeline raises (0 modules) on anything its regexes do not repair.
+
+    python -m benchmarks.bench_json_parser --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import json
+import re
+import time
+
+from app.integrations.json_stream import JSONStreamParser, parse_model_json
+from benchmarks.json_corpus import corpus
+
+
+def legacy_parse(json_str: str):
+    """The clean_json + raw_decode/json.loads/regex fallback chain from the learning-path client"""
+    json_str = re.sub(r'```json\s*', '', json_str)
+    json_str = re.sub(r'```\s*$', '', json_str)
+    json_str = json_str.strip()
+
+    def fix_value_quotes(match):
+        value = match.group(2)
+        value = value.replace('\\"', '___ALREADY_ESCAPED___')
+        value = value.replace('"', '\\"')
+        value = value.replace('___ALREADY_ESCAPED___', '\\"')
+        return f'"{match.group(1)}": "{value}"'
+
+    pattern = r'"(content|question|answer|title|description)"\s*:\s*"((?:[^"\\]|\\.)*)(?<!\\)"'
+    json_str = re.sub(pattern, fix_value_quotes, json_str)
+
+    try:
+        return json.JSONDecoder().raw_decode(json_str)[0]
+    except json.JSONDecodeError:
+        try:
+            return json.loads(json_str)
+        except json.JSONDecodeError:
+            match = re.search(r'\[.*\]', json_str, re.DOTALL)
+            if match:
+                return json.loads(match.group(0))
+            raise
+
+
+def recovered(result) -> int:
+    if isinstance(result, dict) and isinstance(result.get("modules"), list):
+        return len(result["modules"])
+    return 0
+
+
+def measure(parse, text: str, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = parse(text)
+        except (json.JSONDecodeError, ValueError):
+            result = None
+        best = min(best, time.perf_counter() - start)
+    return best, recovered(result)
+
+
+def streamed(text: str, chunk_size: int = 256):
+    """Feed the response in stream-sized chunks, as `stream_learning_path` does"""
+    parser = JSONStreamParser(watch=[("modules", "*")])
+    for i in range(0, len(text), chunk_size):
+        parser.feed(text[i:i + chunk_size])
+    return parser.close()
+
+
+def main(args):
+    print(f"{'size':>9} {'malformation':>17} | {'legacy ms':>9} {'mods':>4} | {'parser ms':>9} {'mods':>4} | {'streamed ms':>11}")
+    for size, kind, text in corpus(tuple(args.sizes)):
+        legacy_time, legacy_modules = measure(legacy_parse, text, args.repeat)
+        parser_time, parser_modules = measure(parse_model_json, text, args.repeat)
+        stream_time, _ = measure(streamed, text, args.repeat)
+        print(
+            f"{len(text):>9} {kind:>17} | {legacy_time * 1000:9.2f} {legacy_modules:4d} |"
+            f" {parser_time * 1000:9.2f} {parser_modules:4d} | {stream_time * 1000:11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,84 @@
+"""
+Per-request overhead of building a ChatGoogleGenerativeAI per call vs. reusing a pooled one.
+
+Runs against the local stub server, so the numbers are pure client overhead
+(construction, transport setup, TCP connection) plus a fixed stub latency.
+
+    python -m benchmarks.bench_model_pool --requests 200 --concurrency 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from app.integrations.model_pool import ModelPool
+from benchmarks.stub_server import start_stub_server
+
+MODEL = "gemini-2.5-flash"
+
+
+def build_model(base_url: str, **options) -> ChatGoogleGenerativeAI:
+    return ChatGoogleGenerativeAI(model=MODEL, api_key="benchmark", base_url=base_url, max_retries=0, **options)
+
+
+async def run(label: str, get_model, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            model = get_model()
+            await model.ainvoke("ping")
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": label,
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+    }
+
+
+async def main(args):
+    server, base_url = start_stub_server(latency=args.latency_ms / 1000)
+
+    try:
+        per_request = await run(
+            "new_model() per request", lambda: build_model(base_url), args.requests, args.concurrency
+        )
+        connections_per_request = server.RequestHandlerClass.connections
+
+        pool = ModelPool(factory=lambda **kwargs: ChatGoogleGenerativeAI(base_url=base_url, **kwargs))
+        await pool.startup()
+        server.RequestHandlerClass.connections = 0
+        pooled = await run(
+            "pooled", lambda: pool.get(MODEL, "benchmark", 0), args.requests, args.concurrency
+        )
+        connections_pooled = server.RequestHandlerClass.connections
+        await pool.shutdown()
+    finally:
+        server.shutdown()
+
+    per_request["tcp_connections"] = connections_per_request
+    pooled["tcp_connections"] = connections_pooled
+    for result in (per_request, pooled):
+        print(result)
+    print(f"overhead saved per request (p50): {per_request['p50_ms'] - pooled['p50_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="artificial stub latency")
+    asyncio.run(main(parser.parse_args()))
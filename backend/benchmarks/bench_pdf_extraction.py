@@ -0,0 +1,57 @@
+"""
+Scaling of PDF extraction across worker processes.
+
+Compares the single-threaded `extract_pdf_content` with `extract_pdf_parallel`
+for several pool sizes over a synthetic multi-hundred-page PDF.
+
+    python -m benchmarks.bench_pdf_extraction --pages 300 --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from app.infrastructure.files import pdf_pool
+from app.infrastructure.files.file_manager import extract_pdf_content
+from benchmarks.corpus import text_pdf
+
+
+async def run_parallel(pdf: bytes, workers: int, repeat: int) -> float:
+    pdf_pool.shutdown_executor()
+    pdf_pool.settings.PDF_WORKERS = workers
+    # Warm the pool so process start-up is not billed to the first request
+    await pdf_pool.extract_pdf_parallel(text_pdf(1), "warmup.pdf")
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages = await pdf_pool.extract_pdf_parallel(pdf, "bench.pdf")
+        best = min(best, time.perf_counter() - start)
+    assert len(pages) > 1 and not pages[-1].startswith("Error"), pages[-1]
+    return best
+
+
+async def main(args):
+    pdf = text_pdf(args.pages)
+    print(f"synthetic PDF: {args.pages} pages, {len(pdf) / 1024:.0f} KiB, {os.cpu_count()} CPUs")
+
+    start = time.perf_counter()
+    extract_pdf_content(pdf, "bench.pdf")
+    baseline = time.perf_counter() - start
+    print(f"{'single thread':>16}: {baseline:7.2f} s  {args.pages / baseline:8.1f} pages/s")
+
+    for workers in args.workers:
+        elapsed = await run_parallel(pdf, workers, args.repeat)
+        print(
+            f"{f'{workers} workers':>16}: {elapsed:7.2f} s  {args.pages / elapsed:8.1f} pages/s"
+            f"  speedup x{baseline / elapsed:.2f}"
+        )
+    pdf_pool.shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,53 @@
+"""
+Time and savings of the document preprocessing run before prompting (app.infrastructure.files.preprocessing).
+
+Pages come from `corpus.book_pages` (running header/footer, hyphenated line breaks, whitespace
+runs, repeated boilerplate and duplicated pages) and, for comparison, from the text PDF pages
+of the extraction benchmark, which have none of these except a chapter heading.
+
+    python -m benchmarks.bench_preprocessing --pages 10 100 1000
+"""
+import argparse
+import os
+import time
+
+# Settings are read on import by app.infrastructure.files.file_manager
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+
+from benchmarks import corpus
+from app.infrastructure.files.preprocessing import preprocess_documents
+
+
+def pdf_text_pages(page_count: int) -> list:
+    rng = corpus.random.Random(0)
+    return ["\n".join(corpus.text_page_lines(rng, number)) for number in range(page_count)]
+
+
+def main(args):
+    print(
+        f"{'corpus':<10} {'pages':>6} | {'chars in':>10} | {'chars out':>10} | {'saved':>7} | {'tokens saved':>12} | "
+        f"{'running':>7} | {'hyphens':>7} | {'dup pages':>9} | {'dup paras':>9} | {'ms':>8}"
+    )
+    for pages in args.pages:
+        for name, generate in (("book", corpus.book_pages), ("pdf-text", pdf_text_pages)):
+            documents = [generate(pages)]
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                _, report = preprocess_documents(documents)
+                best = min(best, time.perf_counter() - start)
+            print(
+                f"{name:<10} {pages:>6} | {report['chars_before']:>10} | {report['chars_after']:>10} | "
+                f"{report['saved_ratio']:>7.1%} | {report['tokens_saved']:>12} | {report['running_lines']:>7} | "
+                f"{report['hyphenations']:>7} | {report['duplicate_pages']:>9} | {report['duplicate_paragraphs']:>9} | "
+                f"{best * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
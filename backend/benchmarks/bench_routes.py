@@ -0,0 +1,222 @@
+"""
+Load test of every route in app/api against a local mock of Gemini: no network, no API key.
+
+The real ChatGoogleGenerativeAI client is pointed at the stub server (benchmarks.stub_server),
+running in its own process with configurable latency, output token throughput, 429/500 rates
+and malformed JSON. Each route is then driven in-process (ASGI) with `--concurrency` requests
+in flight, and throughput, p50/p95/p99 latency, status codes and memory are reported per route.
+The response cache is disabled; identical in-flight requests are still coalesced as they are
+in production, and the stub's request counts show how many calls actually reached it.
+
+    python -m benchmarks.bench_routes --requests 40 --concurrency 8 --latency-ms 200
+    python -m benchmarks.bench_routes --routes flashcard learning-path --throttle-rate 0.1 --json results.json
+"""
+from collections import Counter
+from functools import partial
+import argparse
+import asyncio
+import json
+import os
+import resource
+import time
+import urllib.request
+
+from benchmarks.corpus import text_pdf
+from benchmarks.stub_server import start_stub_process
+
+TOPIC = "gradient descent"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+async def chain_ids(client, document_id: str) -> dict:
+    """IDs for the /{id} routes, taken from the responses of the calls that create them"""
+    docs = {"document_ids": [document_id]}
+    job_id = (await client.post("/api/jobs/summary", data=docs)).json()["job_id"]
+    # Read the events to the end so /result and /events are driven against a finished job
+    await client.get(f"/api/jobs/{job_id}/events")
+    cancel_id = (await client.post("/api/jobs/learning-path", data=docs)).json()["job_id"]
+    learning_path = (await client.post("/api/learning-path/generate", data=docs)).json()["learning_path"]
+    artifact_id = (await client.post("/api/flashcard/by_topic", json={"topic": TOPIC})).json()["artifact_id"]
+    return {
+        "job": job_id,
+        "cancel_job": cancel_id,
+        "learning_path": learning_path["id"],
+        "session": learning_path["modules"][0]["sessions"][0]["id"],
+        "artifact": artifact_id,
+    }
+
+
+def scenarios(document_id: str, pdf: bytes, ids: dict) -> list:
+    """(name, method, path, httpx request options) for every route"""
+    docs = {"document_ids": [document_id]}
+    roadmap = {"topic": TOPIC, "complexity_level": "beginner", "duration": "4 weeks", "include_resources": True}
+    return [
+        ("home", "GET", "/", {}),
+        ("documents upload", "POST", "/api/documents/", {"files": [("files", ("bench.pdf", pdf, "application/pdf"))]}),
+        ("documents get", "GET", f"/api/documents/{document_id}", {}),
+        ("documents stats", "GET", "/api/documents/stats", {}),
+        ("cache stats", "GET", "/api/cache/stats", {}),
+        ("summarize", "POST", "/api/summarize/", {"data": docs}),
+        ("summarize stream", "POST", "/api/summarize/stream", {"data": docs}),
+        ("flashcard", "POST", "/api/flashcard/", {"data": docs}),
+        ("flashcard upload", "POST", "/api/flashcard/", {"files": [("files", ("bench.pdf", pdf, "application/pdf"))]}),
+        ("flashcard by_topic", "POST", "/api/flashcard/by_topic", {"json": {"topic": TOPIC}}),
+        ("flashcard batch", "POST", "/api/flashcard/by_topic/batch", {"json": {"items": [{"topic": TOPIC}] * 4}}),
+        ("exercises", "POST", "/api/generate-exercises/", {"data": docs}),
+        ("exercises by_topic", "POST", "/api/generate-exercises/by_topic", {"json": {"topic": TOPIC}}),
+        ("exercises batch", "POST", "/api/generate-exercises/by_topic/batch", {"json": {"items": [{"topic": TOPIC}] * 4}}),
+        ("exercises mixed", "POST", "/api/generate-exercises/mixed",
+         {"data": {**docs, "exercises_types": ["multiple_choice", "true_false", "matching"]}}),
+        ("exercises mixed by_topic", "POST", "/api/generate-exercises/mixed/by_topic",
+         {"json": {"topic": TOPIC, "exercises": [{"type": "multiple_choice", "count": 3}, {"type": "short_answer", "count": 2}]}}),
+        ("games", "POST", "/api/games/", {"json": {"topic": TOPIC}}),
+        ("games batch", "POST", "/api/games/batch", {"json": {"items": [{"topic": TOPIC}, {"topic": TOPIC, "game_type": "crossword"}]}}),
+        ("roadmap", "POST", "/api/roadmap/", {"json": roadmap}),
+        ("roadmap batch", "POST", "/api/roadmap/batch", {"json": {"items": [roadmap] * 4}}),
+        ("learning-path structure", "POST", "/api/learning-path/generate", {"data": docs}),
+        ("learning-path full", "POST", "/api/learning-path/generate", {"data": {**docs, "generate_full_content": "true"}}),
+        ("learning-path stream", "POST", "/api/learning-path/generate/stream", {"data": {**docs, "generate_full_content": "true"}}),
+        ("learning-path health", "GET", "/api/learning-path/health", {}),
+        ("learning-path get", "GET", f"/api/learning-path/{ids['learning_path']}", {}),
+        ("learning-path session", "GET", f"/api/learning-path/{ids['learning_path']}/sessions/{ids['session']}", {}),
+        ("jobs summary", "POST", "/api/jobs/summary", {"data": docs}),
+        ("jobs learning-path", "POST", "/api/jobs/learning-path", {"data": docs}),
+        ("jobs get", "GET", f"/api/jobs/{ids['job']}", {}),
+        ("jobs result", "GET", f"/api/jobs/{ids['job']}/result", {}),
+        ("jobs events", "GET", f"/api/jobs/{ids['job']}/events", {}),
+        ("jobs cancel", "POST", f"/api/jobs/{ids['cancel_job']}/cancel", {}),
+        ("jobs stats", "GET", "/api/jobs/stats", {}),
+        ("artifacts list", "GET", "/api/artifacts/", {}),
+        ("artifacts get", "GET", f"/api/artifacts/{ids['artifact']}", {}),
+        ("metrics", "GET", "/metrics", {}),
+    ]
+
+
+async def drive(client, method: str, path: str, options: dict, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], Counter()
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **options)
+                statuses[response.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "ok": sum(count for status, count in statuses.items() if isinstance(status, int) and status < 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "rss_mb": round(rss_mb(), 1),
+    }
+
+
+def stub_stats(base_url: str) -> dict:
+    with urllib.request.urlopen(f"{base_url}/stats") as response:
+        return json.loads(response.read())
+
+
+async def main(args):
+    stub, base_url = start_stub_process(
+        latency=args.latency_ms / 1000,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+
+    # Settings are read on import: configure the app before loading it
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+    os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+    os.environ["CACHE_BACKEND"] = "none"
+    os.environ.setdefault("ARTIFACT_STORE_BACKEND", "memory")
+    import httpx
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from app.integrations.ai_client import AIClient, model_pool
+    from app.main import app
+
+    model_pool.factory = partial(ChatGoogleGenerativeAI, base_url=base_url)
+    AIClient.new_model = lambda self, **options: ChatGoogleGenerativeAI(
+        model=self.model_name, api_key=self.api_key, max_retries=self.max_retries, base_url=base_url, **options
+    )
+
+    pdf = text_pdf(args.pages)
+    results = {}
+    rss_start = rss_mb()
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                upload = await client.post("/api/documents/", files=[("files", ("bench.pdf", pdf, "application/pdf"))])
+                document_id = upload.json()["documents"][0]["document_id"]
+                ids = await chain_ids(client, document_id)
+
+                print(f"{'route':<26} | {'ok/req':>7} | {'rps':>7} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'rss MB':>7} | statuses")
+                for name, method, path, options in scenarios(document_id, pdf, ids):
+                    if args.routes and not any(selected in name for selected in args.routes):
+                        continue
+                    result = await drive(client, method, path, options, args.requests, args.concurrency)
+                    results[name] = {"method": method, "path": path, **result}
+                    print(
+                        f"{name:<26} | {result['ok']:>3}/{result['requests']:<3} | {result['throughput_rps']:>7.1f} | "
+                        f"{result['p50_ms']:>8.1f} | {result['p95_ms']:>8.1f} | {result['p99_ms']:>8.1f} | "
+                        f"{result['rss_mb']:>7.1f} | {result['statuses']}"
+                    )
+        upstream = stub_stats(base_url)
+    finally:
+        stub.terminate()
+
+    summary = {
+        "config": vars(args),
+        "routes": results,
+        "memory": {"rss_start_mb": round(rss_start, 1), "rss_end_mb": round(rss_mb(), 1), "peak_rss_mb": round(peak_rss_mb(), 1)},
+        "stub": upstream,
+    }
+    print(f"memory: {summary['memory']}")
+    print(f"stub served: {upstream}")
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(summary, output, indent=2)
+        print(f"results written to {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", nargs="*", default=[], help="only routes whose name contains one of these")
+    parser.add_argument("--pages", type=int, default=20, help="pages of the uploaded test document")
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="mock Gemini time to first byte")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="mock output throughput (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with a 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of calls answered with a 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="fraction of JSON answers fenced or truncated")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    asyncio.run(main(parser.parse_args()))
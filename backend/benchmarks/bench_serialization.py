@@ -0,0 +1,150 @@
+"""
+Response serialization time and allocation: FastAPI's default path against FastJSONRoute.
+
+Each payload is returned by an endpoint of a small in-process app and the full ASGI response
+is collected, so only routing and serialization are measured. Payloads are learning paths of
+each size in `--sizes` (plain dicts, as the learning-path routes return) and flashcard sets of
+the same size (pydantic models inside a dict, as the flashcard routes return).
+
+- default+model: `response_model=dict`, as the routes declare (pydantic validation and serialization)
+- default: no response_model (jsonable_encoder, then json.dumps): why the routes keep theirs
+- fast: FastJSONRoute, i.e. FAST_JSON_RESPONSES=true (orjson directly)
+
+    python -m benchmarks.bench_serialization --sizes 100000 1000000 5000000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+# Settings are read on import by app.api.responses
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+
+from fastapi import APIRouter, FastAPI
+
+from app.api.responses import FastJSONRoute
+from app.integrations.flashcards.structures import FlashCard
+from benchmarks.corpus import paragraph
+from benchmarks.json_corpus import learning_path
+
+
+class AlwaysFastRoute(FastJSONRoute):
+    enabled = True
+
+
+def flashcards(rng: random.Random, target_bytes: int) -> dict:
+    cards = []
+    size = 0
+    while size < target_bytes:
+        card = FlashCard(
+            topic=paragraph(rng, 3), subtopic=paragraph(rng, 4), question=paragraph(rng, 12), answer=paragraph(rng, 30),
+            key_terms=[paragraph(rng, 1) for _ in range(4)], difficulty="medium", explanation=paragraph(rng, 40),
+            tags=["bench", "flashcard"],
+        )
+        cards.append(card)
+        size += len(card.model_dump_json())
+    return {"flashcards": cards}
+
+
+def build_app(payloads: dict) -> FastAPI:
+    app = FastAPI()
+    default = APIRouter()
+    fast = APIRouter(route_class=AlwaysFastRoute)
+    for name, payload in payloads.items():
+        default.add_api_route(f"/default+model/{name}", returning(payload), methods=["GET"], response_model=dict)
+        default.add_api_route(f"/default/{name}", returning(payload), methods=["GET"])
+        fast.add_api_route(f"/fast/{name}", returning(payload), methods=["GET"])
+    app.include_router(default)
+    app.include_router(fast)
+    return app
+
+
+def returning(payload):
+    async def endpoint():
+        return payload
+    return endpoint
+
+
+async def call(app, path: str) -> bytes:
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"", "headers": [],
+        "server": ("bench", 80), "client": ("bench", 1),
+    }
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def measure(app, path: str, repeat: int) -> dict:
+    body = await call(app, path)
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call(app, path)
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    await call(app, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "bytes": len(body),
+        "best_ms": round(min(latencies) * 1000, 2),
+        "median_ms": round(statistics.median(latencies) * 1000, 2),
+        "peak_alloc_mb": round(peak / 1024 / 1024, 2),
+        "body": body,
+    }
+
+
+async def main(args):
+    rng = random.Random(0)
+    payloads = {}
+    for size in args.sizes:
+        payloads[f"learning_path-{size}"] = {"learning_path": learning_path(rng, size)}
+        payloads[f"flashcards-{size}"] = flashcards(rng, size)
+    app = build_app(payloads)
+
+    results = []
+    print(f"{'payload':<24} {'variant':<14} | {'bytes':>10} | {'best ms':>9} | {'median ms':>9} | {'peak alloc MB':>13} | {'speedup':>7}")
+    for name in payloads:
+        baseline = None
+        bodies = {}
+        for variant in ("default+model", "default", "fast"):
+            result = await measure(app, f"/{variant}/{name}", args.repeat)
+            bodies[variant] = result.pop("body")
+            baseline = baseline or result["best_ms"]
+            results.append({"payload": name, "variant": variant, **result})
+            print(
+                f"{name:<24} {variant:<14} | {result['bytes']:>10} | {result['best_ms']:>9.2f} | {result['median_ms']:>9.2f} | "
+                f"{result['peak_alloc_mb']:>13.2f} | {baseline / result['best_ms']:>6.1f}x"
+            )
+        # Same JSON document whatever the variant (only whitespace differs)
+        assert json.loads(bodies["fast"]) == json.loads(bodies["default"]), name
+
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"config": vars(args), "results": results}, output, indent=2)
+        print(f"results written to {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000], help="payload sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", help="also write the results to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,40 @@
+"""
+Input tokens sent for a count-limited artifact (5 flashcards) with and without the content
+budget, and the local cost of ranking passages, for documents of increasing size.
+
+    python -m benchmarks.bench_token_budget --pages 10 100 500 1000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.integrations.flashcards.templates import flashcards_template
+from app.integrations.token_budget import fit_prompt, prompt_tokens
+from benchmarks.corpus import paragraph
+
+
+def document(pages: int, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    return "\n\n".join("\n\n".join(paragraph(rng, 60) for _ in range(6)) for _ in range(pages))
+
+
+def main(args):
+    instructions = flashcards_template()
+    print(f"{'pages':>6} | {'full prompt':>12} | {'budgeted':>9} | {'reduction':>9} | {'fit ms':>7}")
+    for pages in args.pages:
+        payload = {"content": document(pages), "flashcards_count": 5, "difficulty_level": "medium", "focus_area": "key concepts"}
+        full = prompt_tokens(instructions, payload)
+
+        start = time.perf_counter()
+        fitted = asyncio.run(fit_prompt(instructions, payload, 5, query=payload["focus_area"]))
+        elapsed = time.perf_counter() - start
+
+        budgeted = prompt_tokens(instructions, fitted)
+        print(f"{pages:>6} | {full:>12} | {budgeted:>9} | {full / budgeted:>8.1f}x | {elapsed * 1000:>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 500, 1000])
+    main(parser.parse_args())
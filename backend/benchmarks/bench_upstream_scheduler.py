@@ -0,0 +1,101 @@
+"""
+Throughput against a quota-limited upstream: independent per-request retries versus
+`UpstreamScheduler` (shared budget and backoff).
+
+The simulated upstream serves `--capacity` requests per second and answers 429 beyond that.
+Rejected attempts still cost the upstream a slot, as a real overloaded service does.
+
+    python -m benchmarks.bench_upstream_scheduler --requests 400 --capacity 40 --latency 0.2
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.integrations.upstream_scheduler import ModelLimits, UpstreamScheduler
+
+
+class Throttled(Exception):
+    code = 429
+
+
+class QuotaUpstream:
+    def __init__(self, capacity: int, latency: float):
+        self.capacity = capacity
+        self.latency = latency
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.attempts = 0
+        self.rejected = 0
+
+    async def call(self):
+        self.attempts += 1
+        now = time.monotonic()
+        if now - self.window_start >= 1.0:
+            self.window_start, self.window_count = now, 0
+        self.window_count += 1
+        if self.window_count > self.capacity:
+            self.rejected += 1
+            await asyncio.sleep(0.01)
+            raise Throttled("429 RESOURCE_EXHAUSTED")
+        await asyncio.sleep(self.latency)
+        return True
+
+
+async def independent_retries(upstream: QuotaUpstream, max_retries: int):
+    """What each ChatGoogleGenerativeAI did on its own: exponential backoff, unaware of the others"""
+    for attempt in range(max_retries):
+        try:
+            return await upstream.call()
+        except Throttled:
+            if attempt == max_retries - 1:
+                raise
+            await asyncio.sleep(min(8.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+async def run(label: str, requests: int, upstream: QuotaUpstream, call):
+    completions = []
+    start = time.monotonic()
+
+    async def one():
+        await call()
+        completions.append(time.monotonic() - start)
+
+    results = await asyncio.gather(*(one() for _ in range(requests)), return_exceptions=True)
+    elapsed = time.monotonic() - start
+    failed = sum(isinstance(result, Exception) for result in results)
+
+    # Completions per second in each second of the run: steady means similar numbers throughout
+    per_second = [0] * (int(elapsed) + 1)
+    for completed_at in completions:
+        per_second[int(completed_at)] += 1
+    print(
+        f"{label:>22}: {elapsed:6.2f} s  {len(completions) / elapsed:6.1f} req/s  failed {failed:4d}"
+        f"  upstream attempts {upstream.attempts:5d} (429: {upstream.rejected})"
+    )
+    print(f"{'':>22}  completions per second: {per_second}")
+
+
+async def main(args):
+    upstream = QuotaUpstream(args.capacity, args.latency)
+    await run("independent retries", args.requests, upstream, lambda: independent_retries(upstream, 7))
+
+    await asyncio.sleep(1.0)
+    upstream = QuotaUpstream(args.capacity, args.latency)
+    # A budget ratio above 1 means a misconfigured RPM, so the shared backoff has to do the work
+    scheduler = UpstreamScheduler(
+        {}, ModelLimits(int(args.capacity * 60 * args.budget_ratio), 0, args.concurrency),
+        max_attempts=7, base_delay=0.5, max_delay=8.0,
+    )
+    scheduler.limiter("bench").requests.level = args.capacity
+    await run("upstream scheduler", args.requests, upstream, lambda: scheduler.run("bench", 1, upstream.call))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--capacity", type=int, default=40, help="upstream requests per second")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--budget-ratio", type=float, default=1.1, help="configured RPM / real upstream quota")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,172 @@
+"""
+Synthetic document generator for the extraction benchmarks.
+
+PDFs are written directly in PDF syntax (Helvetica text, one content stream per page),
+so no PDF authoring library is needed; DOCX files are written with python-docx.
+"""
+import io
+import random
+
+import docx
+
+WORDS = (
+    "learning model data network gradient function variable matrix vector theory practice "
+    "example concept definition algorithm structure analysis method result process system "
+    "history revolution society economy language grammar biology cell energy equation"
+).split()
+
+
+def paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+TABLE_COLUMN_WIDTH = 100
+
+
+def text_page_lines(rng: random.Random, page_number: int, lines: int = 45) -> list:
+    return [f"Chapter {page_number // 20 + 1}"] + [paragraph(rng, 12) for _ in range(lines)]
+
+
+def table_page_lines(rng: random.Random, page_number: int, rows: int = 40, columns: int = 5) -> list:
+    """A caption and a bordered table of short cells (numbers and keywords)"""
+    header = [f"Column {column + 1}" for column in range(columns)]
+    body = [
+        [rng.choice(WORDS) if column % 2 == 0 else f"{rng.uniform(0, 1000):.2f}" for column in range(columns)]
+        for _ in range(rows)
+    ]
+    return [f"Table {page_number + 1}"] + [header] + body
+
+
+def build_pdf(pages: list) -> bytes:
+    """
+    Build a PDF where `pages` is a list of pages, each a list of lines. A line is either a
+    string or, for table rows, a list of cell strings drawn in bordered columns.
+    An empty list produces a page with no text layer (like a scanned page without OCR).
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        stream_lines = ["BT", "/F1 10 Tf"]
+        borders = []
+        y = 780
+        for line in lines:
+            if isinstance(line, str):
+                stream_lines.append(f"1 0 0 1 50 {y} Tm ({_escape(line)}) Tj")
+            else:
+                for column, cell in enumerate(line):
+                    x = 50 + column * TABLE_COLUMN_WIDTH
+                    stream_lines.append(f"1 0 0 1 {x + 3} {y} Tm ({_escape(cell)}) Tj")
+                    borders.append(f"{x} {y - 4} {TABLE_COLUMN_WIDTH} 16 re S")
+            y -= 16 if not isinstance(line, str) else 12
+        stream_lines.append("ET")
+        stream_lines.extend(borders)
+        stream = "\n".join(stream_lines).encode("latin-1", "replace")
+
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def text_pdf(page_count: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    return build_pdf([text_page_lines(rng, number) for number in range(page_count)])
+
+
+def table_pdf(page_count: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    return build_pdf([table_page_lines(rng, number) for number in range(page_count)])
+
+
+def scanned_pdf(page_count: int) -> bytes:
+    """Pages without a text layer, as produced by a scanner without OCR"""
+    return build_pdf([[] for _ in range(page_count)])
+
+
+def _save_docx(document) -> bytes:
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def text_docx(page_count: int, seed: int = 0) -> bytes:
+    """About `page_count` pages of paragraphs (45 lines of 12 words per page, as in `text_pdf`)"""
+    rng = random.Random(seed)
+    document = docx.Document()
+    for number in range(page_count):
+        document.add_heading(f"Chapter {number // 20 + 1}", level=2)
+        for _ in range(45):
+            document.add_paragraph(paragraph(rng, 12))
+    return _save_docx(document)
+
+
+def table_docx(page_count: int, seed: int = 0, rows: int = 40, columns: int = 5) -> bytes:
+    """One captioned table per page, with the same cells as `table_pdf`"""
+    rng = random.Random(seed)
+    document = docx.Document()
+    for number in range(page_count):
+        lines = table_page_lines(rng, number, rows, columns)
+        document.add_paragraph(lines[0])
+        table = document.add_table(rows=0, cols=columns)
+        for row in lines[1:]:
+            for cell, text in zip(table.add_row().cells, row):
+                cell.text = text
+    return _save_docx(document)
+
+
+DISCLAIMER = "This material is provided for educational purposes only and may not be redistributed without permission."
+
+
+def book_pages(page_count: int, seed: int = 0) -> list:
+    """
+    Extracted page texts as they come out of a typeset book: running header and "Page N of M"
+    footer, words hyphenated at line ends, whitespace runs, a boilerplate paragraph repeated
+    every few pages and the odd page printed twice.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for number in range(1, page_count + 1):
+        if number % 25 == 0:
+            pages.append(pages[-1])
+            continue
+        lines = ["Introduction to Machine Learning   —   Second Edition", f"Chapter {number // 20 + 1}"]
+        for _ in range(40):
+            line = paragraph(rng, 12)
+            if rng.random() < 0.15:
+                word = rng.choice(WORDS)
+                line += f" {word[:len(word) // 2]}-\n{word[len(word) // 2:]}"
+            if rng.random() < 0.2:
+                line = line.replace(" ", "   ", 2)
+            lines.append(line)
+        if number % 5 == 0:
+            lines.append(DISCLAIMER)
+        lines.append(f"Page {number} of {page_count}")
+        pages.append("\n".join(lines))
+    return pages
@@ -0,0 +1,58 @@
+"""
+Synthetic learning-path responses reproducing the ways Gemini output breaks `json.loads`:
+markdown fences, unescaped quotes inside content, raw newlines, trailing commas and truncation.
+"""
+import json
+import random
+import re
+
+from benchmarks.corpus import paragraph
+
+MALFORMATIONS = ("valid", "fenced", "unescaped_quotes", "raw_newlines", "trailing_commas", "truncated")
+
+
+def learning_path(rng: random.Random, target_bytes: int) -> dict:
+    """A learning path shaped like the generation prompt's output, grown until it reaches `target_bytes`"""
+    modules = []
+    path = {"title": "Learning Path", "description": paragraph(rng, 20), "modules": modules}
+    size = 0
+    while size < target_bytes:
+        sessions = []
+        for s in range(3):
+            sessions.append({
+                "title": f"Session {s + 1}",
+                "topics": [{
+                    "title": paragraph(rng, 4),
+                    "content": "\n\n".join(paragraph(rng, 40) for _ in range(3)),
+                    "flashcards": [{"question": paragraph(rng, 8), "answer": paragraph(rng, 12)} for _ in range(3)],
+                    "questions": [{"question": paragraph(rng, 10), "options": [paragraph(rng, 3) for _ in range(4)], "correct": 1}],
+                } for _ in range(2)],
+            })
+        module = {"title": f"Module {len(modules) + 1}", "description": paragraph(rng, 15), "estimatedDuration": "2h", "sessions": sessions}
+        modules.append(module)
+        size += len(json.dumps(module, ensure_ascii=False))
+    return path
+
+
+def malform(text: str, kind: str, rng: random.Random) -> str:
+    if kind == "fenced":
+        return f"Here is the learning path:\n```json\n{text}\n```"
+    if kind == "unescaped_quotes":
+        # The model quoting a term inside content without escaping it
+        return text.replace("model ", '"model" ').replace("theory ", 'the "theory" ')
+    if kind == "raw_newlines":
+        return text.replace("\\n", "\n")
+    if kind == "trailing_commas":
+        return re.sub(r'([}\]"\d])(\s*[}\]])', r"\1,\2", text)
+    if kind == "truncated":
+        return text[:int(len(text) * rng.uniform(0.6, 0.95))]
+    return text
+
+
+def corpus(sizes=(1_000, 10_000, 100_000, 1_000_000), seed: int = 7):
+    """Yields (size, kind, text) for every size/malformation pair"""
+    rng = random.Random(seed)
+    for size in sizes:
+        text = json.dumps(learning_path(rng, size), ensure_ascii=False, indent=2)
+        for kind in MALFORMATIONS:
+            yield size, kind, malform(text, kind, rng)
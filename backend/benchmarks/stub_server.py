@@ -0,0 +1,230 @@
+"""
+Local stand-in for the Gemini REST API (generateContent / streamGenerateContent).
+
+Used by the benchmarks to measure the backend without network access or an API key. Besides a
+fixed latency it can simulate output token throughput, 429/500 error rates and malformed JSON,
+and it answers structured-output calls with an instance generated from the requested schema.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import multiprocessing
+import random
+import threading
+import time
+
+LOREM = (
+    "The learner reviews the main concepts of the document, works through examples and "
+    "checks their understanding with practice questions before moving to the next topic. "
+)
+
+# JSON-mode answer (no schema) accepted as a full learning path, a single module and a single session
+SESSION = {
+    "title": "Session",
+    "description": "Session description",
+    "topics": [{"title": "Topic", "content": LOREM * 3}],
+    "flashcards": [{"question": "What is a model?", "answer": "A simplified representation."}],
+    "practice": [{"question": "Explain the concept.", "answer": "It is explained."}],
+}
+JSON_MODE_TEXT = json.dumps({
+    "title": "Learning path",
+    "description": "Generated by the stub",
+    "modules": [{"title": f"Module {i}", "description": "Module", "sessions": [SESSION, SESSION]} for i in range(1, 4)],
+    "sessions": [SESSION, SESSION],
+    "topics": SESSION["topics"],
+    "flashcards": SESSION["flashcards"],
+    "practice": SESSION["practice"],
+})
+
+
+def gemini_response(text: str, prompt_tokens: int = 10, response_tokens: int = 10) -> dict:
+    return {
+        "candidates": [{
+            "content": {"role": "model", "parts": [{"text": text}]},
+            "finishReason": "STOP",
+            "index": 0,
+        }],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": response_tokens,
+            "totalTokenCount": prompt_tokens + response_tokens,
+        },
+    }
+
+
+def gemini_error(code: int, status: str, retry_delay: float = 0.0) -> dict:
+    error = {"code": code, "message": f"Stub {status}", "status": status}
+    if retry_delay:
+        error["details"] = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{retry_delay:g}s"}]
+    return {"error": error}
+
+
+def sample_from_schema(schema: dict, defs: dict = None, depth: int = 0):
+    """A value that validates against a (pydantic-generated) JSON schema"""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].split("/")[-1]], defs, depth)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+            return sample_from_schema(options[0], defs, depth)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+
+    kind = schema.get("type", "object")
+    if kind == "object":
+        return {name: sample_from_schema(prop, defs, depth + 1) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        count = max(schema.get("minItems", 0), 3 if depth < 4 else 1)
+        count = min(count, schema.get("maxItems", count))
+        return [sample_from_schema(schema.get("items", {}), defs, depth + 1) for _ in range(count)]
+    if kind == "integer":
+        return max(schema.get("minimum", 1), 1)
+    if kind == "number":
+        return float(max(schema.get("minimum", 1), 1))
+    if kind == "boolean":
+        return True
+    return LOREM.split(". ")[0][: schema.get("maxLength", 80)]
+
+
+def malform(text: str, rng: random.Random) -> str:
+    """The kinds of broken JSON Gemini returns: markdown fences or a truncated tail"""
+    if rng.random() < 0.5:
+        return f"```json\n{text}\n```"
+    return text[: max(1, int(len(text) * 0.8))]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency: float = 0.0
+    text: str = LOREM * 20
+    # 0 = the whole response is available after `latency`
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    malformed_rate: float = 0.0
+    connections = 0
+    counts: dict = None
+    rng = random.Random(0)
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def count(self, key: str) -> None:
+        counts = type(self).counts
+        counts[key] = counts.get(key, 0) + 1
+
+    def do_GET(self):
+        # /stats: what the stub served, for benchmarks running it in another process
+        self.send_json(200, {"connections": type(self).connections, **type(self).counts})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.count("requests")
+        if self.latency:
+            time.sleep(self.latency)
+
+        roll = self.rng.random()
+        if roll < self.throttle_rate:
+            self.count("throttled")
+            self.send_json(429, gemini_error(429, "RESOURCE_EXHAUSTED", retry_delay=0.5))
+            return
+        if roll < self.throttle_rate + self.error_rate:
+            self.count("errors")
+            self.send_json(500, gemini_error(500, "INTERNAL"))
+            return
+
+        text = self.response_text(request.get("generationConfig", {}))
+        prompt_tokens = max(1, length // 4)
+        if ":streamGenerateContent" in self.path:
+            self.stream(text, prompt_tokens)
+            return
+
+        response_tokens = max(1, len(text) // 4)
+        if self.tokens_per_second:
+            time.sleep(response_tokens / self.tokens_per_second)
+        self.send_json(200, gemini_response(text, prompt_tokens, response_tokens))
+
+    def response_text(self, config: dict) -> str:
+        schema = config.get("responseJsonSchema") or config.get("responseSchema")
+        if schema:
+            text = json.dumps(sample_from_schema(schema))
+        elif config.get("responseMimeType") == "application/json":
+            text = JSON_MODE_TEXT
+        else:
+            return self.text
+        if self.rng.random() < self.malformed_rate:
+            self.count("malformed")
+            return malform(text, self.rng)
+        return text
+
+    def stream(self, text: str, prompt_tokens: int, chunk_chars: int = 64) -> None:
+        """Server-sent events, one chunk of ~16 tokens at a time, paced by `tokens_per_second`"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(text), chunk_chars):
+            piece = text[start:start + chunk_chars]
+            if self.tokens_per_second:
+                time.sleep(len(piece) / 4 / self.tokens_per_second)
+            last = start + chunk_chars >= len(text)
+            event = gemini_response(piece, prompt_tokens, max(1, len(text) // 4))
+            if not last:
+                del event["candidates"][0]["finishReason"], event["usageMetadata"]
+            data = b"data: " + json.dumps(event).encode("utf-8") + b"\r\n\r\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _server(latency: float = 0.0, text: str = None, seed: int = 0, **behaviour) -> ThreadingHTTPServer:
+    attributes = {"latency": latency, "connections": 0, "counts": {}, "rng": random.Random(seed), **behaviour}
+    if text is not None:
+        attributes["text"] = text
+    handler = type("ConfiguredStubHandler", (StubHandler,), attributes)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_stub_server(latency: float = 0.0, text: str = None, **behaviour):
+    """
+    Start the stub on a free port in a daemon thread. Returns (server, base_url).
+    `behaviour` sets tokens_per_second, error_rate, throttle_rate, malformed_rate or seed.
+    """
+    server = _server(latency, text, **behaviour)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def _serve_forever(options: dict, ready) -> None:
+    server = _server(**options)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_stub_process(**options):
+    """
+    Same as `start_stub_server` but in its own process, so the stub does not compete with the
+    measured app for the GIL. Returns (process, base_url); terminate the process when done.
+    """
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    process = context.Process(target=_serve_forever, args=(options, ready), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{ready.get(timeout=30)}"
@@ -0,0 +1,113 @@
+import json
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+
+from app.integrations.json_stream import JSONStreamParser, parse_model_json
+
+LEARNING_PATH = {
+    "title": "Machine learning",
+    "modules": [
+        {"title": "Regression", "sessions": [{"id": "s1", "duration": 1.5, "optional": False}]},
+        {"title": "Trees \"CART\"", "sessions": [{"id": "s2", "duration": 2, "notes": None}]},
+    ],
+    "tags": ["ml", "intro"],
+}
+
+
+def stream(text: str, chunk_size: int, watch=()) -> tuple:
+    """(values reported by feed, parsed value) for `text` fed in chunks of `chunk_size`"""
+    parser = JSONStreamParser(watch=watch)
+    reported = []
+    for start in range(0, len(text), chunk_size):
+        reported.extend(parser.feed(text[start:start + chunk_size]))
+    return reported, parser.close()
+
+
+def test_leading_prose_with_brackets_is_skipped():
+    text = 'As noted in [1], each {topic} gets a module: {"modules": [{"title": "Regression"}]} Hope it helps [2].'
+    assert parse_model_json(text) == {"modules": [{"title": "Regression"}]}
+    assert parse_model_json('See [a] and [ 1 ]. ["x", "y"]') == ["x", "y"]
+
+
+def test_code_fences_are_ignored():
+    fenced = "```json\n" + json.dumps(LEARNING_PATH, indent=2) + "\n```\n"
+    assert parse_model_json(fenced) == LEARNING_PATH
+    assert parse_model_json("Here it is:\n```\n[]\n```") == []
+
+
+def test_unescaped_quotes_inside_strings_are_kept():
+    text = '{"title": "The "best" model", "note": "a "quoted", phrase", "items": ["say "hi" twice", "ok"], "n": 1}'
+    assert parse_model_json(text) == {
+        "title": 'The "best" model',
+        "note": 'a "quoted", phrase',
+        "items": ['say "hi" twice', "ok"],
+        "n": 1,
+    }
+
+
+def test_trailing_commas_and_raw_newlines_are_accepted():
+    text = '{"a": [1, 2,], "b": {"c": "line one\nline two",},}'
+    assert parse_model_json(text) == {"a": [1, 2], "b": {"c": "line one\nline two"}}
+
+
+def test_truncation_at_each_token_type():
+    cases = {
+        "{": {},
+        '{"ti': {},
+        '{"title"': {},
+        '{"title":': {},
+        '{"title": "Mach': {"title": "Mach"},
+        '{"title": "a\\': {"title": "a"},
+        '{"title": "a\\n': {"title": "a\n"},
+        '{"n": 12': {"n": 12},
+        '{"n": -1.5e': {"n": -1.5},
+        '{"n": -': {},
+        '{"flag": tr': {"flag": True},
+        '{"flag": fals': {"flag": False},
+        '{"flag": nu': {"flag": None},
+        '{"a": 1,': {"a": 1},
+        '{"a": [1, 2': {"a": [1, 2]},
+        '{"a": [1, 2,': {"a": [1, 2]},
+        '{"a": {"b": [': {"a": {"b": []}},
+        '[{"a": 1}, {"b"': [{"a": 1}, {}],
+    }
+    for text, expected in cases.items():
+        assert parse_model_json(text) == expected, text
+
+
+def test_every_prefix_parses_without_error():
+    text = json.dumps(LEARNING_PATH)
+    for end in range(1, len(text) + 1):
+        parsed = parse_model_json(text[:end])
+        assert isinstance(parsed, dict) or parsed is None, text[:end]
+    assert parse_model_json(text) == LEARNING_PATH
+
+
+def test_chunk_boundaries_do_not_change_the_result():
+    text = "```json\n" + json.dumps(LEARNING_PATH, indent=1) + "\n```"
+    for chunk_size in (1, 2, 3, 7, 16, len(text)):
+        _, parsed = stream(text, chunk_size)
+        assert parsed == LEARNING_PATH, chunk_size
+
+
+def test_watched_values_are_reported_across_chunks():
+    text = json.dumps(LEARNING_PATH)
+    for chunk_size in (1, 5, 13, len(text)):
+        reported, _ = stream(text, chunk_size, watch=[("modules", "*"), ("modules", "*", "sessions", "*", "id")])
+        assert reported == [
+            (("modules", 0, "sessions", 0, "id"), "s1"),
+            (("modules", 0), LEARNING_PATH["modules"][0]),
+            (("modules", 1, "sessions", 0, "id"), "s2"),
+            (("modules", 1), LEARNING_PATH["modules"][1]),
+        ], chunk_size
+
+
+def test_watched_value_is_reported_as_soon_as_it_is_complete():
+    parser = JSONStreamParser(watch=[("modules", "*")])
+    assert parser.feed('{"modules": [{"title": "Regr') == []
+    assert parser.feed('ession"}') == [(("modules", 0), {"title": "Regression"})]
+    assert parser.feed(', {"title": "Trees"') == []
+    assert parser.close() == {"modules": [{"title": "Regression"}, {"title": "Trees"}]}
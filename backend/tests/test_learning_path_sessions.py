@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+os.environ.setdefault("CACHE_BACKEND", "none")
+os.environ.setdefault("ARTIFACT_STORE_BACKEND", "memory")
+
+from langchain_core.messages import AIMessage
+
+from app.infrastructure.artifacts.store import ArtifactStore, SQLiteArtifactStore
+from app.integrations.learning_path.structures import LearningPathOutline
+from app.services import learning_path_service
+
+OUTLINE = LearningPathOutline.model_validate({
+    "title": "Machine learning",
+    "description": "From regression to trees",
+    "modules": [
+        {
+            "title": title,
+            "description": f"{title} basics",
+            "sessions": [{"title": f"{title} session", "description": "", "topics": ["Intro"]}],
+        }
+        for title in ("Regression", "Trees")
+    ],
+})
+
+SESSION = {
+    "title": "Session",
+    "topics": [{"title": "Intro", "content": "Full content"}],
+    "flashcards": [{"question": "q", "answer": "a"}],
+    "practice": [],
+}
+
+
+class FakeModel:
+    """Answers run_chain by template: outline, module (the Trees module call fails) and session"""
+
+    def __init__(self, failing=("Trees",)):
+        self.calls = []
+        self.failing = failing
+
+    async def run_chain(self, instructions, payload, structure=None, **model_options):
+        if structure is LearningPathOutline:
+            self.calls.append("outline")
+            return OUTLINE
+        if "module_outline" in payload:
+            self.calls.append("module")
+            if any(title in payload["module_outline"] for title in self.failing):
+                raise RuntimeError("upstream error")
+            return AIMessage(content=json.dumps({"title": "Regression", "sessions": [SESSION]}))
+        self.calls.append("session")
+        return AIMessage(content=json.dumps(SESSION))
+
+
+def generate_full_path(monkeypatch, failing=("Trees",)) -> tuple:
+    fake = FakeModel(failing)
+    monkeypatch.setattr(learning_path_service.ai_client, "run_chain", fake.run_chain)
+    learning_path = asyncio.run(learning_path_service.generate_learning_path(
+        content="Linear regression fits a line. Decision trees split the data.",
+        difficulty="intermediate", total_duration="2 weeks", modules_count=2, sessions_per_module=1,
+        topics_per_session=1, flashcards_per_topic=2, questions_per_topic=2, include_theory=True,
+        language="English", generate_full_content=True,
+    ))
+    return fake, learning_path
+
+
+def test_failed_module_sessions_are_generated_on_access(monkeypatch):
+    fake, learning_path = generate_full_path(monkeypatch)
+    skeleton = learning_path["modules"][1]["sessions"][0]
+    assert skeleton["contentGenerated"] is False
+
+    session = asyncio.run(learning_path_service.get_session(learning_path["id"], "module_2_session_1"))
+    assert session["topics"][0]["content"] == "Full content"
+    assert session["contentGenerated"] is True
+    assert fake.calls.count("session") == 1
+
+    # Stored: the next access needs no model call
+    asyncio.run(learning_path_service.get_session(learning_path["id"], "module_2_session_1"))
+    assert fake.calls.count("session") == 1
+
+
+def test_generated_sessions_of_full_paths_are_returned_as_stored(monkeypatch):
+    fake, learning_path = generate_full_path(monkeypatch)
+    session = asyncio.run(learning_path_service.get_session(learning_path["id"], "module_1_session_1"))
+    assert session["topics"][0]["content"] == "Full content"
+    assert "session" not in fake.calls
+
+
+def test_sessions_generated_concurrently_are_all_stored(monkeypatch):
+    fake, learning_path = generate_full_path(monkeypatch, failing=("Regression", "Trees"))
+
+    async def access_both():
+        return await asyncio.gather(*(
+            learning_path_service.get_session(learning_path["id"], session_id)
+            for session_id in ("module_1_session_1", "module_2_session_1")
+        ))
+
+    asyncio.run(access_both())
+    stored = asyncio.run(learning_path_service.get_learning_path(learning_path["id"]))
+    assert [module["sessions"][0]["contentGenerated"] for module in stored["modules"]] == [True, True]
+    assert fake.calls.count("session") == 2
+
+
+def test_modify_is_atomic(tmp_path):
+    def increment(data):
+        count = data["count"]
+        time.sleep(0.001)  # Widen the window a non-atomic read-modify-write would lose updates in
+        return {"count": count + 1}
+
+    for store in (ArtifactStore(), SQLiteArtifactStore(str(tmp_path / "artifacts.sqlite3"))):
+        artifact_id = store.put("path", "learning_path", {"count": 0})["id"]
+        threads = [
+            threading.Thread(target=lambda: [store.modify(artifact_id, increment) for _ in range(10)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert store.get(artifact_id)["data"] == {"count": 40}
+        assert store.modify("missing", increment) is False
@@ -0,0 +1,51 @@
+import os
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("GEMINI_MODEL", "gemini-2.5-flash")
+os.environ.setdefault("GEMINI_MODEL_PRO", "gemini-2.5-pro")
+
+from app.infrastructure.files.preprocessing import clean_page, preprocess_documents, strip_running_lines
+
+
+def test_numbered_content_lines_are_not_running_headers():
+    topics = ["Regression", "Classification", "Clustering", "Trees", "Ensembles", "Evaluation"]
+    pages = [
+        f"ML 101 - Lecture 3\n{topic}\nExample {i}: see figure {i}\nSlide {i}"
+        for i, topic in enumerate(topics, start=1)
+    ]
+    cleaned, report = preprocess_documents([pages])
+    for i, page in enumerate(cleaned[0], start=1):
+        assert f"Example {i}: see figure {i}" in page
+    assert report["saved_ratio"] < 0.1
+
+
+def test_running_header_and_footer_removed():
+    pages = ["Filename: book.pdf"] + [
+        f"Machine Learning\nChapter 1\nBody line {i} a.\nBody line {i} b.\nBody line {i} c.\nPage {i} of 5"
+        for i in range(1, 6)
+    ]
+    cleaned, removed = strip_running_lines(pages)
+    assert removed == 15
+    assert all("Machine Learning" not in page and "Page" not in page for page in cleaned[1:])
+    assert "Body line 3 b." in cleaned[3]
+
+
+def test_docx_keeps_trailing_number():
+    text = "Question one\nQuestion two\nQuestion three\nThe answer is\nsomething\n42"
+    cleaned, _ = preprocess_documents([[text]])
+    assert cleaned[0][0].endswith("42")
+
+
+def test_pdf_page_number_must_match_position():
+    body = "Line one\nLine two\nLine three\nLine four"
+    pages = ["Filename: a.pdf", f"{body}\n1", f"{body} again\n17"]
+    cleaned, removed = strip_running_lines(pages)
+    assert removed == 1
+    assert cleaned[2].endswith("17")
+
+
+def test_hyphenated_compounds_keep_their_hyphen():
+    vocabulary = {"learning"}
+    text, joined = clean_page("machine learn-\ning is well-\nknown and state-of-the-\nart", vocabulary)
+    assert text == "machine learning is well-known and state-of-the-art"
+    assert joined == 3